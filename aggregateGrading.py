@@ -0,0 +1,283 @@
+#-----------------------------------------------------------------------------
+# Name:        aggregateGrading (aggregateGrading.py)
+# Purpose:     To calculate the marks of every student in a course inside
+#              MongoDB so only the final marks are sent to the program
+#
+# Author:      Steven Wu
+# Created:     2020/02/21
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# Usage: python aggregateGrading.py username course [--adjusted] [--limit n] [--check]
+# Prints the course's students from the highest mark to the lowest. With --check
+# the marks are also calculated with Marks and any differences are printed.
+
+import argparse
+import math
+import sys
+from pymongo.errors import OperationFailure
+from connectionManager import ConnectionManager
+from gradingContext import GradingContext
+from instrumentation import instrumentation
+from marks import Marks
+
+class AggregateGrading():
+    '''
+    Object which calculates the marks of every student in a course with an aggregation pipeline
+
+    Marks and Assignments.calculate() fetch every student document and calculate the marks in
+    Python. The pipeline from pipeline() does the same calculation on the database server (one
+    $switch branch per course assignment, with the category weighted average of each of the
+    student's assignments and the weighted total of the student's assignments, using current
+    adjusted weightings for the adjusted mark), so only the student names and final marks are sent
+    back. The course document and the categories are in the 'GradebookCourses' database, which
+    $lookup can't reach from 'GradebookStudents', so they are read through the GradingContext
+    (usually from the shared DocCache) and written into the pipeline as constants.
+
+    The server adds the sums in a different way than Python, so the marks can differ from Marks
+    in the last few digits. crossCheck() compares the two. The SQLite backend and MongoDB servers
+    older than 4.4 can't run the pipeline, so leaderboard() uses GradeEngine instead with them.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course
+    context : GradingContext
+        Course document and category weightings written into the pipeline
+
+    Methods
+    -------
+    pipeline(adjusted : bool = False, limit : int = 0) -> list
+        Returns the aggregation pipeline calculating the marks of the course's students
+    leaderboard(adjusted : bool = False, limit : int = 0) -> list
+        Returns the name and marks of the course's students, highest mark first
+    pythonMarks() -> dict
+        Calculates the marks of every student with the Marks class
+    crossCheck(tolerance : float = 1e-9) -> list
+        Returns the students whose marks from the pipeline and from Marks are different
+    '''
+
+    reservedKeys = ('assignment name', 'weighting', 'adjusted weighting', 'revision')
+
+    def __init__(self, username, courseName, context = None):
+        '''
+        Constructor to build an AggregateGrading object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+        context : GradingContext, optional
+            Context holding the course's documents, a new one is made if not given
+        '''
+        self.username = username
+        self.courseName = courseName
+        if context is None:
+            context = GradingContext(self.username, self.courseName)
+        self.context = context
+
+    @staticmethod
+    def _isNumber(value) -> bool:
+        return (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+    def _assignmentMark(self, master) -> dict:
+        # Assignments.calculate() as an expression on the '$assignments' item being graded
+        weightings = self.context.weightings()
+        markTerms = []
+        weightTerms = []
+        for category in master:
+            if category in self.reservedKeys or master[category] == 0:
+                continue
+            # Categories Assignments.calculate() always skips are left out of the pipeline
+            if not self._isNumber(master[category]) or not self._isNumber(weightings.get(category)):
+                continue
+            field = '$assignments.' + category
+            weight = weightings[category]
+            markTerms.append({'$cond': [{'$isNumber': field}, {'$multiply': [{'$divide': [{'$multiply': [weight, field]}, master[category]]}, 100]}, 0]})
+            weightTerms.append({'$cond': [{'$isNumber': field}, weight, 0]})
+        if not markTerms:
+            return (None)
+        return ({'$let': {'vars': {'markSum': {'$add': markTerms}, 'weightSum': {'$add': weightTerms}},
+                          'in': {'$cond': [{'$eq': ['$$weightSum', 0]}, None, {'$divide': ['$$markSum', '$$weightSum']}]}}})
+
+    def pipeline(self, adjusted = False, limit = 0) -> list:
+        '''
+        Returns the aggregation pipeline calculating the marks of the course's students
+
+        The pipeline is run on the 'GradebookStudents' collection and returns one
+        {'student name', 'mark', 'adjusted mark'} document per student. A mark is None where
+        Marks.totalMark() or Marks.totalMarkAdjusted() would raise ZeroDivisionError.
+
+        Parameters
+        ----------
+        adjusted : bool, optional
+            If the students are sorted by their adjusted mark, defaults to False
+        limit : int, optional
+            Number of students returned, every student if 0
+
+        Returns
+        -------
+        list
+            The pipeline stages
+        '''
+        branches = []
+        seen = set()
+        for master in self.context.courseDoc().get('assignments', []):
+            # Like GradingContext.masterAssignment(), the first assignment with a name is used
+            if master.get('assignment name') in seen:
+                continue
+            seen.add(master.get('assignment name'))
+            mark = self._assignmentMark(master)
+            if mark is None:
+                continue
+            # An assignment whose weighting isn't a number still counts towards the adjusted mark
+            # of students with an adjusted weighting for it, like in Marks.totalMarkAdjusted()
+            weighting = master['weighting'] if self._isNumber(master.get('weighting')) else None
+            branches.append({'case': {'$eq': ['$assignments.assignment name', {'$literal': master['assignment name']}]},
+                             'then': {'mark': mark, 'weighting': weighting, 'revision': {'$literal': master.get('revision')}}})
+
+        graded = {'$switch': {'branches': branches, 'default': None}} if branches else None
+        isGraded = {'$and': [{'$isNumber': '$graded.mark'}, {'$isNumber': '$graded.weighting'}]}
+        # Adjusted weightings made for an older revision of the assignment are ignored (see StorageLayout)
+        useAdjusted = {'$and': [{'$isNumber': '$assignments.adjusted weighting'},
+                                {'$eq': [{'$ifNull': ['$assignments.revision', None]}, {'$ifNull': ['$graded.revision', None]}]}]}
+        adjustedWeighting = {'$cond': [useAdjusted, '$assignments.adjusted weighting', '$graded.weighting']}
+        isAdjustedGraded = {'$and': [{'$isNumber': '$graded.mark'}, {'$isNumber': adjustedWeighting}]}
+        sortField = 'adjusted mark' if adjusted else 'mark'
+
+        stages = [{'$match': {'course name': self.courseName}},
+                  {'$project': {'student name': 1, 'assignments': 1}},
+                  {'$unwind': {'path': '$assignments', 'preserveNullAndEmptyArrays': True}},
+                  {'$addFields': {'graded': graded}},
+                  {'$group': {'_id': '$_id',
+                              'student name': {'$first': '$student name'},
+                              'default sum': {'$sum': {'$cond': [isGraded, {'$multiply': ['$graded.mark', '$graded.weighting']}, 0]}},
+                              'default weighting': {'$sum': {'$cond': [isGraded, '$graded.weighting', 0]}},
+                              'adjusted sum': {'$sum': {'$cond': [isAdjustedGraded, {'$multiply': ['$graded.mark', adjustedWeighting]}, 0]}},
+                              'adjusted weighting': {'$sum': {'$cond': [isAdjustedGraded, adjustedWeighting, 0]}}}},
+                  {'$project': {'_id': 0, 'student name': 1,
+                                'mark': {'$cond': [{'$eq': ['$default weighting', 0]}, None, {'$divide': ['$default sum', '$default weighting']}]},
+                                'adjusted mark': {'$cond': [{'$eq': ['$adjusted weighting', 0]}, None, {'$divide': ['$adjusted sum', '$adjusted weighting']}]}}},
+                  {'$sort': {sortField: -1, 'student name': 1}}]
+        if limit:
+            stages.append({'$limit': limit})
+        return (stages)
+
+    @instrumentation.traced
+    def leaderboard(self, adjusted = False, limit = 0) -> list:
+        '''
+        Returns the name and marks of the course's students, highest mark first
+
+        The marks are calculated by the database server with pipeline(). With the SQLite backend,
+        or if the server can't run the pipeline, they are calculated with GradeEngine instead.
+
+        Parameters
+        ----------
+        adjusted : bool, optional
+            If the students are sorted by their adjusted mark, defaults to False
+        limit : int, optional
+            Number of students returned, every student if 0
+
+        Returns
+        -------
+        list
+            {'student name', 'mark', 'adjusted mark'} dicts, students without a mark are last
+        '''
+        if ConnectionManager.backend == 'mongo':
+            studentCol = ConnectionManager.getClient()['GradebookStudents'][self.username]
+            try:
+                return (list(studentCol.aggregate(self.pipeline(adjusted, limit))))
+            except OperationFailure:
+                pass
+        # gradeEngine imports numpy, which is slow to import, so it is imported when first needed
+        from gradeEngine import GradeEngine
+        engine = GradeEngine(self.username, self.courseName)
+        engine.load(self.context.courseDoc(), self.context.weightings())
+        students = [{'student name': x, 'mark': y[0], 'adjusted mark': y[1]} for x, y in engine.totalMarks().items()]
+        sortField = 'adjusted mark' if adjusted else 'mark'
+        students.sort(key = lambda x: x['student name'])
+        students.sort(key = lambda x: -x[sortField] if x[sortField] is not None else math.inf)
+        return (students[:limit] if limit else students)
+
+    def pythonMarks(self) -> dict:
+        '''
+        Calculates the marks of every student with the Marks class
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Student names mapped to [mark, adjusted mark], a mark is None where Marks raises ZeroDivisionError
+        '''
+        studentCol = ConnectionManager.getClient()['GradebookStudents'][self.username]
+        results = {}
+        for studentDoc in studentCol.find({'course name': self.courseName}):
+            student = Marks(self.username, self.courseName, studentDoc['student name'], studentDoc, self.context)
+            results[studentDoc['student name']] = []
+            for calculate in (student.totalMark, student.totalMarkAdjusted):
+                try:
+                    results[studentDoc['student name']].append(calculate())
+                except ZeroDivisionError:
+                    results[studentDoc['student name']].append(None)
+        return (results)
+
+    def crossCheck(self, tolerance = 1e-9) -> list:
+        '''
+        Returns the students whose marks from the pipeline and from Marks are different
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            Largest relative difference between two marks that are considered equal, defaults to 1e-9
+
+        Returns
+        -------
+        list
+            [student name, pipeline marks, Marks marks] lists, empty if every mark matches
+
+        Raises
+        -------
+        OperationFailure
+            If the database can't run the pipeline
+        '''
+        studentCol = ConnectionManager.getClient()['GradebookStudents'][self.username]
+        expected = self.pythonMarks()
+        differences = []
+        for x in studentCol.aggregate(self.pipeline()):
+            calculated = [x['mark'], x['adjusted mark']]
+            reference = expected.pop(x['student name'], [None, None])
+            for a, b in zip(calculated, reference):
+                if (a is None) != (b is None) or (a is not None and not math.isclose(a, b, rel_tol = tolerance, abs_tol = tolerance)):
+                    differences.append([x['student name'], calculated, reference])
+                    break
+        for name in expected:
+            differences.append([name, None, expected[name]])
+        return (differences)
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = "Prints a course's students from the highest mark to the lowest")
+    parser.add_argument('username')
+    parser.add_argument('course')
+    parser.add_argument('--adjusted', action = 'store_true', help = 'sort by the adjusted mark')
+    parser.add_argument('--limit', type = int, default = 0)
+    parser.add_argument('--check', action = 'store_true', help = 'compare the marks with the ones from Marks')
+    options = parser.parse_args(arguments)
+    grading = AggregateGrading(options.username, options.course)
+    for x in grading.leaderboard(options.adjusted, options.limit):
+        print('{:<30}{:>10}{:>10}'.format(x['student name'], *['-' if x[y] is None else '{:.2f}'.format(x[y]) for y in ('mark', 'adjusted mark')]))
+    if options.check:
+        differences = grading.crossCheck()
+        for x in differences:
+            print('Different: ' + str(x))
+        print(str(len(differences)) + ' differences')
+        if differences:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
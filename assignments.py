@@ -1,168 +1,301 @@
-#-----------------------------------------------------------------------------
-# Name:        assignments (assignments.py)
-# Purpose:     To allow the gradebook program to have functional assignments
-#
-# Author:      Steven Wu
-# Created:     2019/11/03
-# Updated:     2020/01/16
-#-----------------------------------------------------------------------------
-
-import pymongo
-from connectionString import connectionStr
-from courses import Courses
-class Assignments():
-    '''
-    Object which holds the mark information of an assignment
-
-    Attributes
-    ----------
-    username : str
-        Account username
-    courseName : str
-        Name of the course the assignment is for
-    assignmentMarks: dict
-        Dictionary containing the marks in each category of an assignment
-    studentName : str
-        Name of the student the assignment belongs to, if applicable 
-
-    Methods
-    -------
-    save(assignmentType : str= 'Student') -> str
-        Saves the assignment to the database
-    calculate() -> list
-        Calculates the mark on the assignment and gets its weighting
-    
-    '''
-
-    def __init__(self, username, courseName, assignmentMarks,studentName=''):
-        '''
-        Constructor to build a Assignments object
-
-        Parameters
-        ----------
-        username : str
-            Account username
-        courseName : str
-            Name of the course the assignment is for
-        assignmentMarks: dict
-            Dictionary containing the marks in each category of an assignment    
-        studentName : str, optional
-            Name of the student the assignment belongs to, if applicable 
-
-        '''
-        self.username = username
-        self.courseName = courseName
-        self.studentName = studentName
-        self.assignmentMarks = assignmentMarks
-
-    def save(self, assignmentType = 'Student') -> str:
-        '''
-        Saves the assignment to the database
-
-        Saves the assignment information to the student's or course's database document
-
-        Parameters
-        ----------
-        assignmentType : str, optional
-            Type of assignment clicked (Student or Course), defaults to 'Student'
-        
-        Returns
-        -------
-        str
-            'Entries cannot be negative' if a negative mark or weighting was received
-            'Entries must be numbers' if a non numerical mark or weighting was received
-            'Saved' if the assignment data was successfully saved
-
-        Raise
-        -------
-        ValueError
-            If string could not be converted to float
-        KeyError
-            If there is no 'assignments' key  in the student's document
-        KeyError
-            If there is no 'assignments' key  in the course's document
-        '''
-
-        for x in self.assignmentMarks.keys():
-            if x!= 'assignment name':
-                self.assignmentMarks[x] = self.assignmentMarks[x].get().strip()
-                try: 
-                    if float(self.assignmentMarks[x]) <0:
-                        return ('Entries cannot be negative')
-                    else:
-                        self.assignmentMarks[x] = float(self.assignmentMarks[x])
-
-                except:
-                    return('Entries must be numbers')
-
-
-        client = pymongo.MongoClient(connectionStr)
-        if assignmentType == 'Student':
-            if self.assignmentMarks['weighting'] ==self.assignmentMarks['adjusted weighting']:
-                del self.assignmentMarks['adjusted weighting']
-            database = client['GradebookStudents']
-            collection = database[self.username]
-            try:
-                existingAssignments = Courses(self.username).docGet({'student name': self.studentName,'course name' : self.courseName},'GradebookStudents')['assignments']
-                for x in existingAssignments:
-                    if x['assignment name'] == self.assignmentMarks['assignment name']:
-                        collection.update_one({'student name': self.studentName,'course name' : self.courseName}, { '$pull' : {'assignments' :x}})
-                        break
-            except:
-                pass
-            collection.update_one({'student name': self.studentName,'course name' : self.courseName}, { '$push' : {'assignments' :self.assignmentMarks}} )
-        elif assignmentType == 'Course':
-            database = client['GradebookCourses']
-            collection = database[self.username]
-            try:
-                existingAssignments = Courses(self.username).docGet({'course name' : self.courseName},'GradebookCourses')['assignments']
-                for x in existingAssignments:
-                    if x['assignment name'] == self.assignmentMarks['assignment name']:
-                        collection.update_one({'course name' : self.courseName}, { '$pull' : {'assignments' :x}})
-                        break
-            except:
-                pass
-            collection.update_one({'course name' : self.courseName}, { '$push' : {'assignments' :self.assignmentMarks}} )
-            studentDb = client['GradebookStudents']
-            studentCol = studentDb[self.username]
-            studentCol.update_many({'course name' : self.courseName,'assignments.assignment name' : self.assignmentMarks['assignment name']}, {'$unset':{'assignments.$.adjusted weighting':{'$exists': True}}})
-            studentCol.update_many({'course name' : self.courseName,'assignments.assignment name' : self.assignmentMarks['assignment name']}, {'$set':{'assignments.$.weighting':self.assignmentMarks["weighting"]}})
-        client.close()
-        return('Saved')
-
-    def calculate(self) -> list:
-        '''
-        Calculates the mark on the assignment and gets its weighting
-
-        Calculates the mark of each category on the assignment then uses a weighted average
-        to calculate the overall assignment mark. 
-
-        Parameters
-        ----------
-        None
-        
-        Returns
-        -------
-        list
-            List including the assignment mark and the weighting of the assignment
-        '''
-        
-        cumulativeWeight = 0
-        cumulativeMark = 0
-        for x in Courses(self.username).docGet({'course name' : self.courseName},'GradebookCourses')['assignments']:
-            if x['assignment name'] == self.assignmentMarks['assignment name']:
-                assignmentTotal = x
-                break
-        weightings ={}
-        for x in Courses(self.username).docsGet('GradebookCourses',{'category':{'$exists': True}}):
-            weightings[x['category']] = x['weighting']
-
-        for category in assignmentTotal.keys():
-            if category != 'assignment name' and category != 'weighting' and category != 'adjusted weighting' and assignmentTotal[category] != 0:
-                try:
-                    cumulativeMark += weightings[category] * self.assignmentMarks[category]/assignmentTotal[category] *100
-                    cumulativeWeight += weightings[category]
-                except Exception as e:
-                    pass
-                    #print(e)
+#-----------------------------------------------------------------------------
+# Name:        assignments (assignments.py)
+# Purpose:     To allow the gradebook program to have functional assignments
+#
+# Author:      Steven Wu
+# Created:     2019/11/03
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+
+from pymongo import UpdateOne
+from connectionManager import ConnectionManager
+from gradingContext import GradingContext
+from docCache import sharedCache
+from instrumentation import instrumentation
+from studentTotals import StudentTotals
+from storageLayout import StorageLayout
+class Assignments():
+    '''
+    Object which holds the mark information of an assignment
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course the assignment is for
+    assignmentMarks: dict
+        Dictionary containing the marks in each category of an assignment
+    studentName : str
+        Name of the student the assignment belongs to, if applicable 
+    context : GradingContext
+        Holds the course document and category weightings used by calculate()
+
+    Methods
+    -------
+    save(assignmentType : str= 'Student') -> str
+        Saves the assignment to the database
+    parseEntries() -> str
+        Converts the entered marks and weightings to numbers
+    upsertRequests(query : dict) -> list
+        Builds the bulk write requests which replace or append the assignment in a document
+    weightingUpdate() -> list
+        Builds the update which copies a course assignment's weighting to its students
+    revisionRequest() -> UpdateOne
+        Builds the request which gives the course document a new revision
+    trimStudentMarks(normalized : bool = False) -> None
+        Removes what a student's assignment does not need to store before it is saved
+    calculate() -> list
+        Calculates the mark on the assignment and gets its weighting
+    
+    '''
+
+    def __init__(self, username, courseName, assignmentMarks,studentName='', context = None):
+        '''
+        Constructor to build a Assignments object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course the assignment is for
+        assignmentMarks: dict
+            Dictionary containing the marks in each category of an assignment, as StringVars
+            or strings until the assignment is saved
+        studentName : str, optional
+            Name of the student the assignment belongs to, if applicable 
+        context : GradingContext, optional
+            Context shared with other assignments of the same course, a new one is made if not given
+
+        '''
+        self.username = username
+        self.courseName = courseName
+        self.studentName = studentName
+        self.assignmentMarks = assignmentMarks
+        if context is None:
+            context = GradingContext(username, courseName)
+        self.context = context
+
+    @instrumentation.traced
+    def save(self, assignmentType = 'Student') -> str:
+        '''
+        Saves the assignment to the database
+
+        Saves the assignment information to the student's or course's database document.
+        Each collection is written with a single request: the assignment replaces the existing
+        entry with the same name or is appended if there is none. A student's saved totals are
+        updated in the same request, a course assignment removes the saved totals of its students
+        in the request which copies its weighting to them.
+        In the normalized storage layout (see StorageLayout) a course assignment is only written
+        to the course document, with new revisions instead of changes to the students.
+
+        Parameters
+        ----------
+        assignmentType : str, optional
+            Type of assignment clicked (Student or Course), defaults to 'Student'
+        
+        Returns
+        -------
+        str
+            'Entries cannot be negative' if a negative mark or weighting was received
+            'Entries must be numbers' if a non numerical mark or weighting was received
+            'Saved' if the assignment data was successfully saved
+
+        Raise
+        -------
+        ValueError
+            If string could not be converted to float
+        '''
+        error = self.parseEntries()
+        if error:
+            return (error)
+
+        client = ConnectionManager.getClient()
+        normalized = StorageLayout(self.username).isNormalized()
+        if assignmentType == 'Student':
+            self.trimStudentMarks(normalized)
+            database = client['GradebookStudents']
+            collection = database[self.username]
+            totals = StudentTotals(self.username, self.courseName)
+            totalsRequest = totals.saveRequest(self)
+            result = collection.bulk_write(self.upsertRequests({'student name': self.studentName,'course name' : self.courseName}) + ([totalsRequest] if totalsRequest is not None else []))
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': self.courseName, 'student name': self.studentName})
+            # One of the two upsert requests matches, the totals request only matches if the student's saved result was still the old one
+            if totalsRequest is None or result.matched_count < 2:
+                totals.recompute([self.studentName])
+        elif assignmentType == 'Course':
+            database = client['GradebookCourses']
+            collection = database[self.username]
+            if normalized:
+                self.assignmentMarks['revision'] = StorageLayout.newRevision()
+                collection.bulk_write(self.upsertRequests({'course name' : self.courseName}) + [self.revisionRequest()])
+                sharedCache.invalidate('GradebookCourses', self.username, {'course name': self.courseName})
+            else:
+                collection.bulk_write(self.upsertRequests({'course name' : self.courseName}))
+                studentDb = client['GradebookStudents']
+                studentCol = studentDb[self.username]
+                studentCol.update_many(*self.weightingUpdate())
+                sharedCache.invalidate('GradebookCourses', self.username, {'course name': self.courseName})
+                sharedCache.invalidate('GradebookStudents', self.username, {'course name': self.courseName})
+        self.context.invalidate()
+        return('Saved')
+
+    def parseEntries(self) -> str:
+        '''
+        Converts the entered marks and weightings to numbers
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            'Entries cannot be negative' if a negative mark or weighting was received
+            'Entries must be numbers' if a non numerical mark or weighting was received
+            '' if every entry was converted
+
+        Raise
+        -------
+        ValueError
+            If string could not be converted to float
+        '''
+        for x in self.assignmentMarks.keys():
+            if x!= 'assignment name' and x!= 'revision':
+                if not isinstance(self.assignmentMarks[x], str):
+                    self.assignmentMarks[x] = self.assignmentMarks[x].get()
+                self.assignmentMarks[x] = self.assignmentMarks[x].strip()
+                try: 
+                    if float(self.assignmentMarks[x]) <0:
+                        return ('Entries cannot be negative')
+                    else:
+                        self.assignmentMarks[x] = float(self.assignmentMarks[x])
+
+                except:
+                    return('Entries must be numbers')
+        return ('')
+
+    def upsertRequests(self, query) -> list:
+        '''
+        Builds the bulk write requests which replace or append the assignment in a document
+
+        The first request replaces the entry with the same assignment name in place, the second
+        appends the assignment only if no such entry exists. Sent together as one ordered bulk
+        write, exactly one of them changes the document.
+
+        Parameters
+        ----------
+        query : dict
+            Query matching the document the assignment is saved in
+
+        Returns
+        -------
+        list
+            List of UpdateOne requests
+        '''
+        assignmentName = self.assignmentMarks['assignment name']
+        replaceQuery = dict(query, **{'assignments.assignment name': assignmentName})
+        appendQuery = dict(query, **{'assignments.assignment name': {'$ne': assignmentName}})
+        return ([UpdateOne(replaceQuery, {'$set': {'assignments.$': self.assignmentMarks}}),
+                 UpdateOne(appendQuery, {'$push': {'assignments': self.assignmentMarks}})])
+
+    def weightingUpdate(self) -> list:
+        '''
+        Builds the update which copies a course assignment's weighting to its students
+
+        Students' adjusted weightings of the assignment and their saved totals (see StudentTotals)
+        are removed at the same time, so the totals are recalculated when the student is next viewed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        list
+            The [query, update] to pass to update_many() on the student collection
+        '''
+        return ([{'course name' : self.courseName,'assignments.assignment name' : self.assignmentMarks['assignment name']},
+                 {'$set':{'assignments.$.weighting':self.assignmentMarks["weighting"]}, '$unset':dict(StudentTotals.unsetFields, **{'assignments.$.adjusted weighting':''})}])
+
+    def revisionRequest(self) -> UpdateOne:
+        '''
+        Builds the request which gives the course document a new revision
+
+        Saved totals made for an older revision of the course are recalculated when next viewed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        UpdateOne
+            Request to send with the course assignment's own write
+        '''
+        return (UpdateOne({'course name': self.courseName}, {'$set': {'revision': StorageLayout.newRevision()}}))
+
+    def trimStudentMarks(self, normalized = False) -> None:
+        '''
+        Removes what a student's assignment does not need to store before it is saved
+
+        The adjusted weighting is removed if it is the same as the weighting. An adjusted weighting
+        that is kept is stamped with the revision of the course's copy of the assignment, if it has
+        one. In the normalized layout the weighting is removed as well, since it is read from the
+        course's copy.
+
+        Parameters
+        ----------
+        normalized : bool, optional
+            If the account uses the normalized storage layout, defaults to False
+
+        Returns
+        -------
+        None
+        '''
+        if self.assignmentMarks['weighting'] ==self.assignmentMarks['adjusted weighting']:
+            del self.assignmentMarks['adjusted weighting']
+        else:
+            try:
+                master = self.context.masterAssignment(self.assignmentMarks['assignment name'])
+                if 'revision' in master:
+                    self.assignmentMarks['revision'] = master['revision']
+            except KeyError:
+                pass
+        if normalized:
+            del self.assignmentMarks['weighting']
+
+    @instrumentation.traced
+    def calculate(self) -> list:
+        '''
+        Calculates the mark on the assignment and gets its weighting
+
+        Calculates the mark of each category on the assignment then uses a weighted average
+        to calculate the overall assignment mark. The course document and category weightings
+        come from the assignment's GradingContext.
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        list
+            List including the assignment mark and the weighting of the assignment
+        '''
+        
+        cumulativeWeight = 0
+        cumulativeMark = 0
+        assignmentTotal = self.context.masterAssignment(self.assignmentMarks['assignment name'])
+        weightings = self.context.weightings()
+
+        for category in assignmentTotal.keys():
+            if category != 'assignment name' and category != 'weighting' and category != 'adjusted weighting' and category != 'revision' and assignmentTotal[category] != 0:
+                try:
+                    cumulativeMark += weightings[category] * self.assignmentMarks[category]/assignmentTotal[category] *100
+                    cumulativeWeight += weightings[category]
+                except Exception as e:
+                    pass
+                    #print(e)
         return ([cumulativeMark/cumulativeWeight, assignmentTotal['weighting']])
\ No newline at end of file
@@ -0,0 +1,84 @@
+#-----------------------------------------------------------------------------
+# Name:        asyncAssignments (asyncAssignments.py)
+# Purpose:     To allow assignments to be saved from asyncio programs
+#
+# Author:      Steven Wu
+# Created:     2020/02/11
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+
+from pymongo import UpdateOne
+from assignments import Assignments
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+from studentTotals import StudentTotals
+from storageLayout import StorageLayout
+
+class AsyncAssignments(Assignments):
+    '''
+    Object which holds the mark information of an assignment and saves it with asyncio,
+    inherits from the Assignments() class
+
+    save() is a coroutine making the same database changes as Assignments.save(), except that
+    the saved totals of affected students are removed to be recalculated when next viewed.
+    calculate() is inherited unchanged.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course the assignment is for
+    assignmentMarks: dict
+        Dictionary containing the marks in each category of an assignment
+    studentName : str
+        Name of the student the assignment belongs to, if applicable
+    context : GradingContext
+        Holds the course document and category weightings used by calculate()
+
+    Methods
+    -------
+    save(assignmentType : str= 'Student') -> str
+        Saves the assignment to the database
+    '''
+
+    async def save(self, assignmentType = 'Student') -> str:
+        '''
+        Saves the assignment to the database
+
+        Parameters
+        ----------
+        assignmentType : str, optional
+            Type of assignment clicked (Student or Course), defaults to 'Student'
+
+        Returns
+        -------
+        str
+            The same results as Assignments.save()
+        '''
+        error = self.parseEntries()
+        if error:
+            return (error)
+
+        normalized = await StorageLayout(self.username).getAsync() == 'normalized'
+        client = ConnectionManager.getAsyncClient()
+        studentCol = client['GradebookStudents'][self.username]
+        if assignmentType == 'Student':
+            self.trimStudentMarks(normalized)
+            studentQuery = {'student name': self.studentName,'course name' : self.courseName}
+            await studentCol.bulk_write(self.upsertRequests(studentQuery) + [UpdateOne(studentQuery, {'$unset': StudentTotals.unsetFields})])
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': self.courseName, 'student name': self.studentName})
+        elif assignmentType == 'Course':
+            courseCol = client['GradebookCourses'][self.username]
+            if normalized:
+                self.assignmentMarks['revision'] = StorageLayout.newRevision()
+                await courseCol.bulk_write(self.upsertRequests({'course name' : self.courseName}) + [self.revisionRequest()])
+                sharedCache.invalidate('GradebookCourses', self.username, {'course name': self.courseName})
+            else:
+                await courseCol.bulk_write(self.upsertRequests({'course name' : self.courseName}))
+                # The update also removes the saved totals of the students with the assignment
+                await studentCol.update_many(*self.weightingUpdate())
+                sharedCache.invalidate('GradebookCourses', self.username, {'course name': self.courseName})
+                sharedCache.invalidate('GradebookStudents', self.username, {'course name': self.courseName})
+        self.context.invalidate()
+        return('Saved')
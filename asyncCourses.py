@@ -0,0 +1,258 @@
+#-----------------------------------------------------------------------------
+# Name:        asyncCourses (asyncCourses.py)
+# Purpose:     To allow courses, students, categories and assignments to be
+#              managed from asyncio programs
+#
+# Author:      Steven Wu
+# Created:     2020/02/11
+# Updated:     2020/02/17
+#-----------------------------------------------------------------------------
+
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+from studentTotals import StudentTotals
+from storageLayout import StorageLayout
+
+class AsyncCourses():
+    '''
+    asyncio version of the Courses class
+
+    Every method is a coroutine with the same parameters, results and database changes as the
+    Courses method of the same name, so many courses or students can be fetched at once with
+    asyncio.gather(). Reads go through the same shared DocCache and writes invalidate it the
+    same way, so both versions can be used in one program. Instead of recalculating the saved
+    totals of affected students (see StudentTotals) the writes remove them, so they are
+    recalculated when next viewed.
+
+    Attributes
+    ----------
+    username : str
+    	Account username
+
+    Methods
+    -------
+    create(newName : str, courseName : str, option : str) -> str
+    	Attempts to create new courses or students
+    createWeighted(newName : str, weighting : str,option : str, courseName : str= '') -> str
+        Attempts to create mark categories or assignments (items with weightings)
+    docsGet(databaseName : str, query : dict = {}, projection : dict = None) -> list
+        Returns list of specified database documents
+    docGet(query : dict, databaseName : str, projection : dict = None) -> dict
+        Returns a single specified document
+    delete(databaseName : str, option: str, docName : str, subDocName : str = '') -> str
+        Deletes the requested document/item in document
+    '''
+
+    def __init__(self, username):
+        '''
+        Constructor to build an AsyncCourses object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        '''
+        self.username = username
+
+    async def create(self, newName, courseName, option) -> str:
+        '''
+        Attempts to create new courses or students
+
+        Parameters
+        ----------
+        newName : str
+            Name of the item
+        courseName : str
+            Name of the course the item is in (N/A if item is a course)
+        option : str
+            Indicates the type of item being added
+
+        Returns
+        -------
+        str
+            The same results as Courses.create()
+        '''
+        if newName == '':
+            return ('Please enter a name')
+        client = ConnectionManager.getAsyncClient()
+        courseCol = client['GradebookCourses'][self.username]
+
+        existingEntries = []
+        if option == 'Course':
+            async for x in courseCol.find({'course name':{'$exists': True}}, {'course name': 1}):
+                existingEntries.append(x['course name'].lower())
+            if newName.lower() in existingEntries:
+                return ('Course already exists')
+            await courseCol.insert_one({'course name': newName})
+            sharedCache.invalidate('GradebookCourses', self.username, {'course name': newName})
+            return ('Course has been added')
+        elif option == 'Student':
+            studentCol = client['GradebookStudents'][self.username]
+            async for x in studentCol.find({'course name': courseName}, {'student name': 1}):
+                existingEntries.append(x['student name'].lower())
+            if newName.lower() in existingEntries:
+                return ('Student already exists')
+            await studentCol.insert_one({'student name': newName, 'course name': courseName})
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': courseName, 'student name': newName})
+            return ('Student has been added')
+
+    async def createWeighted(self, newName, weighting, option, courseName = '') -> str:
+        '''
+        Attempts to create mark categories or assignments (items with weightings)
+
+        Parameters
+        ----------
+        newName : str
+            Name of the item to be added
+        weighting : str
+            Weighting of the item
+        option : str
+            Type of item being added
+        courseName : str, optional
+            Name of the course the assignment is in, if applicable
+
+        Returns
+        -------
+        str
+            The same results as Courses.createWeighted()
+        '''
+        if newName == '':
+            return ('Please enter a name')
+        client = ConnectionManager.getAsyncClient()
+        courseCol = client['GradebookCourses'][self.username]
+
+        existingEntries = []
+        if option == 'Assignment':
+            try:
+                for x in (await courseCol.find_one({'course name': courseName}, {'assignments.assignment name': 1}))['assignments']:
+                    existingEntries.append(x['assignment name'].lower())
+            except:
+                pass
+        elif option == 'Category':
+            async for x in courseCol.find({'category':{'$exists': True}}, {'category': 1}):
+                existingEntries.append(x['category'].lower())
+
+        if newName.lower() in existingEntries:
+            return (option+' already exists')
+        elif newName.lower() == 'adjusted weighting' or newName.lower() =='weighting' or newName.lower() == 'assignment name' or newName.lower() == 'revision':
+            return ("Those names aren't allowed")
+        try:
+            weighting = float(weighting.strip())
+        except:
+            return ('Weighting must be a number')
+        if not weighting >= 0:
+            return ("Weighting can't be negative")
+        if option =='Category':
+            await courseCol.insert_one({'category': newName, 'weighting': weighting})
+            await client['GradebookStudents'][self.username].update_many({}, {'$unset': StudentTotals.unsetFields})
+            sharedCache.invalidate('GradebookCourses', self.username, {'category': newName})
+            sharedCache.invalidate('GradebookStudents', self.username)
+        elif option == 'Assignment' and await StorageLayout(self.username).getAsync() == 'normalized':
+            await courseCol.update_one({'course name': courseName}, {'$push': {'assignments': {'assignment name' : newName, 'weighting':weighting}},
+                                                                     '$set': {'revision': StorageLayout.newRevision()}})
+            sharedCache.invalidate('GradebookCourses', self.username, {'course name': courseName})
+        elif option == 'Assignment':
+            studentCol = client['GradebookStudents'][self.username]
+            await courseCol.update_one({'course name': courseName}, {'$push': {'assignments': {'assignment name' : newName, 'weighting':weighting}}})
+            await studentCol.update_many({'course name':courseName},{'$push': {'assignments': {'assignment name' : newName,'weighting':weighting}}, '$unset': StudentTotals.unsetFields})
+            sharedCache.invalidate('GradebookCourses', self.username, {'course name': courseName})
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': courseName})
+        return (option+' Added')
+
+    async def docsGet(self, databaseName, query = {}, projection = None) -> list:
+        '''
+        Returns list of specified database documents
+
+        Results are served from the shared DocCache when possible
+
+        Parameters
+        ----------
+        databaseName : str
+            Name of the database
+        query : dict
+            Search query
+        projection : dict, optional
+            Fields to return, whole documents are returned if not given
+
+        Returns
+        -------
+        list
+        	List of documents
+        '''
+        collection = ConnectionManager.getAsyncClient()[databaseName][self.username]
+        key = sharedCache.makeKey('docsGet', databaseName, self.username, query, projection)
+        return (await sharedCache.fetchAsync(key, lambda: collection.find(query, projection).to_list(None)))
+
+    async def docGet(self, query, databaseName, projection = None) -> dict:
+        '''
+        Returns a single specified document
+
+        The document is served from the shared DocCache when possible
+
+        Parameters
+        ----------
+        query : dict
+            Search query
+        databaseName : str
+            Name of the database
+        projection : dict, optional
+            Fields to return, the whole document is returned if not given
+
+        Returns
+        -------
+        dict
+            The document
+        '''
+        collection = ConnectionManager.getAsyncClient()[databaseName][self.username]
+        key = sharedCache.makeKey('docGet', databaseName, self.username, query, projection)
+        return (await sharedCache.fetchAsync(key, lambda: collection.find_one(query, projection)))
+
+    async def delete(self, databaseName, option, docName, subDocName='') -> str:
+        '''
+        Deletes the requested document/item in document
+
+        Parameters
+        ----------
+        databaseName : str
+            Name of database
+        option : str
+            Type of item being deleted
+        docName : str
+            Name of the document
+        subDocName : str, optional
+            Name of the item in the document, if applicable
+
+        Returns
+        -------
+        str
+            The result of the deletion to display
+        '''
+        client = ConnectionManager.getAsyncClient()
+        collection = client[databaseName][self.username]
+        studentCol = client['GradebookStudents'][self.username]
+        if option == 'Course':
+            await collection.delete_one({'course name': docName})
+            await studentCol.delete_many({'course name':docName})
+            sharedCache.invalidate('GradebookCourses', self.username, {'course name': docName})
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': docName})
+        elif option == 'Student':
+            await collection.delete_one({'course name': docName, 'student name': subDocName})
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': docName, 'student name': subDocName})
+        elif option == 'Category':
+            categoryKey = 'assignments.$[].'+docName
+            await collection.delete_one({'category': docName})
+            await collection.update_many({'course name': {'$exists': True}}, {'$unset':{categoryKey : {'$exists': True}}})
+            await studentCol.update_many({},{'$unset':dict(StudentTotals.unsetFields, **{categoryKey : {'$exists': True}})})
+            sharedCache.invalidate('GradebookCourses', self.username)
+            sharedCache.invalidate('GradebookStudents', self.username)
+        elif option == 'Assignment' and await StorageLayout(self.username).getAsync() == 'normalized':
+            await collection.update_one({'course name': docName},{'$pull':{'assignments':{ 'assignment name': subDocName }}, '$set': {'revision': StorageLayout.newRevision()}})
+            await studentCol.update_many({'course name': docName},{'$pull':{'assignments':{ 'assignment name': subDocName }}})
+            sharedCache.invalidate('GradebookCourses', self.username, {'course name': docName})
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': docName})
+        elif option == 'Assignment':
+            await collection.update_one({'course name': docName},{'$pull':{'assignments':{ 'assignment name': subDocName }}})
+            await studentCol.update_many({'course name': docName},{'$pull':{'assignments':{ 'assignment name': subDocName }}, '$unset': StudentTotals.unsetFields})
+            sharedCache.invalidate('GradebookCourses', self.username, {'course name': docName})
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': docName})
+        return (option+' deleted')
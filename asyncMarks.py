@@ -0,0 +1,187 @@
+#-----------------------------------------------------------------------------
+# Name:        asyncMarks (asyncMarks.py)
+# Purpose:     To allow the marks of students to be calculated from asyncio
+#              programs
+#
+# Author:      Steven Wu
+# Created:     2020/02/11
+# Updated:     2020/02/11
+#-----------------------------------------------------------------------------
+
+import asyncio
+from asyncCourses import AsyncCourses
+from gradingContext import GradingContext
+from marks import Marks
+
+class AsyncMarks():
+    '''
+    Object which fetches a student's mark information with asyncio
+
+    The course document, category weightings and student document are fetched concurrently
+    and handed to a Marks object, so the marks are calculated by exactly the same code as
+    in the rest of the program.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course
+    studentName : str
+        Name of the student
+    context : GradingContext
+        Course document and category weightings, None until they are fetched
+
+    Methods
+    -------
+    loadContext(username : str, courseName : str) -> GradingContext
+        Fetches the course document and category weightings of a course
+    load() -> Marks
+        Fetches the student's documents and returns their Marks object
+    totalMark() -> float
+        Calculates the student's mark
+    totalMarkAdjusted() -> float
+        Calculates the student's adjusted mark
+    courseTotals(username : str, courseName : str) -> dict
+        Calculates the default and adjusted marks of every student in a course
+    '''
+
+    def __init__(self, username, courseName, studentName, context = None):
+        '''
+        Constructor to build an AsyncMarks object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+        studentName : str
+            Name of the student
+        context : GradingContext, optional
+            Context already loaded by loadContext(), fetched by load() if not given
+        '''
+        self.username = username
+        self.courseName = courseName
+        self.studentName = studentName
+        self.context = context
+
+    @staticmethod
+    async def loadContext(username, courseName) -> GradingContext:
+        '''
+        Fetches the course document and category weightings of a course
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+
+        Returns
+        -------
+        GradingContext
+            Context holding both, shared by every student of the course
+        '''
+        courseObj = AsyncCourses(username)
+        courseDoc, categories = await asyncio.gather(
+            courseObj.docGet({'course name': courseName}, 'GradebookCourses', {'course name': 1, 'assignments': 1, 'revision': 1}),
+            courseObj.docsGet('GradebookCourses', {'category': {'$exists': True}}, {'category': 1, 'weighting': 1}))
+        weightings = {}
+        for x in categories:
+            weightings[x['category']] = x['weighting']
+        return (GradingContext(username, courseName, courseDoc or {}, weightings))
+
+    async def load(self) -> Marks:
+        '''
+        Fetches the student's documents and returns their Marks object
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Marks
+            The student's Marks object, which does not need the database afterwards
+        '''
+        studentQuery = AsyncCourses(self.username).docGet({'student name': self.studentName, 'course name': self.courseName}, 'GradebookStudents')
+        if self.context is None:
+            self.context, studentDoc = await asyncio.gather(self.loadContext(self.username, self.courseName), studentQuery)
+        else:
+            studentDoc = await studentQuery
+        return (Marks(self.username, self.courseName, self.studentName, studentDoc or {}, self.context))
+
+    async def totalMark(self) -> float:
+        '''
+        Calculates the student's mark
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        float
+            The student's mark
+
+        Raises
+        -------
+        ZeroDivisionError
+            If the student has no assignments that can be marked, like Marks.totalMark()
+        '''
+        return ((await self.load()).totalMark())
+
+    async def totalMarkAdjusted(self) -> float:
+        '''
+        Calculates the student's adjusted mark
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        float
+            The student's adjusted mark
+
+        Raises
+        -------
+        ZeroDivisionError
+            If the student has no assignments that can be marked, like Marks.totalMarkAdjusted()
+        '''
+        return ((await self.load()).totalMarkAdjusted())
+
+    @staticmethod
+    async def courseTotals(username, courseName) -> dict:
+        '''
+        Calculates the default and adjusted marks of every student in a course
+
+        The course's documents are fetched once for all of its students
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+
+        Returns
+        -------
+        dict
+            Student names mapped to [default mark, adjusted mark], a mark is None where
+            Marks.totalMark() or Marks.totalMarkAdjusted() would raise ZeroDivisionError
+        '''
+        context, studentDocs = await asyncio.gather(AsyncMarks.loadContext(username, courseName),
+                                                    AsyncCourses(username).docsGet('GradebookStudents', {'course name': courseName}))
+        results = {}
+        for studentDoc in studentDocs:
+            markObj = Marks(username, courseName, studentDoc['student name'], studentDoc, context)
+            totals = []
+            for total in (markObj.totalMark, markObj.totalMarkAdjusted):
+                try:
+                    totals.append(total())
+                except ZeroDivisionError:
+                    totals.append(None)
+            results[studentDoc['student name']] = totals
+        return (results)
@@ -0,0 +1,130 @@
+#-----------------------------------------------------------------------------
+# Name:        asyncGrading (asyncGrading.py)
+# Purpose:     To compare the time taken to grade every student of an account
+#              with the synchronous classes and with the asyncio classes
+#
+# Author:      Steven Wu
+# Created:     2020/02/11
+# Updated:     2020/02/11
+#-----------------------------------------------------------------------------
+# Usage: python benchmarks/asyncGrading.py [courses] [students] [repeats]
+# Runs against the database in connectionString.py using a throwaway account
+# whose collections are dropped afterwards. The shared DocCache is cleared
+# before every run so both versions fetch everything from the server.
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+from courses import Courses
+from marks import Marks
+from asyncMarks import AsyncMarks
+
+def gradeSync(username, courseNames) -> dict:
+    '''
+    Grades every student one at a time with the Marks class, as studentClicked() does
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseNames : list
+        Names of the courses
+
+    Returns
+    -------
+    dict
+        Course names mapped to student names mapped to [default mark, adjusted mark]
+    '''
+    results = {}
+    for courseName in courseNames:
+        results[courseName] = {}
+        for x in Courses(username).docsGet('GradebookStudents', {'course name': courseName}, {'student name': 1}):
+            markObj = Marks(username, courseName, x['student name'])
+            totals = []
+            for total in (markObj.totalMark, markObj.totalMarkAdjusted):
+                try:
+                    totals.append(total())
+                except ZeroDivisionError:
+                    totals.append(None)
+            results[courseName][x['student name']] = totals
+    return (results)
+
+async def gradeAsync(username, courseNames) -> dict:
+    '''
+    Grades every course concurrently with AsyncMarks.courseTotals()
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseNames : list
+        Names of the courses
+
+    Returns
+    -------
+    dict
+        Course names mapped to student names mapped to [default mark, adjusted mark]
+    '''
+    totals = await asyncio.gather(*[AsyncMarks.courseTotals(username, x) for x in courseNames])
+    await ConnectionManager.closeAsync()
+    return (dict(zip(courseNames, totals)))
+
+def timeRuns(function, repeats) -> list:
+    '''
+    Runs a function several times with an empty cache and returns its last result and the average milliseconds per run
+
+    Parameters
+    ----------
+    function : function
+        Function to run
+    repeats : int
+        Number of runs
+
+    Returns
+    -------
+    list
+        [result of the last run, milliseconds per run]
+    '''
+    elapsed = 0
+    for x in range(repeats):
+        sharedCache.clear()
+        start = time.perf_counter()
+        result = function()
+        elapsed += time.perf_counter() - start
+    return ([result, elapsed*1000/repeats])
+
+def main(courseCount = 5, studentCount = 30, repeats = 5) -> None:
+    client = ConnectionManager.getClient()
+    username = 'benchmark-' + uuid.uuid4().hex[:8]
+    courseCol = client['GradebookCourses'][username]
+    studentCol = client['GradebookStudents'][username]
+    categories = ['Knowledge', 'Thinking', 'Communication', 'Application']
+    courseNames = ['Course '+str(x) for x in range(courseCount)]
+    try:
+        courseCol.insert_many([{'category': x, 'weighting': 1.0 + index} for index, x in enumerate(categories)])
+        for courseName in courseNames:
+            masters = [dict({'assignment name': 'Test '+str(x), 'weighting': 1.0}, **{y: 20.0 for y in categories}) for x in range(10)]
+            courseCol.insert_one({'course name': courseName, 'assignments': masters})
+            studentCol.insert_many([{'student name': 'Student '+str(x), 'course name': courseName,
+                                     'assignments': [dict(y, **{z: float((x + index) % 21) for z in categories}) for index, y in enumerate(masters)]}
+                                    for x in range(studentCount)])
+
+        syncResult, syncTime = timeRuns(lambda: gradeSync(username, courseNames), repeats)
+        asyncResult, asyncTime = timeRuns(lambda: asyncio.run(gradeAsync(username, courseNames)), repeats)
+        print('{} courses x {} students'.format(courseCount, studentCount))
+        print('{:<10}{:>14}'.format('', 'ms/account'))
+        print('{:<10}{:>14.1f}'.format('sync', syncTime))
+        print('{:<10}{:>14.1f}'.format('asyncio', asyncTime))
+        print('results match: ' + str(syncResult == asyncResult))
+    finally:
+        courseCol.drop()
+        studentCol.drop()
+        ConnectionManager.close()
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:4]])
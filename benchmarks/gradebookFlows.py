@@ -0,0 +1,337 @@
+#-----------------------------------------------------------------------------
+# Name:        gradebookFlows (gradebookFlows.py)
+# Purpose:     To time the program's main flows on generated accounts and count
+#              the database queries each one makes
+#
+# Author:      Steven Wu
+# Created:     2020/02/18
+# Updated:     2020/02/24
+#-----------------------------------------------------------------------------
+# Usage: python benchmarks/gradebookFlows.py [--backend mongomock|sqlite|mongo]
+#            [--courses n] [--students n] [--assignments n] [--categories n]
+#            [--repeats n] [--seed n] [--layout embedded|normalized] [--warm] [--json file]
+# The mongomock backend (the default) keeps the account in memory and needs the
+# mongomock package. The sqlite backend uses a temporary file and the mongo
+# backend uses a throwaway account on the server in connectionString.py, which
+# is deleted afterwards. Unless --warm is given the shared DocCache is cleared
+# before every run, so every read reaches the database.
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from aggregateGrading import AggregateGrading
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+from assignments import Assignments
+from courses import Courses
+from gradeEngine import GradeEngine
+from reportCards import fetchAccount, gradeStudents
+from storageLayout import StorageLayout
+from studentTotals import StudentTotals
+from userAccount import UserAccount
+
+class QueryCounter():
+    '''
+    Object which counts the collection methods called through a CountingClient
+
+    Each call is one request to the database, except that a cursor fetching more than one
+    batch makes further requests which are not counted
+
+    Attributes
+    ----------
+    counts : dict
+        Method names mapped to the number of calls since the last reset
+
+    Methods
+    -------
+    reset() -> None
+        Sets every count back to zero
+    total() -> int
+        Returns the number of calls since the last reset
+    '''
+    def __init__(self):
+        self.counts = {}
+
+    def reset(self) -> None:
+        self.counts = {}
+
+    def total(self) -> int:
+        return (sum(self.counts.values()))
+
+class CountingClient():
+    '''
+    Wrapper of a client, database or collection which counts the queries made through it
+
+    Databases and collections taken from the wrapper are wrapped as well, every other
+    attribute is the wrapped object's own
+
+    Attributes
+    ----------
+    target : object
+        The wrapped client, database or collection
+    counter : QueryCounter
+        Counter the calls are added to
+    operations : set
+        Names of the methods that send a request to the database
+    '''
+    operations = {'find', 'find_one', 'count_documents', 'aggregate', 'insert_one', 'insert_many', 'update_one', 'update_many',
+                  'replace_one', 'delete_one', 'delete_many', 'bulk_write', 'create_index', 'drop', 'list_collection_names', 'command'}
+
+    def __init__(self, target, counter):
+        self.target = target
+        self.counter = counter
+
+    def __getitem__(self, name):
+        return (CountingClient(self.target[name], self.counter))
+
+    def __getattr__(self, name):
+        attribute = getattr(self.target, name)
+        if name not in self.operations:
+            return (attribute)
+        def counted(*args, **kwargs):
+            self.counter.counts[name] = self.counter.counts.get(name, 0) + 1
+            return (attribute(*args, **kwargs))
+        return (counted)
+
+def generateAccount(username, courseCount, studentCount, assignmentCount, categoryCount, seed = 0) -> list:
+    '''
+    Registers an account and fills it with random courses, categories and marked students
+
+    Course assignments use a random subset of the categories, some students are missing
+    assignments or marks and some have adjusted weightings, like a real account
+
+    Parameters
+    ----------
+    username : str
+        Account username, the password is the same as the username
+    courseCount : int
+        Number of courses
+    studentCount : int
+        Number of students in each course
+    assignmentCount : int
+        Number of assignments in each course
+    categoryCount : int
+        Number of mark categories
+    seed : int, optional
+        Seed of the random numbers, the same seed gives the same account
+
+    Returns
+    -------
+    list
+        Names of the courses
+    '''
+    randomizer = random.Random(seed)
+    UserAccount(username, username).register(username)
+    client = ConnectionManager.getClient()
+    courseCol = client['GradebookCourses'][username]
+    studentCol = client['GradebookStudents'][username]
+    categories = ['Category '+str(x) for x in range(categoryCount)]
+    if categories:
+        courseCol.insert_many([{'category': x, 'weighting': float(randomizer.choice([10, 20, 25, 30]))} for x in categories])
+    courseNames = ['Course '+str(x) for x in range(courseCount)]
+    for courseName in courseNames:
+        masters = []
+        for x in range(assignmentCount):
+            master = {'assignment name': 'Assignment '+str(x)}
+            for category in randomizer.sample(categories, randomizer.randint(1, categoryCount)) if categories else []:
+                master[category] = float(randomizer.choice([10, 20, 25, 50]))
+            master['weighting'] = float(randomizer.choice([1, 2, 5]))
+            masters.append(master)
+        courseCol.insert_one({'course name': courseName, 'assignments': masters})
+        students = []
+        for x in range(studentCount):
+            assignments = []
+            for master in masters:
+                if randomizer.random() < 0.1:
+                    continue
+                assignment = {'assignment name': master['assignment name']}
+                for category in master:
+                    if category in categories and randomizer.random() < 0.95:
+                        assignment[category] = round(randomizer.uniform(0, master[category]), 1)
+                assignment['weighting'] = master['weighting']
+                if randomizer.random() < 0.1:
+                    assignment['adjusted weighting'] = float(randomizer.choice([0, 1, 3]))
+                assignments.append(assignment)
+            students.append({'student name': 'Student '+str(x), 'course name': courseName, 'assignments': assignments})
+        studentCol.insert_many(students)
+    return (courseNames)
+
+def flows(username, courseNames, studentCount, assignmentCount) -> dict:
+    '''
+    Returns the flows to time, each a function of the run number
+
+    Each flow makes the same calls as the screen it is named after, without the widgets
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseNames : list
+        Names of the courses
+    studentCount : int
+        Number of students in each course
+    assignmentCount : int
+        Number of assignments in each course
+
+    Returns
+    -------
+    dict
+        Flow names mapped to functions
+    '''
+    courseName = lambda run: courseNames[run % len(courseNames)]
+    studentName = lambda run: 'Student '+str(run % studentCount)
+    assignmentName = lambda run: 'Assignment '+str(run % assignmentCount)
+
+    def courseClicked(run):
+        courseObj = Courses(username)
+        return (courseObj.docsGet('GradebookStudents', {'course name': courseName(run)}, {'student name': 1}),
+                courseObj.docGet({'course name': courseName(run)}, 'GradebookCourses', {'assignments.assignment name': 1, 'assignments.weighting': 1}))
+
+    def assignmentClicked(run):
+        projection = {'assignments': {'$elemMatch': {'assignment name': assignmentName(run)}}}
+        courseObj = Courses(username)
+        return (courseObj.docGet({'course name': courseName(run), 'student name': studentName(run)}, 'GradebookStudents', projection),
+                courseObj.docGet({'course name': courseName(run)}, 'GradebookCourses', projection))
+
+    def studentSave(run):
+        master = Courses(username).docGet({'course name': courseName(run)}, 'GradebookCourses', {'assignments': {'$elemMatch': {'assignment name': assignmentName(run)}}})['assignments'][0]
+        marks = {x: str(float(run % 10)) for x in master if x not in GradeEngine.reservedKeys}
+        marks.update({'assignment name': master['assignment name'], 'weighting': str(master['weighting']), 'adjusted weighting': str(float(run % 3))})
+        return (Assignments(username, courseName(run), marks, studentName(run)).save('Student'))
+
+    def courseSave(run):
+        master = Courses(username).docGet({'course name': courseName(run)}, 'GradebookCourses', {'assignments': {'$elemMatch': {'assignment name': assignmentName(run)}}})['assignments'][0]
+        marks = {x: str(master[x]) for x in master if x not in GradeEngine.reservedKeys}
+        marks.update({'assignment name': master['assignment name'], 'weighting': str(float(run % 4 + 1))})
+        return (Assignments(username, courseName(run), marks).save('Course'))
+
+    def bulkGrading(run):
+        courseDocs, weightings, studentDocs = fetchAccount(username)
+        return ([gradeStudents(username, x, weightings, studentDocs.get(x['course name'], [])) for x in courseDocs])
+
+    def bulkGradingEngine(run):
+        totals = {}
+        for x in courseNames:
+            engine = GradeEngine(username, x)
+            engine.load()
+            totals[x] = engine.totalMarks()
+        return (totals)
+
+    def bulkGradingAggregate(run):
+        return ({x: AggregateGrading(username, x).leaderboard() for x in courseNames})
+
+    # Deleting goes last, since it removes a student from the account
+    return ({'login': lambda run: UserAccount(username, username).login(),
+             'confirm (session)': lambda run: UserAccount(username, username).confirm(),
+             'loadCourses': lambda run: Courses(username).courseSummaries(),
+             'courseClicked': courseClicked,
+             'studentClicked': lambda run: StudentTotals(username, courseName(run)).read(studentName(run)),
+             'assignmentClicked': assignmentClicked,
+             'save (student)': studentSave,
+             'save (course)': courseSave,
+             'add assignment': lambda run: Courses(username).createWeighted('Added '+str(run), '1', 'Assignment', courseName(run)),
+             'bulk grading (Marks)': bulkGrading,
+             'bulk grading (GradeEngine)': bulkGradingEngine,
+             'bulk grading (aggregation)': bulkGradingAggregate,
+             'delete student': lambda run: Courses(username).delete('GradebookStudents', 'Student', courseName(run), 'Student '+str(run // len(courseNames)))})
+
+def run(options, counter) -> dict:
+    '''
+    Generates an account on the current client and times every flow
+
+    Parameters
+    ----------
+    options : Namespace
+        The parsed command line options
+    counter : QueryCounter
+        Counter of the client's queries
+
+    Returns
+    -------
+    dict
+        Flow names mapped to dicts with the 'ms' and 'queries' per run and the
+        'operations' (method names mapped to calls per run)
+    '''
+    username = 'benchmark-' + uuid.uuid4().hex[:8]
+    client = ConnectionManager.getClient()
+    try:
+        courseNames = generateAccount(username, options.courses, options.students, options.assignments, options.categories, options.seed)
+        if options.layout == 'normalized':
+            StorageLayout(username).migrate('normalized')
+        results = {}
+        for name, function in flows(username, courseNames, options.students, options.assignments).items():
+            elapsed = 0
+            counter.reset()
+            for x in range(options.repeats):
+                if not options.warm:
+                    sharedCache.clear()
+                start = time.perf_counter()
+                function(x)
+                elapsed += time.perf_counter() - start
+            results[name] = {'ms': elapsed*1000/options.repeats, 'queries': counter.total()/options.repeats,
+                             'operations': {x: y/options.repeats for x, y in sorted(counter.counts.items())}}
+        return (results)
+    finally:
+        client['GradebookCourses'][username].drop()
+        client['GradebookStudents'][username].drop()
+        client['GradebookLogin']['login'].delete_many({'username': username})
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = 'Times the main flows of the program on a generated account')
+    parser.add_argument('--backend', choices = ['mongomock', 'sqlite', 'mongo'], default = 'mongomock')
+    parser.add_argument('--courses', type = int, default = 5)
+    parser.add_argument('--students', type = int, default = 30)
+    parser.add_argument('--assignments', type = int, default = 10)
+    parser.add_argument('--categories', type = int, default = 4)
+    parser.add_argument('--repeats', type = int, default = 20)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--layout', choices = StorageLayout.layouts, default = 'embedded')
+    parser.add_argument('--warm', action = 'store_true', help = 'keep the shared DocCache between runs')
+    parser.add_argument('--json', help = 'also write the results to this file')
+    options = parser.parse_args(arguments)
+    if min(options.courses, options.students, options.assignments, options.repeats) < 1:
+        parser.error('there must be at least one course, student, assignment and repeat')
+
+    counter = QueryCounter()
+    directory = tempfile.TemporaryDirectory()
+    if options.backend == 'mongomock':
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit('mongomock is not installed (pip install mongomock), use --backend sqlite instead')
+        client = mongomock.MongoClient()
+    elif options.backend == 'sqlite':
+        from sqliteBackend import SQLiteClient
+        client = SQLiteClient(os.path.join(directory.name, 'benchmark.sqlite3'))
+    else:
+        import pymongo
+        try:
+            from connectionString import connectionStr
+        except ImportError:
+            sys.exit('connectionString.py not found, use --backend mongomock or sqlite instead')
+        client = pymongo.MongoClient(connectionStr, **ConnectionManager.poolOptions)
+    ConnectionManager.setClient(CountingClient(client, counter))
+    try:
+        results = run(options, counter)
+    finally:
+        ConnectionManager.close()
+        directory.cleanup()
+
+    print('{} backend, {} layout, {} courses x {} students x {} assignments, {} categories{}'.format(
+          options.backend, options.layout, options.courses, options.students, options.assignments, options.categories, ', warm cache' if options.warm else ''))
+    print('{:<28}{:>12}{:>10}  {}'.format('', 'ms/run', 'queries', 'queries by method'))
+    for name, result in results.items():
+        operations = ', '.join('{} {:g}'.format(x, y) for x, y in result['operations'].items())
+        print('{:<28}{:>12.2f}{:>10.1f}  {}'.format(name, result['ms'], result['queries'], operations))
+    if options.json:
+        with open(options.json, 'w') as file:
+            json.dump({'options': vars(options), 'results': results}, file, indent = 2)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
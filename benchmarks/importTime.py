@@ -0,0 +1,90 @@
+#-----------------------------------------------------------------------------
+# Name:        importTime (importTime.py)
+# Purpose:     To measure how long the program's modules take to import and
+#              check that the headless modules do not import tkinter
+#
+# Author:      Steven Wu
+# Created:     2020/02/20
+# Updated:     2020/02/20
+#-----------------------------------------------------------------------------
+# Usage: python benchmarks/importTime.py [repeats]
+# Imports each module in a new interpreter with python -X importtime and prints
+# the median cumulative import time, the slowest dependency and whether tkinter
+# and numpy were loaded. Exits with status 1 if a headless module imports tkinter.
+
+import os
+import statistics
+import subprocess
+import sys
+
+directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Statements timed, and if they must work without tkinter
+statements = [('import gradebook', True),
+              ('gradebook.Courses', True),
+              ('gradebook.UserAccount', True),
+              ('gradebook.Assignments', True),
+              ('gradebook.Marks', True),
+              ('gradebook.StudentTotals', True),
+              ('gradebook.GradeEngine', True),
+              ('gradebook.exporter', True),
+              ('gradebook.reportCards', True),
+              ('import main', False)]
+
+def timeImport(statement, startup = ()) -> dict:
+    '''
+    Runs a statement in a new interpreter and returns what it imported
+
+    Parameters
+    ----------
+    statement : str
+        'import module' or 'gradebook.Name'
+    startup : set, optional
+        Names of the modules imported when the interpreter starts, which are not counted
+
+    Returns
+    -------
+    dict
+        The total import time in ms ('ms'), the slowest top level import ('slowest') and
+        the names of the imported modules ('modules')
+    '''
+    code = statement if statement.startswith(('import ', 'pass')) else 'import gradebook; ' + statement
+    code += '; import sys; print(" ".join(sys.modules))'
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd = directory, capture_output = True, text = True)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    total = 0
+    slowest = ('', 0)
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        fields = line.split('|')
+        cumulative = int(fields[1])
+        # Top level imports are not indented
+        if not fields[2].startswith('  ') and fields[2].strip() not in startup:
+            total += cumulative
+            if cumulative > slowest[1]:
+                slowest = (fields[2].strip(), cumulative)
+    return ({'ms': total / 1000, 'slowest': slowest[0], 'modules': set(process.stdout.split())})
+
+def main(repeats = 5) -> None:
+    failed = False
+    startup = timeImport('pass')['modules']
+    print('{:<26}{:>10}  {:<20}{:>9}{:>7}'.format('statement', 'median ms', 'slowest import', 'tkinter', 'numpy'))
+    for statement, headless in statements:
+        try:
+            runs = [timeImport(statement, startup) for x in range(repeats)]
+        except RuntimeError as error:
+            print('{:<26}{:>10}  {}'.format(statement, 'failed', error))
+            continue
+        modules = runs[-1]['modules']
+        print('{:<26}{:>10.1f}  {:<20}{:>9}{:>7}'.format(statement, statistics.median(x['ms'] for x in runs), runs[-1]['slowest'],
+                                                         'yes' if 'tkinter' in modules else 'no', 'yes' if 'numpy' in modules else 'no'))
+        if headless and 'tkinter' in modules:
+            failed = True
+    if failed:
+        print('A headless module imported tkinter')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -0,0 +1,194 @@
+#-----------------------------------------------------------------------------
+# Name:        navigationSoak (navigationSoak.py)
+# Purpose:     To check that the main screen's widgets and memory stay flat over
+#              thousands of page changes
+#
+# Author:      Steven Wu
+# Created:     2020/02/23
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# Usage: python benchmarks/navigationSoak.py [--backend mongomock|sqlite]
+#            [--navigations n] [--sample n] [--students n] [--assignments n]
+# Opens the MainScreen (a display is needed) on a generated account and keeps
+# going around the course list, a course, a student, the student's assignment and
+# the course's assignment, scrolling every page. Every --sample navigations the
+# number of widgets, the number of Tcl commands, the memory traced by tracemalloc
+# and the process's resident memory are printed. The widget and Tcl command counts
+# are taken on the same page each time, so they must not change once the first
+# cycle is done; the exit code is 1 if they do.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tkinter import TclError, Toplevel
+from connectionManager import ConnectionManager
+from gradebookFlows import generateAccount
+
+def countWidgets(widget) -> int:
+    '''
+    Returns the number of widgets inside a widget, including itself
+
+    Parameters
+    ----------
+    widget : Widget
+        The outermost widget
+
+    Returns
+    -------
+    int
+        Number of widgets
+    '''
+    return (1 + sum([countWidgets(x) for x in widget.winfo_children()]))
+
+def residentMemory() -> int:
+    '''
+    Returns the resident memory of the process in kilobytes, 0 where /proc can't be read
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    int
+        Resident memory in kilobytes
+    '''
+    try:
+        with open('/proc/self/statm') as file:
+            return (int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024)
+    except (OSError, ValueError, IndexError):
+        return (0)
+
+def waitForPage(screen, timeout = 10.0) -> None:
+    '''
+    Runs the Tk event loop until the page being loaded is displayed
+
+    Parameters
+    ----------
+    screen : MainScreen
+        The main screen
+    timeout : float, optional
+        Number of seconds to wait, defaults to 10
+
+    Returns
+    -------
+    None
+
+    Raises
+    -------
+    TimeoutError
+        If the page isn't displayed in time
+    '''
+    end = time.perf_counter() + timeout
+    while screen.loadingLabel is not None:
+        if time.perf_counter() > end:
+            raise TimeoutError('page did not load within ' + str(timeout) + ' seconds')
+        screen.update()
+        time.sleep(0.002)
+    # Scrolling makes the virtual lists reuse their widgets for other rows
+    screen.scrollCanvas.yview_moveto(0.5)
+    screen.update()
+    screen.scrollCanvas.yview_moveto(0)
+    screen.update()
+
+def cycle(screen, courseName, studentName, assignmentName) -> list:
+    '''
+    Returns the navigations of one cycle, each a function which opens a page
+
+    Parameters
+    ----------
+    screen : MainScreen
+        The main screen
+    courseName : str
+        Course opened
+    studentName : str
+        Student opened
+    assignmentName : str
+        Assignment opened
+
+    Returns
+    -------
+    list
+        The navigations, the cycle ends on the course list
+    '''
+    return ([lambda: screen.courseClicked(courseName),
+             lambda: screen.studentClicked(studentName, courseName),
+             lambda: screen.assignmentClicked(assignmentName, courseName, 'Student', studentName),
+             lambda: screen.courseClicked(courseName),
+             lambda: screen.assignmentClicked(assignmentName, courseName, 'Course'),
+             lambda: screen.loadCourses()])
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = "Checks that the main screen's widgets and memory stay flat over many page changes")
+    parser.add_argument('--backend', choices = ['mongomock', 'sqlite'], default = 'mongomock')
+    parser.add_argument('--navigations', type = int, default = 3000)
+    parser.add_argument('--sample', type = int, default = 300, help = 'navigations between measurements')
+    parser.add_argument('--students', type = int, default = 60)
+    parser.add_argument('--assignments', type = int, default = 20)
+    options = parser.parse_args(arguments)
+
+    directory = tempfile.TemporaryDirectory()
+    if options.backend == 'mongomock':
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit('mongomock is not installed (pip install mongomock), use --backend sqlite instead')
+        client = mongomock.MongoClient()
+    else:
+        from sqliteBackend import SQLiteClient
+        client = SQLiteClient(os.path.join(directory.name, 'soak.sqlite3'))
+    ConnectionManager.setClient(client)
+    username = 'soak'
+    courseNames = generateAccount(username, 1, options.students, options.assignments, 4)
+
+    from main import MainScreen
+    try:
+        screen = MainScreen()
+    except TclError as e:
+        sys.exit('the main screen could not be opened (' + str(e) + '), a display is needed')
+    for x in screen.winfo_children():
+        if isinstance(x, Toplevel):
+            x.destroy()
+    screen.currentAccount = username
+    screen.deiconify()
+    screen.loadCourses()
+    waitForPage(screen)
+
+    # Every sample is taken on the course list, after a whole number of cycles
+    navigations = cycle(screen, courseNames[0], 'Student 0', 'Assignment 0')
+    sample = max(options.sample // len(navigations), 1) * len(navigations)
+    tracemalloc.start()
+    samples = []
+    start = time.perf_counter()
+    try:
+        for count in range(1, options.navigations + 1):
+            navigations[(count - 1) % len(navigations)]()
+            waitForPage(screen)
+            if count % sample == 0:
+                samples.append({'navigations': count, 'widgets': countWidgets(screen), 'commands': len(screen.tk.call('info', 'commands')),
+                                'traced': tracemalloc.get_traced_memory()[0] // 1024, 'resident': residentMemory(), 'seconds': time.perf_counter() - start})
+                print('{navigations:>8} navigations {widgets:>6} widgets {commands:>7} Tcl commands {traced:>8} KB traced {resident:>8} KB resident {seconds:>8.1f} s'.format(**samples[-1]))
+    finally:
+        tracemalloc.stop()
+        screen.closed()
+        ConnectionManager.close()
+        directory.cleanup()
+
+    if len(samples) < 2:
+        print('Not enough samples, use more --navigations or a smaller --sample')
+        return
+    first, last = samples[0], samples[-1]
+    scale = 1000 / (last['navigations'] - first['navigations'])
+    print('Growth per 1000 navigations: {:g} widgets, {:g} Tcl commands, {:.1f} KB traced, {:.1f} KB resident'.format(
+          (last['widgets'] - first['widgets']) * scale, (last['commands'] - first['commands']) * scale,
+          (last['traced'] - first['traced']) * scale, (last['resident'] - first['resident']) * scale))
+    if last['widgets'] != first['widgets'] or last['commands'] != first['commands']:
+        print('Widgets or Tcl commands are leaking')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
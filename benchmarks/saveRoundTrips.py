@@ -0,0 +1,191 @@
+#-----------------------------------------------------------------------------
+# Name:        saveRoundTrips (saveRoundTrips.py)
+# Purpose:     To measure the number of database round trips and the time taken
+#              by Assignments.save compared with the old pull-then-push save
+#
+# Author:      Steven Wu
+# Created:     2020/02/06
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# Usage: python benchmarks/saveRoundTrips.py [students] [repeats] [--backend server|mongomock|sqlite]
+# Runs against the database in connectionString.py using a throwaway account
+# whose collections are dropped afterwards. The server's commands are counted
+# with a CommandListener. With --backend mongomock or sqlite no server is needed
+# and the collection methods called are counted instead (see gradebookFlows.py).
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pymongo import monitoring
+from connectionManager import ConnectionManager
+from assignments import Assignments
+from gradebookFlows import CountingClient, QueryCounter
+
+class CommandCounter(monitoring.CommandListener):
+    '''
+    Command listener which counts the commands sent to the server
+
+    Attributes
+    ----------
+    count : int
+        Number of commands started since the last reset
+
+    Methods
+    -------
+    reset() -> None
+        Sets the count back to zero
+    total() -> int
+        Returns the number of commands since the last reset
+    started(event : CommandStartedEvent) -> None
+        Counts a command
+    succeeded(event : CommandSucceededEvent) -> None
+        Ignores the event
+    failed(event : CommandFailedEvent) -> None
+        Ignores the event
+    '''
+    def __init__(self):
+        self.count = 0
+
+    def reset(self) -> None:
+        self.count = 0
+
+    def total(self) -> int:
+        return (self.count)
+
+    def started(self, event) -> None:
+        self.count += 1
+
+    def succeeded(self, event) -> None:
+        pass
+
+    def failed(self, event) -> None:
+        pass
+
+class Entry():
+    '''
+    Stand-in for the tkinter StringVar objects Assignments.save() reads entries from
+    '''
+    def __init__(self, value):
+        self.value = value
+
+    def get(self) -> str:
+        return (self.value)
+
+def legacySave(username, courseName, assignmentMarks, assignmentType, studentName = '') -> None:
+    '''
+    The save sequence used before single-request saves: fetch, $pull, $push and two update_many calls
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course
+    assignmentMarks : dict
+        Assignment marks, already converted to numbers
+    assignmentType : str
+        'Student' or 'Course'
+    studentName : str, optional
+        Name of the student, if applicable
+
+    Returns
+    -------
+    None
+    '''
+    client = ConnectionManager.getClient()
+    if assignmentType == 'Student':
+        query = {'student name': studentName, 'course name': courseName}
+        collection = client['GradebookStudents'][username]
+    else:
+        query = {'course name': courseName}
+        collection = client['GradebookCourses'][username]
+    for x in collection.find_one(query).get('assignments', []):
+        if x['assignment name'] == assignmentMarks['assignment name']:
+            collection.update_one(query, {'$pull': {'assignments': x}})
+            break
+    collection.update_one(query, {'$push': {'assignments': assignmentMarks}})
+    if assignmentType == 'Course':
+        studentCol = client['GradebookStudents'][username]
+        nameQuery = {'course name': courseName, 'assignments.assignment name': assignmentMarks['assignment name']}
+        studentCol.update_many(nameQuery, {'$unset': {'assignments.$.adjusted weighting': {'$exists': True}}})
+        studentCol.update_many(nameQuery, {'$set': {'assignments.$.weighting': assignmentMarks['weighting']}})
+
+def measure(function, counter, repeats) -> list:
+    '''
+    Runs a function several times and returns the average commands and milliseconds per run
+
+    Parameters
+    ----------
+    function : function
+        Function to run
+    counter : CommandCounter
+        Listener attached to the client, or the QueryCounter of a CountingClient
+    repeats : int
+        Number of runs
+
+    Returns
+    -------
+    list
+        [commands per run, milliseconds per run]
+    '''
+    counter.reset()
+    start = time.perf_counter()
+    for x in range(repeats):
+        function()
+    elapsed = time.perf_counter() - start
+    return ([counter.total()/repeats, elapsed*1000/repeats])
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = 'Compares the round trips and time of Assignments.save with the old save')
+    parser.add_argument('students', type = int, nargs = '?', default = 30)
+    parser.add_argument('repeats', type = int, nargs = '?', default = 20)
+    parser.add_argument('--backend', choices = ['server', 'mongomock', 'sqlite'], default = 'server')
+    options = parser.parse_args(arguments)
+    studentCount, repeats = options.students, options.repeats
+
+    directory = tempfile.TemporaryDirectory()
+    if options.backend == 'server':
+        counter = CommandCounter()
+        ConnectionManager.configure(event_listeners = [counter])
+    else:
+        counter = QueryCounter()
+        if options.backend == 'mongomock':
+            import mongomock
+            target = mongomock.MongoClient()
+        else:
+            from sqliteBackend import SQLiteClient
+            target = SQLiteClient(os.path.join(directory.name, 'benchmark.sqlite3'))
+        ConnectionManager.setClient(CountingClient(target, counter))
+    client = ConnectionManager.getClient()
+    username = 'benchmark-' + uuid.uuid4().hex[:8]
+    courseCol = client['GradebookCourses'][username]
+    studentCol = client['GradebookStudents'][username]
+    master = {'assignment name': 'Test', 'Knowledge': 20.0, 'weighting': 1.0}
+    try:
+        courseCol.insert_one({'course name': 'Benchmark', 'assignments': [dict(master)]})
+        courseCol.insert_one({'category': 'Knowledge', 'weighting': 1.0})
+        studentCol.insert_many([{'student name': 'Student '+str(x), 'course name': 'Benchmark',
+                                 'assignments': [{'assignment name': 'Test', 'Knowledge': 10.0, 'weighting': 1.0}]} for x in range(studentCount)])
+
+        studentMarks = {'assignment name': 'Test', 'Knowledge': 15.0, 'weighting': 1.0, 'adjusted weighting': 2.0}
+        results = {}
+        results['student save (old)'] = measure(lambda: legacySave(username, 'Benchmark', dict(studentMarks), 'Student', 'Student 0'), counter, repeats)
+        results['student save (new)'] = measure(lambda: Assignments(username, 'Benchmark', {k: Entry(str(v)) if k != 'assignment name' else v for k, v in studentMarks.items()}, 'Student 0').save('Student'), counter, repeats)
+        results['course save (old)'] = measure(lambda: legacySave(username, 'Benchmark', dict(master), 'Course'), counter, repeats)
+        results['course save (new)'] = measure(lambda: Assignments(username, 'Benchmark', {k: Entry(str(v)) if k != 'assignment name' else v for k, v in master.items()}).save('Course'), counter, repeats)
+
+        print('{:<22}{:>18}{:>14}'.format('', 'round trips/save', 'ms/save'))
+        for name, (commands, milliseconds) in results.items():
+            print('{:<22}{:>18.1f}{:>14.2f}'.format(name, commands, milliseconds))
+    finally:
+        courseCol.drop()
+        studentCol.drop()
+        ConnectionManager.close()
+        directory.cleanup()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,140 @@
+#-----------------------------------------------------------------------------
+# Name:        storageBackends (storageBackends.py)
+# Purpose:     To compare the time taken by the program's main database
+#              operations with the MongoDB and SQLite backends
+#
+# Author:      Steven Wu
+# Created:     2020/02/16
+# Updated:     2020/02/16
+#-----------------------------------------------------------------------------
+# Usage: python benchmarks/storageBackends.py [courses] [students] [repeats]
+# Runs the same workload against the database in connectionString.py and a
+# temporary SQLite file, using a throwaway account whose collections are
+# dropped afterwards. MongoDB is skipped if connectionString.py is missing.
+# The shared DocCache is cleared before every operation so each one reaches
+# the backend.
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+from assignments import Assignments
+from courses import Courses
+from studentTotals import StudentTotals
+from reportCards import fetchAccount
+
+def seedAccount(username, courseCount, studentCount) -> list:
+    '''
+    Fills an account with courses, categories and marked students
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseCount : int
+        Number of courses
+    studentCount : int
+        Number of students in each course
+
+    Returns
+    -------
+    list
+        Names of the courses
+    '''
+    client = ConnectionManager.getClient()
+    categories = ['Knowledge', 'Thinking', 'Communication', 'Application']
+    courseNames = ['Course '+str(x) for x in range(courseCount)]
+    client['GradebookCourses'][username].insert_many([{'category': x, 'weighting': 1.0 + index} for index, x in enumerate(categories)])
+    for courseName in courseNames:
+        masters = [dict({'assignment name': 'Test '+str(x), 'weighting': 1.0}, **{y: 20.0 for y in categories}) for x in range(10)]
+        client['GradebookCourses'][username].insert_one({'course name': courseName, 'assignments': masters})
+        client['GradebookStudents'][username].insert_many([{'student name': 'Student '+str(x), 'course name': courseName,
+                                                           'assignments': [dict(y, **{z: float((x + index) % 21) for z in categories}) for index, y in enumerate(masters)]}
+                                                          for x in range(studentCount)])
+    return (courseNames)
+
+def workload(username, courseNames) -> dict:
+    '''
+    Returns the operations to time, each a function of the run number
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseNames : list
+        Names of the courses
+
+    Returns
+    -------
+    dict
+        Operation names mapped to functions
+    '''
+    def saveMark(run):
+        marks = {'assignment name': 'Test 0', 'Knowledge': str(run % 20), 'weighting': '1.0', 'adjusted weighting': '1.0'}
+        Assignments(username, courseNames[0], marks, 'Student '+str(run % 10)).save('Student')
+    return ({'course list': lambda run: Courses(username).courseSummaries(),
+             'course page': lambda run: Courses(username).docsGet('GradebookStudents', {'course name': courseNames[run % len(courseNames)]}, {'student name': 1}),
+             'student page': lambda run: StudentTotals(username, courseNames[0]).read('Student '+str(run % 10)),
+             'student save': saveMark,
+             'whole account': lambda run: fetchAccount(username)})
+
+def timeBackend(courseCount, studentCount, repeats) -> dict:
+    '''
+    Seeds a throwaway account on the current backend and times the workload
+
+    Parameters
+    ----------
+    courseCount : int
+        Number of courses
+    studentCount : int
+        Number of students in each course
+    repeats : int
+        Number of runs of each operation
+
+    Returns
+    -------
+    dict
+        Operation names mapped to milliseconds per run
+    '''
+    client = ConnectionManager.getClient()
+    username = 'benchmark-' + uuid.uuid4().hex[:8]
+    try:
+        courseNames = seedAccount(username, courseCount, studentCount)
+        StudentTotals(username, courseNames[0]).recompute()
+        results = {}
+        for name, function in workload(username, courseNames).items():
+            elapsed = 0
+            for x in range(repeats):
+                sharedCache.clear()
+                start = time.perf_counter()
+                function(x)
+                elapsed += time.perf_counter() - start
+            results[name] = elapsed*1000/repeats
+        return (results)
+    finally:
+        client['GradebookCourses'][username].drop()
+        client['GradebookStudents'][username].drop()
+        ConnectionManager.close()
+
+def main(courseCount = 5, studentCount = 30, repeats = 20) -> None:
+    results = {}
+    try:
+        import connectionString
+        ConnectionManager.configureBackend('mongo')
+        results['mongo'] = timeBackend(courseCount, studentCount, repeats)
+    except ImportError:
+        print('connectionString.py not found, skipping MongoDB')
+    with tempfile.TemporaryDirectory() as directory:
+        ConnectionManager.configureBackend('sqlite', os.path.join(directory, 'benchmark.sqlite3'))
+        results['sqlite'] = timeBackend(courseCount, studentCount, repeats)
+    print('{} courses x {} students, ms/operation'.format(courseCount, studentCount))
+    print('{:<16}'.format('') + ''.join('{:>12}'.format(x) for x in results))
+    for name in results['sqlite']:
+        print('{:<16}'.format(name) + ''.join('{:>12.2f}'.format(results[x][name]) for x in results))
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:4]])
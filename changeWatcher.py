@@ -0,0 +1,272 @@
+#-----------------------------------------------------------------------------
+# Name:        changeWatcher (changeWatcher.py)
+# Purpose:     To notice changes made to an account by other devices so open
+#              screens can be updated without being reloaded
+#
+# Author:      Steven Wu
+# Created:     2020/02/22
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+
+import threading
+from pymongo.errors import OperationFailure, PyMongoError
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+
+class ChangeWatcher():
+    '''
+    Object which watches an account's documents on a background thread and reports every change
+
+    A MongoDB change stream on the account's 'GradebookCourses' and 'GradebookStudents'
+    collections is used when the server supports one (replica sets and sharded clusters). Other
+    clients (a standalone server, mongomock or the SQLite backend) are polled instead: every
+    pollInterval seconds the documents of the watched course are fetched again and compared with
+    the last ones. Polling reads every student of the course each time, so it is only meant as a
+    stand-in for development and small accounts. Polling is only used when the change stream
+    can't be opened at all; a stream that fails later (i.e the server can't be reached for a
+    while) is opened again after a growing delay, from the last change it reported, so the
+    changes made in between are still reported.
+
+    Only changes to the documents of the watched course and to the categories are reported, as
+    dicts with the keys:
+        'database' : 'GradebookCourses' or 'GradebookStudents'
+        'operation' : 'insert', 'update', 'replace' or 'delete'
+        'course name', 'student name', 'category' : the changed document's values, or None
+        'document' : the changed document, None for deletes
+    Changes made by this program are reported too. Before a change is reported the shared
+    DocCache entries of the changed documents are removed, so reading them again gets the new
+    version. onChange is called on the watcher's thread, so it must not use any widgets.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    onChange : function
+        Function called with every change
+    pollInterval : float
+        Number of seconds between polls when change streams can't be used
+    mode : str
+        'change stream' or 'polling' once the watcher has started, otherwise None
+
+    Methods
+    -------
+    start() -> None
+        Starts watching on a background thread
+    stop() -> None
+        Stops watching
+    setScope(courseName : str) -> None
+        Changes the course whose changes are reported
+    '''
+
+    databases = ('GradebookCourses', 'GradebookStudents')
+    # Longest number of seconds waited before opening a failed change stream again
+    maxRetryDelay = 30.0
+
+    def __init__(self, username, onChange, pollInterval = 2.0):
+        '''
+        Constructor to build a ChangeWatcher object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        onChange : function
+            Function called with every change
+        pollInterval : float, optional
+            Number of seconds between polls when change streams can't be used, defaults to 2
+        '''
+        self.username = username
+        self.onChange = onChange
+        self.pollInterval = pollInterval
+        self.mode = None
+        self._scope = None
+        self._known = {}
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._scopeChanged = threading.Event()
+        self._thread = None
+        self._resumeToken = None
+        self._failures = 0
+
+    def start(self) -> None:
+        '''
+        Starts watching on a background thread
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target = self._run, name = 'gradebook-watcher', daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        '''
+        Stops watching
+
+        The thread finishes after its current wait, which is at most about a second with a
+        change stream or pollInterval seconds when polling
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self._stopped.set()
+        self._scopeChanged.set()
+
+    def setScope(self, courseName) -> None:
+        '''
+        Changes the course whose changes are reported
+
+        Parameters
+        ----------
+        courseName : str
+            Name of the course, no changes are reported if None
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            self._scope = courseName
+            self._known = {}
+            self._snapshot = None
+        self._scopeChanged.set()
+
+    def _run(self) -> None:
+        client = ConnectionManager.getClient()
+        while not self._stopped.is_set():
+            try:
+                self._watchStream(client)
+            except OperationFailure:
+                # Servers without change streams (a standalone server) refuse to open one
+                if self.mode is None:
+                    break
+                # The last reported change is too old to resume from, so the stream starts again
+                # from now and everything cached for the account is removed
+                self._resumeToken = None
+                for x in self.databases:
+                    sharedCache.invalidate(x, self.username)
+                self._scopeChanged.set()
+                self._retry()
+            except PyMongoError:
+                self._retry()
+            except Exception:
+                # Clients without change streams (mongomock, the SQLite backend) fail when it is opened
+                if self.mode is None:
+                    break
+                self._retry()
+        if self._stopped.is_set():
+            return
+        self.mode = 'polling'
+        while not self._stopped.is_set():
+            try:
+                self._poll(client)
+            except PyMongoError:
+                # Tried again at the next poll
+                pass
+            self._scopeChanged.wait(self.pollInterval)
+            self._scopeChanged.clear()
+
+    def _retry(self) -> None:
+        # Waits 1, 2, 4... seconds (at most maxRetryDelay) before the stream is opened again
+        self._failures += 1
+        self._stopped.wait(min(2 ** (self._failures - 1), self.maxRetryDelay))
+
+    def _watchStream(self, client) -> None:
+        # The $match keeps the stream to this account's collections
+        with client.watch([{'$match': {'ns.db': {'$in': list(self.databases)}, 'ns.coll': self.username}}],
+                          full_document = 'updateLookup', max_await_time_ms = 1000, resume_after = self._resumeToken) as stream:
+            self.mode = 'change stream'
+            self._failures = 0
+            while not self._stopped.is_set():
+                if self._scopeChanged.is_set():
+                    self._scopeChanged.clear()
+                    self._loadNames(client)
+                change = stream.try_next()
+                if change is not None:
+                    self._streamChange(change)
+                self._resumeToken = stream.resume_token
+
+    def _loadNames(self, client) -> None:
+        # Deletes only give the _id, so the names of the watched course's documents are kept
+        with self._lock:
+            scope = self._scope
+        known = {}
+        if scope is not None:
+            for x in self.databases:
+                for y in client[x][self.username].find({'$or': [{'course name': scope}, {'category': {'$exists': True}}]},
+                                                       {'course name': 1, 'student name': 1, 'category': 1}):
+                    known[(x, y['_id'])] = self._summary(y)
+        with self._lock:
+            if scope == self._scope:
+                self._known = known
+
+    def _summary(self, document) -> dict:
+        return ({x: document.get(x) for x in ('course name', 'student name', 'category')})
+
+    def _report(self, databaseName, operation, summary, document) -> None:
+        fields = {x: summary[x] for x in ('course name', 'student name') if summary.get(x) is not None}
+        sharedCache.invalidate(databaseName, self.username, fields or None)
+        with self._lock:
+            scope = self._scope
+        if scope is None or (summary.get('course name') != scope and summary.get('category') is None):
+            return
+        self.onChange(dict(summary, database = databaseName, operation = operation, document = document))
+
+    def _streamChange(self, change) -> None:
+        databaseName = change.get('ns', {}).get('db')
+        operation = change.get('operationType')
+        if operation not in ('insert', 'update', 'replace', 'delete'):
+            # A dropped collection can't be followed, so everything cached for the account is removed
+            for x in self.databases:
+                sharedCache.invalidate(x, self.username)
+            return
+        key = (databaseName, change['documentKey']['_id'])
+        with self._lock:
+            document = change.get('fullDocument')
+            if operation == 'delete':
+                summary = self._known.pop(key, self._summary({}))
+            elif document is not None:
+                summary = self._known[key] = self._summary(document)
+            else:
+                # The document was deleted before the update could be looked up
+                summary = self._known.get(key, self._summary({}))
+        self._report(databaseName, operation, summary, document)
+
+    def _poll(self, client) -> None:
+        with self._lock:
+            scope = self._scope
+            snapshot = self._snapshot
+        if scope is None:
+            return
+        documents = {}
+        for x in client['GradebookCourses'][self.username].find({'$or': [{'course name': scope}, {'category': {'$exists': True}}]}):
+            documents[('GradebookCourses', x['_id'])] = x
+        for x in client['GradebookStudents'][self.username].find({'course name': scope}):
+            documents[('GradebookStudents', x['_id'])] = x
+        with self._lock:
+            if scope != self._scope:
+                return
+            self._snapshot = documents
+        # The first poll of a course only records its documents
+        if snapshot is None:
+            return
+        for key, document in documents.items():
+            if key not in snapshot:
+                self._report(key[0], 'insert', self._summary(document), document)
+            elif document != snapshot[key]:
+                self._report(key[0], 'replace', self._summary(document), document)
+        for key, document in snapshot.items():
+            if key not in documents:
+                self._report(key[0], 'delete', self._summary(document), None)
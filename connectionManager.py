@@ -0,0 +1,266 @@
+#-----------------------------------------------------------------------------
+# Name:        connectionManager (connectionManager.py)
+# Purpose:     To provide a single, pooled database connection that is shared
+#              by every part of the Gradebook program
+#
+# Author:      Steven Wu
+# Created:     2020/02/01
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# The backend is MongoDB (using connectionString.py) unless the GRADEBOOK_BACKEND
+# environment variable is 'sqlite', in which case the documents are kept in the
+# SQLite file named by GRADEBOOK_SQLITE_PATH (gradebook.sqlite3 by default).
+
+import asyncio
+import atexit
+import inspect
+import os
+import threading
+import pymongo
+
+class ConnectionManager():
+    '''
+    Process-wide holder of the pooled MongoClient used by the Gradebook program
+
+    The client is created the first time it is requested and reused afterwards, so the
+    DNS lookup, TLS and authentication handshakes are only paid once per process. pymongo
+    keeps a pool of sockets inside the client, the size of which can be set with configure().
+    The asyncio layer gets its own client from getAsyncClient(), one per event loop, because an
+    asyncio client belongs to the event loop it was created in.
+
+    With the 'sqlite' backend the client is a SQLiteClient instead, which stores the documents
+    in a local file and has the same collection methods, so the rest of the program does not
+    need to know which backend is used.
+
+    Attributes
+    ----------
+    poolOptions : dict
+        Keyword arguments passed to pymongo.MongoClient when the client is created
+    backend : str
+        'mongo' or 'sqlite'
+    sqlitePath : str
+        Path of the SQLite file used by the 'sqlite' backend
+
+    Methods
+    -------
+    configure(**options) -> None
+        Sets the connection pool options used when the client is created
+    configureBackend(backend : str, sqlitePath : str = None) -> None
+        Selects the backend used when the client is created
+    setClient(client : MongoClient) -> None
+        Makes the program use a client that was already created
+    getClient() -> MongoClient
+        Returns the shared client, creating it if needed
+    getAsyncClient() -> AsyncMongoClient
+        Returns the asyncio client of the running event loop, creating it if needed
+    close() -> None
+        Closes the shared client and all of its pooled sockets
+    closeAsync() -> None
+        Closes the asyncio client of the running event loop
+    '''
+
+    poolOptions = {'maxPoolSize': 10, 'minPoolSize': 0, 'maxIdleTimeMS': 60000}
+    backend = os.environ.get('GRADEBOOK_BACKEND', 'mongo')
+    sqlitePath = os.environ.get('GRADEBOOK_SQLITE_PATH', 'gradebook.sqlite3')
+    _client = None
+    _asyncClients = {}
+    _closing = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, **options) -> None:
+        '''
+        Sets the connection pool options used when the client is created
+
+        Any open client is closed so that the next getClient() call uses the new options
+
+        Parameters
+        ----------
+        **options
+            pymongo.MongoClient keyword arguments (i.e maxPoolSize, minPoolSize, maxIdleTimeMS)
+
+        Returns
+        -------
+        None
+        '''
+        cls.close()
+        cls.poolOptions = dict(cls.poolOptions, **options)
+
+    @classmethod
+    def configureBackend(cls, backend, sqlitePath = None) -> None:
+        '''
+        Selects the backend used when the client is created
+
+        Any open client is closed so that the next getClient() call uses the new backend
+
+        Parameters
+        ----------
+        backend : str
+            'mongo' for the server in connectionString.py, 'sqlite' for a local file
+        sqlitePath : str, optional
+            Path of the SQLite file, the current sqlitePath is kept if not given
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        ValueError
+            If the backend is not 'mongo' or 'sqlite'
+        '''
+        if backend not in ('mongo', 'sqlite'):
+            raise ValueError('Unknown backend: ' + str(backend))
+        cls.close()
+        cls.backend = backend
+        if sqlitePath is not None:
+            cls.sqlitePath = sqlitePath
+
+    @classmethod
+    def setClient(cls, client) -> None:
+        '''
+        Makes the program use a client that was already created
+
+        Any open client is closed first. Used to run the program against a stand-in for the
+        server, such as mongomock.MongoClient(), or a client wrapped to record its queries.
+        The client is closed by close() like one created by getClient().
+
+        Parameters
+        ----------
+        client : MongoClient
+            Object with the same databases and collection methods as a MongoClient
+
+        Returns
+        -------
+        None
+        '''
+        cls.close()
+        with cls._lock:
+            cls._client = client
+
+    @classmethod
+    def getClient(cls) -> pymongo.MongoClient:
+        '''
+        Returns the shared client, creating it if needed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        MongoClient
+            The shared client (a SQLiteClient with the 'sqlite' backend)
+        '''
+        if cls._client is None:
+            with cls._lock:
+                if cls._client is None:
+                    if cls.backend == 'sqlite':
+                        from sqliteBackend import SQLiteClient
+                        cls._client = SQLiteClient(cls.sqlitePath)
+                    else:
+                        from connectionString import connectionStr
+                        cls._client = pymongo.MongoClient(connectionStr, **cls.poolOptions)
+        return (cls._client)
+
+    @classmethod
+    def getAsyncClient(cls):
+        '''
+        Returns the asyncio client of the running event loop, creating it if needed
+
+        Uses pymongo's AsyncMongoClient, or Motor's client on pymongo versions without one.
+        With the 'sqlite' backend, or when a client with an asyncClient() method (a SQLiteClient)
+        was given to setClient(), the client shares the connection of getClient(). Other clients
+        given to setClient() (i.e mongomock's) have no asyncio version, so the asyncio layer
+        still connects to the server in connectionString.py. Clients of event loops that have
+        finished (i.e an earlier asyncio.run()) are closed, so their pools don't pile up.
+        Must be called from a coroutine.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        AsyncMongoClient
+            The asyncio client
+        '''
+        loop = asyncio.get_running_loop()
+        if cls.backend == 'sqlite' or inspect.ismethod(getattr(cls._client, 'asyncClient', None)):
+            return (cls.getClient().asyncClient())
+        with cls._lock:
+            finished = [cls._asyncClients.pop(x) for x in list(cls._asyncClients) if x.is_closed()]
+            if loop not in cls._asyncClients:
+                from connectionString import connectionStr
+                try:
+                    from pymongo import AsyncMongoClient
+                except ImportError:
+                    from motor.motor_asyncio import AsyncIOMotorClient as AsyncMongoClient
+                cls._asyncClients[loop] = AsyncMongoClient(connectionStr, **cls.poolOptions)
+            client = cls._asyncClients[loop]
+        for x in finished:
+            cls._closeFinished(x, loop)
+        return (client)
+
+    @classmethod
+    def _closeFinished(cls, client, loop) -> None:
+        # Motor closes right away, pymongo's close() is a coroutine which is run on the current loop
+        try:
+            closing = client.close()
+        except Exception:
+            return
+        if inspect.isawaitable(closing):
+            task = loop.create_task(cls._awaitQuietly(closing))
+            cls._closing.add(task)
+            task.add_done_callback(cls._closing.discard)
+
+    @staticmethod
+    async def _awaitQuietly(closing) -> None:
+        # The client's own tasks ended with its event loop, so errors while closing it are ignored
+        try:
+            await closing
+        except Exception:
+            pass
+
+    @classmethod
+    async def closeAsync(cls) -> None:
+        '''
+        Closes the asyncio client of the running event loop
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            client = cls._asyncClients.pop(loop, None)
+        if client is not None:
+            closing = client.close()
+            if inspect.isawaitable(closing):
+                await closing
+
+    @classmethod
+    def close(cls) -> None:
+        '''
+        Closes the shared client and all of its pooled sockets
+
+        Called automatically when the program exits
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        with cls._lock:
+            if cls._client is not None:
+                cls._client.close()
+                cls._client = None
+
+atexit.register(ConnectionManager.close)
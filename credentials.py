@@ -0,0 +1,272 @@
+#-----------------------------------------------------------------------------
+# Name:        credentials (credentials.py)
+# Purpose:     To hash the passwords of the Gradebook program's accounts and
+#              remember which accounts were recently logged into
+#
+# Author:      Steven Wu
+# Created:     2020/02/24
+# Updated:     2020/02/24
+#-----------------------------------------------------------------------------
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+class Credentials():
+    '''
+    Salted password hashing with a tunable cost, and a short lived cache of verified logins
+
+    Passwords are hashed with scrypt, or PBKDF2-HMAC-SHA256 where hashlib has no scrypt. The hash
+    is stored as one string holding the function, its cost, the salt and the hash (i.e
+    'scrypt$16384$8$1$salt$hash'), so hashes made with an older cost can still be verified and
+    needsUpdate() tells when a record should be hashed again with the current cost.
+
+    Hashing is slow on purpose, so every successful login starts a session: an HMAC of the
+    username and password under a random key made when the program starts, kept in memory for
+    sessionTtl seconds. checkSession() compares entered credentials with it, which lets
+    confirmations (see ConfirmationScreen) skip both the hash and the database. The password
+    itself is never kept.
+
+    Attributes
+    ----------
+    kdf : str
+        Hash function used for new hashes, 'scrypt' or 'pbkdf2_sha256'
+    cost : dict
+        Cost of the hash function, {'n', 'r', 'p'} for scrypt and {'iterations'} for PBKDF2
+    sessionTtl : float
+        Number of seconds a session stays valid
+
+    Methods
+    -------
+    configure(kdf : str = None, sessionTtl : float = None, **cost) -> None
+        Changes the hash function, its cost or the session length
+    hashPassword(password : str) -> str
+        Returns the salted hash of a password
+    verify(password : str, record : dict) -> bool
+        Checks a password against a login record
+    needsUpdate(record : dict) -> bool
+        Checks if a login record should be hashed again with the current hash function and cost
+    startSession(username : str, password : str) -> None
+        Remembers that the credentials were verified
+    checkSession(username : str, password : str) -> bool
+        Checks credentials against the account's session
+    endSession(username : str) -> None
+        Forgets the account's session
+    '''
+
+    defaultCosts = {'scrypt': {'n': 2 ** 14, 'r': 8, 'p': 1},
+                    'pbkdf2_sha256': {'iterations': 200000}}
+    saltSize = 16
+    hashSize = 32
+
+    def __init__(self, kdf = None, sessionTtl = 300.0, **cost):
+        '''
+        Constructor to build a Credentials object
+
+        Parameters
+        ----------
+        kdf : str, optional
+            'scrypt' or 'pbkdf2_sha256', defaults to scrypt if hashlib has it
+        sessionTtl : float, optional
+            Number of seconds a session stays valid, defaults to 300
+        **cost
+            Cost of the hash function, the default cost is used for missing values
+        '''
+        self.kdf = None
+        self.cost = {}
+        self.sessionTtl = sessionTtl
+        self._key = os.urandom(32)
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.configure(kdf, **cost)
+
+    def configure(self, kdf = None, sessionTtl = None, **cost) -> None:
+        '''
+        Changes the hash function, its cost or the session length
+
+        Existing hashes stay valid, they are hashed again with the new settings the next time
+        their account logs in
+
+        Parameters
+        ----------
+        kdf : str, optional
+            'scrypt' or 'pbkdf2_sha256', the current one is kept if not given
+        sessionTtl : float, optional
+            Number of seconds a session stays valid, the current length is kept if not given
+        **cost
+            Cost of the hash function (i.e n=2**15 or iterations=400000)
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        ValueError
+            If the hash function or a cost name is unknown
+        '''
+        if kdf is None:
+            kdf = self.kdf or ('scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2_sha256')
+        if kdf not in self.defaultCosts:
+            raise ValueError('Unknown hash function: ' + str(kdf))
+        if kdf == 'scrypt' and not hasattr(hashlib, 'scrypt'):
+            raise ValueError('hashlib was built without scrypt')
+        unknown = [x for x in cost if x not in self.defaultCosts[kdf]]
+        if unknown:
+            raise ValueError('Unknown cost for ' + kdf + ': ' + ', '.join(unknown))
+        base = self.cost if kdf == self.kdf else self.defaultCosts[kdf]
+        self.kdf = kdf
+        self.cost = dict(base, **{x: int(y) for x, y in cost.items()})
+        if sessionTtl is not None:
+            self.sessionTtl = sessionTtl
+
+    def _derive(self, kdf, password, salt, cost) -> bytes:
+        if kdf == 'scrypt':
+            # hashlib refuses to use more than 32 MB unless maxmem is raised
+            maxmem = 128 * cost['r'] * (cost['n'] + cost['p'] + 2) + 1024 * 1024
+            return (hashlib.scrypt(password.encode(), salt = salt, n = cost['n'], r = cost['r'], p = cost['p'], maxmem = maxmem, dklen = self.hashSize))
+        return (hashlib.pbkdf2_hmac('sha256', password.encode(), salt, cost['iterations'], dklen = self.hashSize))
+
+    def _parse(self, stored) -> tuple:
+        parts = stored.split('$')
+        names = list(self.defaultCosts.get(parts[0], {}))
+        if not names or len(parts) != len(names) + 3:
+            raise ValueError('Unknown password hash format')
+        cost = dict(zip(names, [int(x) for x in parts[1:-2]]))
+        return (parts[0], cost, bytes.fromhex(parts[-2]), bytes.fromhex(parts[-1]))
+
+    def hashPassword(self, password) -> str:
+        '''
+        Returns the salted hash of a password
+
+        Parameters
+        ----------
+        password : str
+            The password
+
+        Returns
+        -------
+        str
+            The hash function, its cost, the salt and the hash separated by '$'
+        '''
+        salt = os.urandom(self.saltSize)
+        derived = self._derive(self.kdf, password, salt, self.cost)
+        return ('$'.join([self.kdf] + [str(x) for x in self.cost.values()] + [salt.hex(), derived.hex()]))
+
+    def verify(self, password, record) -> bool:
+        '''
+        Checks a password against a login record
+
+        Records made before passwords were hashed keep the password in their 'password' field,
+        those are compared directly
+
+        Parameters
+        ----------
+        password : str
+            Entered password
+        record : dict
+            Login document with a 'password hash' or a 'password' field
+
+        Returns
+        -------
+        bool
+            True if the password is correct
+        '''
+        if 'password hash' in record:
+            try:
+                kdf, cost, salt, expected = self._parse(record['password hash'])
+            except ValueError:
+                return (False)
+            return (hmac.compare_digest(self._derive(kdf, password, salt, cost), expected))
+        if isinstance(record.get('password'), str):
+            return (hmac.compare_digest(password.encode(), record['password'].encode()))
+        return (False)
+
+    def needsUpdate(self, record) -> bool:
+        '''
+        Checks if a login record should be hashed again with the current hash function and cost
+
+        Parameters
+        ----------
+        record : dict
+            Login document
+
+        Returns
+        -------
+        bool
+            True for records with a plaintext password or a hash made with other settings
+        '''
+        if 'password hash' not in record:
+            return (True)
+        try:
+            kdf, cost, salt, expected = self._parse(record['password hash'])
+        except ValueError:
+            return (True)
+        return (kdf != self.kdf or cost != self.cost)
+
+    def _digest(self, username, password) -> bytes:
+        return (hmac.new(self._key, (username + '\0' + password).encode(), hashlib.sha256).digest())
+
+    def startSession(self, username, password) -> None:
+        '''
+        Remembers that the credentials were verified
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        password : str
+            The verified password
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            self._sessions[username] = (self._digest(username, password), time.monotonic() + self.sessionTtl)
+
+    def checkSession(self, username, password) -> bool:
+        '''
+        Checks credentials against the account's session
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        password : str
+            Entered password
+
+        Returns
+        -------
+        bool
+            True if the account has a session which has not expired and the password is the one
+            that started it, False otherwise (the credentials must then be verified with the database)
+        '''
+        with self._lock:
+            session = self._sessions.get(username)
+            if session is not None and session[1] <= time.monotonic():
+                del self._sessions[username]
+                session = None
+        if session is None:
+            return (False)
+        return (hmac.compare_digest(session[0], self._digest(username, password)))
+
+    def endSession(self, username) -> None:
+        '''
+        Forgets the account's session
+
+        Parameters
+        ----------
+        username : str
+            Account username
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            self._sessions.pop(username, None)
+
+sharedCredentials = Credentials()
@@ -0,0 +1,296 @@
+#-----------------------------------------------------------------------------
+# Name:        csvImporter (csvImporter.py)
+# Purpose:     To add students and assignment marks to an account from CSV files
+#
+# Author:      Steven Wu
+# Created:     2020/02/14
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# Usage: python csvImporter.py username roster|marks file.csv [--course name] [--batch-size n] [--ordered]
+# A roster file has a 'student name' column, a marks file has 'student name',
+# 'assignment name' and one column per category (plus 'adjusted weighting' if
+# wanted). Either file may have a 'course name' column instead of --course.
+
+import argparse
+import csv
+import sys
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from assignments import Assignments
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+from gradingContext import GradingContext
+from storageLayout import StorageLayout
+from studentTotals import StudentTotals
+
+class CSVImporter():
+    '''
+    Object which imports rosters and marks from CSV files into an account
+
+    Files are read one row at a time and written in bulk_write batches, so memory use does not
+    grow with the size of the file. Existing names are fetched once per course and checked with
+    set lookups instead of scanning the course for every row. If a marks file has the same
+    student's assignment more than once, the last row is the one saved. Rows a batch fails to
+    write are reported in errors and counted as skipped, and the rest of the file is still imported.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    batchSize : int
+        Number of rows written per bulk_write
+    ordered : bool
+        If the batches are ordered bulk writes (stopping at the first error) instead of unordered ones
+    progress : function
+        Called with (rows read, rows written) after every batch, if given
+    errors : list
+        Messages describing the rows that were skipped by the last import
+
+    Methods
+    -------
+    importRoster(file : file, courseName : str = '') -> dict
+        Adds the students listed in a roster file
+    importMarks(file : file, courseName : str = '') -> dict
+        Saves the assignment marks listed in a marks file
+    '''
+
+    maxErrors = 100
+    # Columns that are not categories of a marks file
+    nameColumns = ('course name', 'student name', 'assignment name', 'adjusted weighting', 'weighting', 'revision')
+
+    def __init__(self, username, batchSize = 500, ordered = False, progress = None):
+        '''
+        Constructor to build a CSVImporter object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        batchSize : int, optional
+            Number of rows written per bulk_write, defaults to 500
+        ordered : bool, optional
+            If the batches are ordered bulk writes, defaults to False
+        progress : function, optional
+            Called with (rows read, rows written) after every batch
+        '''
+        self.username = username
+        self.batchSize = batchSize
+        self.ordered = ordered
+        self.progress = progress
+        self.errors = []
+
+    @classmethod
+    def _rows(cls, file, courseName):
+        # Yields the rows one at a time with the cells stripped and the course filled in
+        reader = csv.DictReader(file)
+        columns = []
+        for x in reader.fieldnames or []:
+            x = (x or '').strip()
+            columns.append(x.lower() if x.lower() in cls.nameColumns else x)
+        reader.fieldnames = columns
+        for row in reader:
+            row = {k: (v or '').strip() for k, v in row.items() if isinstance(v, str)}
+            if courseName:
+                row['course name'] = courseName
+            yield (row)
+
+    def _skip(self, line, message) -> None:
+        if len(self.errors) < self.maxErrors:
+            self.errors.append('line ' + str(line) + ': ' + message)
+
+    def _courses(self) -> dict:
+        courses = {}
+        for x in ConnectionManager.getClient()['GradebookCourses'][self.username].find({'course name': {'$exists': True}}, {'course name': 1, 'assignments': 1}):
+            courses[x['course name'].lower()] = x
+        return (courses)
+
+    def _students(self, courseName) -> dict:
+        # Names are compared ignoring capitalization, like Courses.create()
+        students = {}
+        for x in ConnectionManager.getClient()['GradebookStudents'][self.username].find({'course name': courseName}, {'student name': 1}):
+            students[x['student name'].lower()] = x['student name']
+        return (students)
+
+    def _write(self, collection, batch, counts) -> None:
+        # batch is a list of (line, requests) pairs, one for each row
+        if batch:
+            requests = []
+            lines = []
+            for line, rowRequests in batch:
+                requests.extend(rowRequests)
+                lines.extend([line] * len(rowRequests))
+            failed = {}
+            try:
+                collection.bulk_write(requests, ordered = self.ordered)
+            except BulkWriteError as e:
+                writeErrors = e.details.get('writeErrors', [])
+                for x in writeErrors:
+                    failed.setdefault(lines[x['index']], x.get('errmsg', 'Could not be saved'))
+                # An ordered bulk write stops at its first error, so the rows after it are not written
+                if self.ordered and writeErrors:
+                    for x in lines[writeErrors[0]['index'] + 1:]:
+                        failed.setdefault(x, 'Not saved because of an earlier error')
+            for line in sorted(failed):
+                self._skip(line, failed[line])
+            counts['written'] += len(batch) - len(failed)
+            counts['skipped'] += len(failed)
+        if self.progress is not None:
+            self.progress(counts['read'], counts['written'])
+
+    def importRoster(self, file, courseName = '') -> dict:
+        '''
+        Adds the students listed in a roster file
+
+        Students already in their course (ignoring capitalization) and rows without a name or
+        with a course that does not exist are skipped
+
+        Parameters
+        ----------
+        file : file
+            Open CSV file with a 'student name' column and, if courseName is not given, a 'course name' column
+        courseName : str, optional
+            Course every student is added to
+
+        Returns
+        -------
+        dict
+            Number of rows 'read', students 'added' and rows 'skipped'
+        '''
+        self.errors = []
+        studentCol = ConnectionManager.getClient()['GradebookStudents'][self.username]
+        courses = self._courses()
+        existing = {}
+        counts = {'read': 0, 'written': 0, 'skipped': 0}
+        batch = []
+        changedCourses = set()
+        for line, row in enumerate(self._rows(file, courseName), 2):
+            counts['read'] += 1
+            studentName = row.get('student name', '')
+            course = courses.get(row.get('course name', '').lower())
+            if studentName == '':
+                self._skip(line, 'Please enter a name')
+            elif course is None:
+                self._skip(line, 'Course not found')
+            else:
+                if course['course name'] not in existing:
+                    existing[course['course name']] = self._students(course['course name'])
+                if studentName.lower() in existing[course['course name']]:
+                    self._skip(line, 'Student already exists')
+                else:
+                    existing[course['course name']][studentName.lower()] = studentName
+                    batch.append((line, [InsertOne({'student name': studentName, 'course name': course['course name']})]))
+                    changedCourses.add(course['course name'])
+                    if len(batch) >= self.batchSize:
+                        self._write(studentCol, batch, counts)
+                        batch = []
+                    continue
+            counts['skipped'] += 1
+        self._write(studentCol, batch, counts)
+        for x in changedCourses:
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': x})
+        return ({'read': counts['read'], 'added': counts['written'], 'skipped': counts['skipped']})
+
+    def importMarks(self, file, courseName = '') -> dict:
+        '''
+        Saves the assignment marks listed in a marks file
+
+        Each row is saved like a student assignment saved from the assignment page: the marks
+        replace the student's existing marks for the assignment or are added if there are none.
+        Empty category cells are left out. Rows for students or assignments that do not exist,
+        or with marks that are negative or not numbers, are skipped. Where the same student's
+        assignment is listed more than once, the earlier rows are skipped and the last one is saved.
+
+        Parameters
+        ----------
+        file : file
+            Open CSV file with 'student name' and 'assignment name' columns, one column per category,
+            an optional 'adjusted weighting' column and, if courseName is not given, a 'course name' column
+        courseName : str, optional
+            Course every row belongs to
+
+        Returns
+        -------
+        dict
+            Number of rows 'read', marks 'saved' and rows 'skipped'
+        '''
+        self.errors = []
+        studentCol = ConnectionManager.getClient()['GradebookStudents'][self.username]
+        courses = self._courses()
+        existing = {}
+        masters = {}
+        contexts = {}
+        normalized = StorageLayout(self.username).isNormalized()
+        counts = {'read': 0, 'written': 0, 'skipped': 0}
+        # The rows of the batch by (course, student, assignment), so a later row replaces an earlier one
+        # (the two requests of different rows for the same assignment could be applied in any order)
+        batch = {}
+        changedCourses = set()
+        for line, row in enumerate(self._rows(file, courseName), 2):
+            counts['read'] += 1
+            course = courses.get(row.get('course name', '').lower())
+            if course is None:
+                self._skip(line, 'Course not found')
+                counts['skipped'] += 1
+                continue
+            if course['course name'] not in existing:
+                existing[course['course name']] = self._students(course['course name'])
+                masters[course['course name']] = {x['assignment name']: x for x in course.get('assignments', [])}
+                contexts[course['course name']] = GradingContext(self.username, course['course name'], course)
+            master = masters[course['course name']].get(row.get('assignment name', ''))
+            studentName = existing[course['course name']].get(row.get('student name', '').lower())
+            if studentName is None:
+                self._skip(line, 'Student not found')
+            elif master is None:
+                self._skip(line, 'Assignment not found')
+            else:
+                entries = {'assignment name': master['assignment name'], 'weighting': str(master['weighting']),
+                           'adjusted weighting': row.get('adjusted weighting') or str(master['weighting'])}
+                for category in master.keys():
+                    if category not in self.nameColumns and row.get(category, '') != '':
+                        entries[category] = row[category]
+                assignmentObj = Assignments(self.username, course['course name'], entries, studentName, contexts[course['course name']])
+                error = assignmentObj.parseEntries()
+                if error:
+                    self._skip(line, error)
+                else:
+                    assignmentObj.trimStudentMarks(normalized)
+                    key = (course['course name'], studentName, master['assignment name'])
+                    if key in batch:
+                        self._skip(batch.pop(key)[0], 'Replaced by line ' + str(line))
+                        counts['skipped'] += 1
+                    batch[key] = (line, assignmentObj.upsertRequests({'student name': studentName, 'course name': course['course name']}))
+                    changedCourses.add(course['course name'])
+                    if len(batch) >= self.batchSize:
+                        self._write(studentCol, list(batch.values()), counts)
+                        batch = {}
+                    continue
+            counts['skipped'] += 1
+        self._write(studentCol, list(batch.values()), counts)
+        for x in changedCourses:
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': x})
+            StudentTotals(self.username, x).recompute()
+        return ({'read': counts['read'], 'saved': counts['written'], 'skipped': counts['skipped']})
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = 'Imports students or marks from a CSV file')
+    parser.add_argument('username')
+    parser.add_argument('kind', choices = ['roster', 'marks'])
+    parser.add_argument('file')
+    parser.add_argument('--course', default = '', help = "course of every row, if the file has no 'course name' column")
+    parser.add_argument('--batch-size', type = int, default = 500)
+    parser.add_argument('--ordered', action = 'store_true', help = 'stop a batch at its first write error')
+    options = parser.parse_args(arguments)
+    progress = lambda read, written: print('\r{} rows read, {} written'.format(read, written), end = '', file = sys.stderr)
+    importer = CSVImporter(options.username, options.batch_size, options.ordered, progress)
+    with open(options.file, newline = '') as file:
+        if options.kind == 'roster':
+            result = importer.importRoster(file, options.course)
+        else:
+            result = importer.importMarks(file, options.course)
+    print(file = sys.stderr)
+    for x in importer.errors:
+        print(x, file = sys.stderr)
+    print(result)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,248 @@
+#-----------------------------------------------------------------------------
+# Name:        databaseSetup (databaseSetup.py)
+# Purpose:     To create the database indexes used by the Gradebook program and
+#              report whether its queries use them
+#
+# Author:      Steven Wu
+# Created:     2020/02/07
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# Usage: python databaseSetup.py [username ...] [--merge-logins]
+# Creates the indexes of the given accounts (every account if none are given)
+# and prints the query plan of each of the program's query shapes. Usernames
+# with more than one login document are listed first, since the unique index
+# on usernames can't be created while they exist. With --merge-logins only the
+# document the program logs in with (the first one found) is kept for each.
+
+import argparse
+import sys
+import threading
+from pymongo.errors import OperationFailure
+from connectionManager import ConnectionManager
+
+class DatabaseSetup():
+    '''
+    Object which creates and checks the indexes of an account's collections
+
+    Every collection is named after its account, so the indexes are created per account.
+    Creating an index that already exists does nothing, so the methods are safe to call
+    every time the program starts.
+
+    Older versions of the program could register the same username twice, and the unique
+    index on the login collection's usernames can't be created until those duplicates are
+    removed (see duplicateLogins() and mergeDuplicateLogins()). Until then loginUnique is
+    False and registrations must check for an existing username themselves.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    loginUnique : bool
+        If the login collection's unique username index exists, None until ensureLoginIndexes() is called
+
+    Methods
+    -------
+    ensureLoginIndexes() -> bool
+        Creates the indexes of the login collection
+    duplicateLogins() -> dict
+        Returns the usernames which have more than one login document
+    mergeDuplicateLogins() -> int
+        Keeps only the first login document of each username
+    ensureIndexes() -> None
+        Creates the indexes of the account's course and student collections
+    explainQueries() -> list
+        Returns the query plan summary of each of the program's query shapes
+    '''
+
+    courseIndexes = [([('course name', 1)], {'name': 'course name', 'sparse': True}),
+                     ([('category', 1)], {'name': 'category', 'sparse': True})]
+    studentIndexes = [([('course name', 1), ('student name', 1)], {'name': 'course name, student name'})]
+    loginIndexes = [([('username', 1)], {'name': 'username', 'unique': True})]
+    loginUnique = None
+    _prepared = set()
+    _lock = threading.Lock()
+
+    def __init__(self, username):
+        '''
+        Constructor to build a DatabaseSetup object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        '''
+        self.username = username
+
+    @classmethod
+    def ensureLoginIndexes(cls) -> bool:
+        '''
+        Creates the indexes of the login collection
+
+        Only talks to the database the first time it is called in a process. If the unique
+        username index can't be built (the collection already has duplicate usernames) it is
+        not tried again until the process restarts.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+            True if usernames are unique because of the index, False if they must be checked
+        '''
+        with cls._lock:
+            if ('GradebookLogin', 'login') not in cls._prepared:
+                loginCol = ConnectionManager.getClient()['GradebookLogin']['login']
+                cls.loginUnique = True
+                for keys, options in cls.loginIndexes:
+                    try:
+                        loginCol.create_index(keys, **options)
+                    except OperationFailure:
+                        # DuplicateKeyError is an OperationFailure, raised for existing duplicates
+                        cls.loginUnique = False
+                cls._prepared.add(('GradebookLogin', 'login'))
+            return (cls.loginUnique)
+
+    @staticmethod
+    def duplicateLogins() -> dict:
+        '''
+        Returns the usernames which have more than one login document
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Usernames mapped to the '_id's of their login documents, in the order they are found
+        '''
+        loginCol = ConnectionManager.getClient()['GradebookLogin']['login']
+        logins = {}
+        for x in loginCol.find({}, {'username': 1}):
+            logins.setdefault(x.get('username'), []).append(x['_id'])
+        return ({x: y for x, y in logins.items() if len(y) > 1})
+
+    @classmethod
+    def mergeDuplicateLogins(cls) -> int:
+        '''
+        Keeps only the first login document of each username
+
+        The first document found is the one login() checks the password against, so the
+        others could never be logged into. Courses and students belong to the username, not
+        to a login document, so nothing else changes. The unique index is tried again the next
+        time ensureLoginIndexes() is called.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        int
+            Number of login documents deleted
+        '''
+        loginCol = ConnectionManager.getClient()['GradebookLogin']['login']
+        extra = [y for x in cls.duplicateLogins().values() for y in x[1:]]
+        if extra:
+            loginCol.delete_many({'_id': {'$in': extra}})
+        with cls._lock:
+            cls._prepared.discard(('GradebookLogin', 'login'))
+        return (len(extra))
+
+    def ensureIndexes(self) -> None:
+        '''
+        Creates the indexes of the account's course and student collections
+
+        Only talks to the database the first time it is called for an account in a process
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            if ('account', self.username) in self._prepared:
+                return
+            client = ConnectionManager.getClient()
+            courseCol = client['GradebookCourses'][self.username]
+            studentCol = client['GradebookStudents'][self.username]
+            for keys, options in self.courseIndexes:
+                courseCol.create_index(keys, **options)
+            for keys, options in self.studentIndexes:
+                studentCol.create_index(keys, **options)
+            self._prepared.add(('account', self.username))
+
+    @staticmethod
+    def _planStages(plan) -> list:
+        stages = []
+        while plan:
+            stages.append(plan.get('stage', '?') + (' ' + plan['indexName'] if 'indexName' in plan else ''))
+            plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+        return (stages)
+
+    def explainQueries(self) -> list:
+        '''
+        Returns the query plan summary of each of the program's query shapes
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        list
+            List of dicts with the 'collection', 'query', 'plan' (stages from the top of the
+            winning plan down), 'examined' and 'returned' of each query
+        '''
+        client = ConnectionManager.getClient()
+        courseCol = client['GradebookCourses'][self.username]
+        studentCol = client['GradebookStudents'][self.username]
+        loginCol = client['GradebookLogin']['login']
+        course = courseCol.find_one({'course name': {'$exists': True}}) or {'course name': ''}
+        student = studentCol.find_one({'course name': course['course name']}) or {'student name': ''}
+        shapes = [(courseCol, {'course name': {'$exists': True}}),
+                  (courseCol, {'course name': course['course name']}),
+                  (courseCol, {'category': {'$exists': True}}),
+                  (studentCol, {'course name': course['course name']}),
+                  (studentCol, {'course name': course['course name'], 'student name': student['student name']}),
+                  (loginCol, {'username': self.username})]
+        report = []
+        for collection, query in shapes:
+            explanation = collection.find(query).explain()
+            stats = explanation.get('executionStats', {})
+            report.append({'collection': collection.full_name, 'query': query,
+                           'plan': self._planStages(explanation.get('queryPlanner', {}).get('winningPlan', {})),
+                           'examined': stats.get('totalDocsExamined'), 'returned': stats.get('nReturned')})
+        return (report)
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = "Creates the program's indexes and prints the query plans")
+    parser.add_argument('usernames', nargs = '*')
+    parser.add_argument('--merge-logins', action = 'store_true', help = 'delete all but the first login document of duplicate usernames')
+    options = parser.parse_args(arguments)
+    client = ConnectionManager.getClient()
+    usernames = options.usernames
+    if not usernames:
+        usernames = sorted(set(client['GradebookCourses'].list_collection_names()) | set(client['GradebookStudents'].list_collection_names()))
+    duplicates = DatabaseSetup.duplicateLogins()
+    for username, ids in duplicates.items():
+        print('Duplicate login: {} has {} login documents'.format(username, len(ids)))
+    if duplicates and options.merge_logins:
+        print('Deleted {} login documents'.format(DatabaseSetup.mergeDuplicateLogins()))
+    if not DatabaseSetup.ensureLoginIndexes():
+        print('The unique username index was not created, run again with --merge-logins to remove the duplicate logins')
+    for username in usernames:
+        setup = DatabaseSetup(username)
+        setup.ensureIndexes()
+        print(username)
+        for x in setup.explainQueries():
+            print('    {:<40}{:<60}examined {} returned {}'.format(x['collection'], str(x['query']), x['examined'], x['returned']))
+            print('        ' + ' <- '.join(x['plan']))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
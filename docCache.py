@@ -0,0 +1,238 @@
+#-----------------------------------------------------------------------------
+# Name:        docCache (docCache.py)
+# Purpose:     To keep recently fetched database documents in memory so screens
+#              that are revisited do not fetch them again
+#
+# Author:      Steven Wu
+# Created:     2020/02/05
+# Updated:     2020/02/05
+#-----------------------------------------------------------------------------
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+class DocCache():
+    '''
+    Size-bounded, least recently used cache of query results with a time to live
+
+    Entries are keyed by (kind, database, username, query, projection). Code that changes documents
+    calls invalidate() with the fields identifying the changed documents, which removes every
+    entry whose query could have matched them. Values are copied in and out so callers can
+    freely modify what they get back.
+
+    Attributes
+    ----------
+    maxSize : int
+        Maximum number of entries kept
+    ttl : float
+        Number of seconds an entry stays valid
+    hits : int
+        Number of lookups answered from the cache
+    misses : int
+        Number of lookups that had to be fetched
+
+    Methods
+    -------
+    makeKey(kind : str, databaseName : str, username : str, query : dict, projection : dict = None) -> tuple
+        Builds the cache key of a query
+    fetch(key : tuple, loader : function) -> object
+        Returns the cached value of a key, calling loader() to fetch it if needed
+    fetchAsync(key : tuple, loader : function) -> object
+        Coroutine version of fetch(), awaiting loader() to fetch the value if needed
+    invalidate(databaseName : str, username : str, fields : dict = None) -> None
+        Removes the entries whose query could match the changed documents
+    clear() -> None
+        Removes every entry
+    stats() -> dict
+        Returns the hit and miss counters
+    '''
+
+    def __init__(self, maxSize = 256, ttl = 30.0):
+        '''
+        Constructor to build a DocCache object
+
+        Parameters
+        ----------
+        maxSize : int, optional
+            Maximum number of entries kept, defaults to 256
+        ttl : float, optional
+            Number of seconds an entry stays valid, defaults to 30
+        '''
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, dict):
+            return (tuple(sorted((k, DocCache._freeze(v)) for k, v in value.items())))
+        elif isinstance(value, (list, tuple)):
+            return (tuple(DocCache._freeze(x) for x in value))
+        return (value)
+
+    def makeKey(self, kind, databaseName, username, query, projection = None) -> tuple:
+        '''
+        Builds the cache key of a query
+
+        Parameters
+        ----------
+        kind : str
+            Type of lookup (i.e 'docGet' or 'docsGet')
+        databaseName : str
+            Name of the database
+        username : str
+            Account username (the collection name)
+        query : dict
+            Search query
+        projection : dict, optional
+            Fields returned by the query, if not the whole document
+
+        Returns
+        -------
+        tuple
+            The cache key
+        '''
+        return ((kind, databaseName, username, self._freeze(query), self._freeze(projection), query))
+
+    def fetch(self, key, loader):
+        '''
+        Returns the cached value of a key, calling loader() to fetch it if needed
+
+        A fetched value is not stored if the collection was changed while it was being fetched
+
+        Parameters
+        ----------
+        key : tuple
+            Key made by makeKey()
+        loader : function
+            Function which fetches the value from the database
+
+        Returns
+        -------
+        object
+            A copy of the value
+        '''
+        found, result = self._lookup(key)
+        if found:
+            return (result)
+        value = loader()
+        self._store(key, value, result)
+        return (value)
+
+    async def fetchAsync(self, key, loader):
+        '''
+        Coroutine version of fetch(), awaiting loader() to fetch the value if needed
+
+        Parameters
+        ----------
+        key : tuple
+            Key made by makeKey()
+        loader : function
+            Coroutine function which fetches the value from the database
+
+        Returns
+        -------
+        object
+            A copy of the value
+        '''
+        found, result = self._lookup(key)
+        if found:
+            return (result)
+        value = await loader()
+        self._store(key, value, result)
+        return (value)
+
+    def _lookup(self, key) -> tuple:
+        # Returns (True, copy of the value) on a hit, or (False, generation of the collection) on a miss
+        lookup = key[:-1]
+        with self._lock:
+            entry = self._entries.get(lookup)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(lookup)
+                self.hits += 1
+                return (True, copy.deepcopy(entry[1]))
+            self.misses += 1
+            return (False, (self._epoch, self._generations.get(key[1:3], 0)))
+
+    def _store(self, key, value, generation) -> None:
+        # The value is only stored if the collection was not changed while it was being fetched
+        lookup = key[:-1]
+        with self._lock:
+            if (self._epoch, self._generations.get(key[1:3], 0)) == generation:
+                self._entries[lookup] = (time.monotonic() + self.ttl, copy.deepcopy(value), key[-1])
+                self._entries.move_to_end(lookup)
+                while len(self._entries) > self.maxSize:
+                    self._entries.popitem(last = False)
+
+    @staticmethod
+    def _couldMatch(query, fields) -> bool:
+        for field, value in fields.items():
+            if field in query and not isinstance(query[field], dict) and query[field] != value:
+                return (False)
+        return (True)
+
+    def invalidate(self, databaseName, username, fields = None) -> None:
+        '''
+        Removes the entries whose query could match the changed documents
+
+        Parameters
+        ----------
+        databaseName : str
+            Name of the database that was changed
+        username : str
+            Account username (the collection name)
+        fields : dict, optional
+            Field values identifying the changed documents (i.e {'course name': 'Math'}),
+            every entry of the collection is removed if not given
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            collection = (databaseName, username)
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            for lookup in list(self._entries.keys()):
+                if lookup[1:3] == collection and (fields is None or self._couldMatch(self._entries[lookup][2], fields)):
+                    del self._entries[lookup]
+
+    def clear(self) -> None:
+        '''
+        Removes every entry
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+
+    def stats(self) -> dict:
+        '''
+        Returns the hit and miss counters
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            The 'hits', 'misses' and 'size' of the cache
+        '''
+        with self._lock:
+            return ({'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)})
+
+sharedCache = DocCache()
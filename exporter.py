@@ -0,0 +1,258 @@
+#-----------------------------------------------------------------------------
+# Name:        exporter (exporter.py)
+# Purpose:     To write every student mark of an account to a CSV or columnar
+#              file without loading the whole account into memory
+#
+# Author:      Steven Wu
+# Created:     2020/02/15
+# Updated:     2020/02/15
+#-----------------------------------------------------------------------------
+# Usage: python exporter.py username [--format csv|columnar] [--output file] [--batch-size n]
+# Writes one row per student assignment (or one row with no assignment for a
+# student without any). The CSV can be read back by csvImporter.py.
+
+import argparse
+import csv
+import itertools
+import json
+import struct
+import sys
+from array import array
+from connectionManager import ConnectionManager
+from storageLayout import StorageLayout
+
+class Exporter():
+    '''
+    Object which streams the marks of an account to a file
+
+    Student documents are read from a cursor in batches and flattened into rows as they
+    arrive, so memory use depends on the batch size and not on the size of the account.
+
+    The columnar format stores the rows in chunks. Each chunk holds every column as one
+    buffer: an array of doubles (NaN where there is no mark) for number columns, and an
+    array of byte lengths followed by the UTF-8 text for text columns. The buffers are
+    little endian and can be read with array.frombytes() or numpy.frombuffer().
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    batchSize : int
+        Number of student documents fetched from the database at a time
+    columns : list
+        Column names of the rows, set by rows()
+
+    Methods
+    -------
+    rows() -> generator
+        Yields the rows of the account
+    writeCSV(file : file) -> int
+        Writes the rows as CSV
+    writeColumnar(file : file, chunkRows : int = 10000) -> int
+        Writes the rows in the columnar format
+    readColumnar(file : file) -> generator
+        Yields the chunks of a columnar file as dicts of columns
+    '''
+
+    magic = b'GBCOL\x01'
+    textColumns = ['course name', 'student name', 'assignment name']
+
+    def __init__(self, username, batchSize = 500):
+        '''
+        Constructor to build an Exporter object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        batchSize : int, optional
+            Number of student documents fetched from the database at a time, defaults to 500
+        '''
+        self.username = username
+        self.batchSize = batchSize
+        self.columns = []
+
+    def rows(self):
+        '''
+        Yields the rows of the account, sorted by course and student name
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        generator
+            Lists with the course name, student name, assignment name, weighting, adjusted
+            weighting and the mark of each category (see columns). Missing numbers are None.
+            Weightings are read from the course's copy of the assignment, so rows are the
+            same in both storage layouts (see StorageLayout).
+        '''
+        client = ConnectionManager.getClient()
+        categories = [x['category'] for x in client['GradebookCourses'][self.username].find({'category': {'$exists': True}}, {'category': 1})]
+        masters = {}
+        for x in client['GradebookCourses'][self.username].find({'course name': {'$exists': True}}, {'course name': 1, 'assignments': 1}):
+            masters[x['course name']] = {y['assignment name']: y for y in x.get('assignments', [])}
+        self.columns = self.textColumns + ['weighting', 'adjusted weighting'] + categories
+        cursor = client['GradebookStudents'][self.username].find({}, {'_id': 0, 'totals': 0, 'results': 0}, batch_size = self.batchSize)
+        # The (course name, student name) index returns the documents in order without a sort in memory
+        cursor.sort([('course name', 1), ('student name', 1)])
+        for studentDoc in cursor:
+            names = [studentDoc.get('course name', ''), studentDoc.get('student name', '')]
+            assignments = studentDoc.get('assignments', [])
+            if not assignments:
+                yield (names + [''] + [None] * (len(categories) + 2))
+            courseMasters = masters.get(names[0], {})
+            for x in assignments:
+                master = courseMasters.get(x.get('assignment name'), {})
+                weighting = master.get('weighting', x.get('weighting'))
+                adjustedWeighting = x.get('adjusted weighting', weighting) if StorageLayout.isCurrent(x, master) else weighting
+                yield (names + [x.get('assignment name', ''), weighting, adjustedWeighting]
+                       + [x.get(y) for y in categories])
+
+    def writeCSV(self, file) -> int:
+        '''
+        Writes the rows as CSV, with a header row of the column names
+
+        Parameters
+        ----------
+        file : file
+            Open text file to write to
+
+        Returns
+        -------
+        int
+            Number of rows written, not counting the header
+        '''
+        writer = csv.writer(file)
+        count = 0
+        for row in self.rows():
+            if count == 0:
+                writer.writerow(self.columns)
+            writer.writerow(['' if x is None else x for x in row])
+            count += 1
+        if count == 0:
+            writer.writerow(self.columns)
+        return (count)
+
+    def _writeChunk(self, file, chunk) -> None:
+        file.write(struct.pack('<I', len(chunk[0])))
+        for index, values in enumerate(chunk):
+            if index < len(self.textColumns):
+                encoded = [x.encode('utf-8') for x in values]
+                buffers = [array('I', [len(x) for x in encoded]), b''.join(encoded)]
+            else:
+                buffers = [array('d', [float('nan') if x is None else x for x in values])]
+            for x in buffers:
+                if isinstance(x, array):
+                    if sys.byteorder == 'big':
+                        x.byteswap()
+                    x = x.tobytes()
+                file.write(struct.pack('<I', len(x)))
+                file.write(x)
+
+    def writeColumnar(self, file, chunkRows = 10000) -> int:
+        '''
+        Writes the rows in the columnar format
+
+        The file starts with the format's magic bytes and a JSON header holding the column
+        names, followed by chunks of at most chunkRows rows and a chunk of 0 rows at the end
+
+        Parameters
+        ----------
+        file : file
+            Open binary file to write to
+        chunkRows : int, optional
+            Largest number of rows per chunk, defaults to 10000
+
+        Returns
+        -------
+        int
+            Number of rows written
+        '''
+        rows = self.rows()
+        first = next(rows, None)
+        header = json.dumps({'columns': self.columns}).encode('utf-8')
+        file.write(self.magic + struct.pack('<I', len(header)) + header)
+        count = 0
+        chunk = [[] for x in self.columns]
+        for row in itertools.chain([first] if first is not None else [], rows):
+            for index, x in enumerate(row):
+                chunk[index].append(x)
+            count += 1
+            if len(chunk[0]) >= chunkRows:
+                self._writeChunk(file, chunk)
+                chunk = [[] for x in self.columns]
+        if chunk[0]:
+            self._writeChunk(file, chunk)
+        file.write(struct.pack('<I', 0))
+        return (count)
+
+    @classmethod
+    def readColumnar(cls, file):
+        '''
+        Yields the chunks of a columnar file as dicts of columns
+
+        Parameters
+        ----------
+        file : file
+            Open binary file written by writeColumnar()
+
+        Returns
+        -------
+        generator
+            Dicts mapping column names to lists of strings (text columns) or arrays of doubles
+
+        Raises
+        -------
+        ValueError
+            If the file is not in the columnar format
+        '''
+        if file.read(len(cls.magic)) != cls.magic:
+            raise ValueError('Not a gradebook columnar file')
+        readBuffer = lambda: file.read(struct.unpack('<I', file.read(4))[0])
+        columns = json.loads(readBuffer().decode('utf-8'))['columns']
+        while True:
+            rowCount = struct.unpack('<I', file.read(4))[0]
+            if rowCount == 0:
+                return
+            chunk = {}
+            for index, name in enumerate(columns):
+                numbers = array('I' if index < len(cls.textColumns) else 'd')
+                numbers.frombytes(readBuffer())
+                if sys.byteorder == 'big':
+                    numbers.byteswap()
+                if index < len(cls.textColumns):
+                    text = readBuffer()
+                    values = []
+                    start = 0
+                    for x in numbers:
+                        values.append(text[start:start+x].decode('utf-8'))
+                        start += x
+                    chunk[name] = values
+                else:
+                    chunk[name] = numbers
+            yield (chunk)
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = 'Writes every student mark of an account')
+    parser.add_argument('username')
+    parser.add_argument('--format', choices = ['csv', 'columnar'], default = 'csv')
+    parser.add_argument('--output', help = 'file to write to, defaults to standard output')
+    parser.add_argument('--batch-size', type = int, default = 500, help = 'student documents fetched at a time')
+    options = parser.parse_args(arguments)
+    exporter = Exporter(options.username, options.batch_size)
+    if options.format == 'csv':
+        if options.output:
+            with open(options.output, 'w', newline = '') as file:
+                exporter.writeCSV(file)
+        else:
+            exporter.writeCSV(sys.stdout)
+    elif options.output:
+        with open(options.output, 'wb') as file:
+            exporter.writeColumnar(file)
+    else:
+        exporter.writeColumnar(sys.stdout.buffer)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,309 @@
+#-----------------------------------------------------------------------------
+# Name:        gradeEngine (gradeEngine.py)
+# Purpose:     To calculate the marks of every student in a course at once
+#
+# Author:      Steven Wu
+# Created:     2020/02/03
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+
+import numpy
+from courses import Courses
+from gradingContext import GradingContext
+from storageLayout import StorageLayout
+
+class GradeEngine():
+    '''
+    Object which calculates the marks of every student in a course in one pass
+
+    The course document, the category weightings and every student document are fetched
+    once, turned into NumPy matrices and the default and adjusted marks of all students
+    are calculated together. The results are identical to Marks.totalMark() and
+    Marks.totalMarkAdjusted() because every sum is accumulated in the same order as
+    the Assignments.calculate() and Marks loops. Like Marks, every entry of a student's
+    assignments is counted (an assignment saved twice in a student document counts twice),
+    and an assignment whose course weighting is not a number still counts towards the
+    adjusted mark if the student has an adjusted weighting for it.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course
+    defaultSort : bool
+        If the assignments are summed in alphabetical order (like Marks after defaultSort())
+        instead of the order they are stored in the student documents
+    studentNames : list
+        Names of the students, in the order of the matrix rows
+    assignmentNames : list
+        Names of the course's assignments, in the order of the matrix columns
+
+    Methods
+    -------
+    load(courseDoc : dict = None, weightings : dict = None, studentDocs : list = None) -> None
+        Fetches the course information and builds the mark matrices
+    totalMarks() -> dict
+        Returns the default and adjusted mark of every student
+    assignmentResults() -> dict
+        Returns the mark of every assignment of every student
+    summaries() -> dict
+        Returns the weighted sums and assignment results StudentTotals stores for every student
+    '''
+
+    reservedKeys = ('assignment name', 'weighting', 'adjusted weighting', 'revision')
+
+    def __init__(self, username, courseName, defaultSort = False):
+        '''
+        Constructor to build a GradeEngine object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+        defaultSort : bool, optional
+            If the assignments are summed in alphabetical order, defaults to False
+        '''
+        self.username = username
+        self.courseName = courseName
+        self.defaultSort = defaultSort
+        self.studentNames = []
+        self.assignmentNames = []
+        self._loaded = False
+
+    @staticmethod
+    def _isNumber(value) -> bool:
+        return (isinstance(value, (int, float)))
+
+    def load(self, courseDoc = None, weightings = None, studentDocs = None) -> None:
+        '''
+        Fetches the course information and builds the mark matrices
+
+        Any of the documents that are passed in are used instead of being fetched
+
+        Parameters
+        ----------
+        courseDoc : dict, optional
+            The course's 'GradebookCourses' document
+        weightings : dict, optional
+            Category names mapped to their weightings
+        studentDocs : list, optional
+            The course's 'GradebookStudents' documents
+
+        Returns
+        -------
+        None
+        '''
+        context = GradingContext(self.username, self.courseName)
+        if courseDoc is None:
+            courseDoc = context.courseDoc()
+        if weightings is None:
+            weightings = context.weightings()
+        if studentDocs is None:
+            studentDocs = Courses(self.username).docsGet('GradebookStudents', {'course name': self.courseName})
+
+        masters = []
+        seen = set()
+        for x in courseDoc.get('assignments', []):
+            if x['assignment name'] not in seen:
+                seen.add(x['assignment name'])
+                masters.append(x)
+        if self.defaultSort:
+            masters.sort(key = lambda y: y['assignment name'].lower())
+        self.assignmentNames = [x['assignment name'] for x in masters]
+        self.studentNames = [x['student name'] for x in studentDocs]
+        columns = {name: index for index, name in enumerate(self.assignmentNames)}
+
+        # The categories of each assignment, in the order Assignments.calculate() visits them
+        categoryLists = []
+        for master in masters:
+            categoryLists.append([x for x in master.keys() if x not in self.reservedKeys and master[x] != 0])
+
+        # Each column is one entry of a student's assignments, in the order Marks adds them up.
+        # Entries without a course assignment are left out, since Assignments.calculate() fails for them
+        entryLists = []
+        for studentDoc in studentDocs:
+            entries = [x for x in studentDoc.get('assignments', []) if x.get('assignment name') in columns]
+            if self.defaultSort:
+                entries.sort(key = lambda y: y['assignment name'].lower())
+            entryLists.append(entries)
+        studentCount = len(studentDocs)
+        assignmentCount = len(masters)
+        entryCount = max([len(x) for x in entryLists], default = 0)
+        slotCount = max([len(x) for x in categoryLists], default = 0)
+
+        shape = (studentCount, entryCount, slotCount)
+        earned = numpy.zeros(shape)
+        total = numpy.ones(shape)
+        categoryWeight = numpy.zeros(shape)
+        valid = numpy.zeros(shape, dtype = bool)
+        present = numpy.zeros((studentCount, entryCount), dtype = bool)
+        entryAssignment = numpy.zeros((studentCount, entryCount), dtype = int)
+        firstEntry = numpy.full((studentCount, assignmentCount), -1)
+        adjusted = numpy.zeros((studentCount, entryCount))
+        hasAdjusted = numpy.zeros((studentCount, entryCount), dtype = bool)
+        masterWeight = numpy.zeros(assignmentCount)
+        masterValid = numpy.zeros(assignmentCount, dtype = bool)
+
+        for a, master in enumerate(masters):
+            if self._isNumber(master.get('weighting')):
+                masterWeight[a] = master['weighting']
+                masterValid[a] = True
+
+        for s, entries in enumerate(entryLists):
+            for e, assignment in enumerate(entries):
+                a = columns[assignment['assignment name']]
+                present[s, e] = True
+                entryAssignment[s, e] = a
+                if firstEntry[s, a] < 0:
+                    firstEntry[s, a] = e
+                if 'adjusted weighting' in assignment and self._isNumber(assignment['adjusted weighting']) and StorageLayout.isCurrent(assignment, masters[a]):
+                    adjusted[s, e] = assignment['adjusted weighting']
+                    hasAdjusted[s, e] = True
+                for k, category in enumerate(categoryLists[a]):
+                    mark = assignment.get(category)
+                    outOf = masters[a][category]
+                    weight = weightings.get(category)
+                    if self._isNumber(mark) and self._isNumber(outOf) and self._isNumber(weight):
+                        earned[s, e, k] = mark
+                        total[s, e, k] = outOf
+                        categoryWeight[s, e, k] = weight
+                        valid[s, e, k] = True
+
+        self._earned = earned
+        self._total = total
+        self._categoryWeight = categoryWeight
+        self._valid = valid
+        self._present = present
+        self._firstEntry = firstEntry
+        self._adjusted = adjusted
+        self._hasAdjusted = hasAdjusted
+        # The course weighting of every entry
+        self._entryWeight = numpy.where(present, masterWeight[entryAssignment], 0.0)
+        self._entryWeightValid = present & masterValid[entryAssignment]
+        self._masterWeight = masterWeight
+        self._masterValid = masterValid
+        self._loaded = True
+
+    def _sequentialSum(self, values, axis) -> numpy.ndarray:
+        # cumsum adds strictly left to right, matching the += loops in Assignments and Marks
+        if values.shape[axis] == 0:
+            return (numpy.zeros(values.shape[:axis] + values.shape[axis+1:]))
+        return (numpy.take(numpy.cumsum(values, axis = axis), -1, axis = axis))
+
+    def _assignmentMarks(self) -> tuple:
+        # The mark of every entry and where Assignments.calculate() returns one
+        with numpy.errstate(divide = 'ignore', invalid = 'ignore', over = 'ignore'):
+            terms = numpy.where(self._valid, self._categoryWeight * self._earned / self._total * 100, 0.0)
+        weights = numpy.where(self._valid, self._categoryWeight, 0.0)
+        markSum = self._sequentialSum(terms, 2)
+        weightSum = self._sequentialSum(weights, 2)
+        calculated = self._present & (weightSum != 0)
+        with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+            marks = numpy.where(calculated, markSum / numpy.where(weightSum != 0, weightSum, 1.0), 0.0)
+        return (marks, calculated)
+
+    def _weightedTotal(self, marks, counted, weights) -> tuple:
+        weights = numpy.where(counted, weights, 0.0)
+        with numpy.errstate(invalid = 'ignore', over = 'ignore'):
+            contributions = numpy.where(counted, marks * weights, 0.0)
+        # Entries that aren't counted add 0.0, which leaves the sums unchanged wherever they are
+        return (self._sequentialSum(contributions, 1), self._sequentialSum(weights, 1))
+
+    def _adjustedWeights(self) -> tuple:
+        # Marks.totalMarkAdjusted() uses a current adjusted weighting, or else the course weighting
+        weights = numpy.where(self._hasAdjusted, self._adjusted, self._entryWeight)
+        return (weights, self._hasAdjusted | self._entryWeightValid)
+
+    def _totals(self) -> tuple:
+        if not self._loaded:
+            self.load()
+        marks, calculated = self._assignmentMarks()
+        adjustedWeight, adjustedValid = self._adjustedWeights()
+        return (self._weightedTotal(marks, calculated & self._entryWeightValid, self._entryWeight) +
+                self._weightedTotal(marks, calculated & adjustedValid, adjustedWeight))
+
+    def totalMarks(self) -> dict:
+        '''
+        Returns the default and adjusted mark of every student
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Student names mapped to [default mark, adjusted mark], a mark is None where
+            Marks.totalMark() or Marks.totalMarkAdjusted() would raise ZeroDivisionError
+        '''
+        defaultSum, defaultWeight, adjustedSum, adjustedWeightSum = self._totals()
+        results = {}
+        for s, studentName in enumerate(self.studentNames):
+            default = defaultSum[s]/defaultWeight[s] if defaultWeight[s] != 0 else None
+            adjusted = adjustedSum[s]/adjustedWeightSum[s] if adjustedWeightSum[s] != 0 else None
+            results[studentName] = [None if default is None else float(default), None if adjusted is None else float(adjusted)]
+        return (results)
+
+    def assignmentResults(self) -> dict:
+        '''
+        Returns the mark of every assignment of every student
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Student names mapped to dicts of assignment names and marks, a mark is None where
+            Assignments.calculate() would raise an error
+        '''
+        if not self._loaded:
+            self.load()
+        marks, calculated = self._assignmentMarks()
+        results = {}
+        for s, studentName in enumerate(self.studentNames):
+            results[studentName] = {}
+            for a, assignmentName in enumerate(self.assignmentNames):
+                e = self._firstEntry[s, a]
+                results[studentName][assignmentName] = float(marks[s, e]) if e >= 0 and calculated[s, e] else None
+        return (results)
+
+    def summaries(self) -> dict:
+        '''
+        Returns the weighted sums and assignment results StudentTotals stores for every student
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Student names mapped to dicts with a 'totals' dict (the 'default sum', 'default weighting',
+            'adjusted sum' and 'adjusted weighting' the totals are divided from) and a 'results' list
+            (the 'assignment name', 'mark', 'weighting' and 'adjusted weighting' of every course assignment,
+            taken from the student's first entry of it. The mark is None where Assignments.calculate()
+            would raise an error, the student does not have the assignment or neither weighting is a
+            number. The weighting is None where the course weighting is not a number)
+        '''
+        defaultSum, defaultWeight, adjustedSum, adjustedWeightSum = self._totals()
+        marks, calculated = self._assignmentMarks()
+        adjustedWeight, adjustedValid = self._adjustedWeights()
+        summaries = {}
+        for s, studentName in enumerate(self.studentNames):
+            results = []
+            for a, assignmentName in enumerate(self.assignmentNames):
+                e = self._firstEntry[s, a]
+                counted = e >= 0 and calculated[s, e] and adjustedValid[s, e]
+                results.append({'assignment name': assignmentName,
+                                'mark': float(marks[s, e]) if counted else None,
+                                'weighting': float(self._masterWeight[a]) if self._masterValid[a] else None,
+                                'adjusted weighting': float(adjustedWeight[s, e]) if counted else (float(self._masterWeight[a]) if self._masterValid[a] else None)})
+            summaries[studentName] = {'totals': {'default sum': float(defaultSum[s]), 'default weighting': float(defaultWeight[s]),
+                                                 'adjusted sum': float(adjustedSum[s]), 'adjusted weighting': float(adjustedWeightSum[s])},
+                                      'results': results}
+        return (summaries)
@@ -0,0 +1,83 @@
+#-----------------------------------------------------------------------------
+# Name:        gradebook (gradebook.py)
+# Purpose:     To give scripts and servers one import for the storage, grading
+#              and account logic of the Gradebook program, without tkinter
+#
+# Author:      Steven Wu
+# Created:     2020/02/20
+# Updated:     2020/02/24
+#-----------------------------------------------------------------------------
+# Usage: import gradebook
+#        gradebook.Courses(username).courseSummaries()
+#        python gradebook.py    (prints the modules each name is loaded from)
+# Each class is imported the first time it is used, so importing this module
+# is fast and only the parts of the program a script uses are loaded. None of
+# the modules listed here import tkinter; the screens are only imported by
+# main.py, so the program's logic runs on machines without a display.
+
+import importlib
+import sys
+
+# Names which can be used as gradebook.<name>, mapped to the module they are in
+modules = {'AggregateGrading': 'aggregateGrading',
+           'AsyncAssignments': 'asyncAssignments',
+           'AsyncCourses': 'asyncCourses',
+           'AsyncMarks': 'asyncMarks',
+           'Assignments': 'assignments',
+           'AssignmentsAdjusted': 'assignmentsAdjusted',
+           'ChangeWatcher': 'changeWatcher',
+           'ConnectionManager': 'connectionManager',
+           'Courses': 'courses',
+           'Credentials': 'credentials',
+           'DatabaseSetup': 'databaseSetup',
+           'DocCache': 'docCache',
+           'GradeEngine': 'gradeEngine',
+           'GradingContext': 'gradingContext',
+           'Marks': 'marks',
+           'StorageLayout': 'storageLayout',
+           'StudentTotals': 'studentTotals',
+           'UserAccount': 'userAccount',
+           'sharedCache': 'docCache',
+           'sharedCredentials': 'credentials',
+           'instrumentation': 'instrumentation',
+           'exporter': 'exporter',
+           'csvImporter': 'csvImporter',
+           'reportCards': 'reportCards'}
+
+__all__ = sorted(modules)
+
+def __getattr__(name):
+    '''
+    Imports and returns a class or module the first time it is used
+
+    Parameters
+    ----------
+    name : str
+        Name of the class or module (i.e 'Courses')
+
+    Returns
+    -------
+    object
+        The class, object or module
+
+    Raises
+    -------
+    AttributeError
+        If the name is not in modules
+    '''
+    if name not in modules:
+        raise AttributeError("module 'gradebook' has no attribute " + repr(name))
+    module = importlib.import_module(modules[name])
+    value = module if module.__name__ == name else getattr(module, name)
+    # Saved in the module so later uses do not call __getattr__ again
+    globals()[name] = value
+    return (value)
+
+def __dir__():
+    return (sorted(list(globals()) + __all__))
+
+if __name__ == '__main__':
+    for name in __all__:
+        __getattr__(name)
+        print('{:<22}{}'.format(name, modules[name]))
+    print('tkinter imported: ' + str('tkinter' in sys.modules))
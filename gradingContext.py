@@ -0,0 +1,133 @@
+#-----------------------------------------------------------------------------
+# Name:        gradingContext (gradingContext.py)
+# Purpose:     To hold the course information needed to calculate marks so it
+#              is only fetched once per student page
+#
+# Author:      Steven Wu
+# Created:     2020/02/04
+# Updated:     2020/02/04
+#-----------------------------------------------------------------------------
+
+from courses import Courses
+
+class GradingContext():
+    '''
+    Object which holds the course document and category weightings used to calculate marks
+
+    Both are fetched the first time they are needed and kept until invalidate() is called,
+    so every Assignments object sharing a context reuses the same documents. Documents that
+    were already fetched elsewhere can be passed in instead.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course
+
+    Methods
+    -------
+    courseDoc() -> dict
+        Returns the course's document
+    weightings() -> dict
+        Returns the category names mapped to their weightings
+    masterAssignment(assignmentName : str) -> dict
+        Returns the course-wide master copy of an assignment
+    invalidate() -> None
+        Discards the stored documents so they are fetched again
+    '''
+
+    def __init__(self, username, courseName, courseDoc = None, weightings = None):
+        '''
+        Constructor to build a GradingContext object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+        courseDoc : dict, optional
+            The course's 'GradebookCourses' document, fetched when first needed if not given
+        weightings : dict, optional
+            Category names mapped to their weightings, fetched when first needed if not given
+        '''
+        self.username = username
+        self.courseName = courseName
+        self._courseDoc = courseDoc
+        self._weightings = weightings
+
+    def courseDoc(self) -> dict:
+        '''
+        Returns the course's document
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            The course's 'GradebookCourses' document, or an empty dict if it does not exist
+        '''
+        if self._courseDoc is None:
+            self._courseDoc = Courses(self.username).docGet({'course name': self.courseName}, 'GradebookCourses', {'course name': 1, 'assignments': 1, 'revision': 1}) or {}
+        return (self._courseDoc)
+
+    def weightings(self) -> dict:
+        '''
+        Returns the category names mapped to their weightings
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Category names mapped to their weightings
+        '''
+        if self._weightings is None:
+            self._weightings = {}
+            for x in Courses(self.username).docsGet('GradebookCourses', {'category': {'$exists': True}}, {'category': 1, 'weighting': 1}):
+                self._weightings[x['category']] = x['weighting']
+        return (self._weightings)
+
+    def masterAssignment(self, assignmentName) -> dict:
+        '''
+        Returns the course-wide master copy of an assignment
+
+        Parameters
+        ----------
+        assignmentName : str
+            Name of the assignment
+
+        Returns
+        -------
+        dict
+            The assignment from the course document
+
+        Raises
+        -------
+        KeyError
+            If the course document has no assignment with that name
+        '''
+        for x in self.courseDoc().get('assignments', []):
+            if x['assignment name'] == assignmentName:
+                return (x)
+        raise KeyError(assignmentName)
+
+    def invalidate(self) -> None:
+        '''
+        Discards the stored documents so they are fetched again
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self._courseDoc = None
+        self._weightings = None
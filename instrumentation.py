@@ -0,0 +1,321 @@
+#-----------------------------------------------------------------------------
+# Name:        instrumentation (instrumentation.py)
+# Purpose:     To record how many database operations each screen action makes
+#              and how long they take
+#
+# Author:      Steven Wu
+# Created:     2020/02/19
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+# Set the GRADEBOOK_PROFILE environment variable (i.e GRADEBOOK_PROFILE=1) to
+# turn the instrumentation on. A summary is printed when the program exits, when
+# F12 is pressed in the main window or, where the signal exists, when the process
+# receives SIGUSR1.
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import os
+import signal
+import sys
+import threading
+import time
+import bson
+from pymongo import monitoring
+from connectionManager import ConnectionManager
+
+class CommandRecorder(monitoring.CommandListener):
+    '''
+    Command listener which records every command sent to the MongoDB server
+
+    pymongo calls the listener on the thread (or asyncio task) sending the command, so the
+    command is recorded under the screen action that caused it
+
+    Attributes
+    ----------
+    instrumentation : Instrumentation
+        Where the commands are recorded
+
+    Methods
+    -------
+    started(event : CommandStartedEvent) -> None
+        Records a command and the size of the request
+    succeeded(event : CommandSucceededEvent) -> None
+        Records the duration of a command and the size of the reply
+    failed(event : CommandFailedEvent) -> None
+        Records the duration of a command that failed
+    '''
+    def __init__(self, instrumentation):
+        self.instrumentation = instrumentation
+
+    @staticmethod
+    def _operation(event) -> str:
+        return ('mongo ' + event.command_name + ' ' + event.database_name)
+
+    def started(self, event) -> None:
+        self.instrumentation.record(self._operation(event), calls = 1, bytesSent = len(bson.encode(event.command)))
+
+    def succeeded(self, event) -> None:
+        self.instrumentation.record(self._operation(event), seconds = event.duration_micros / 1e6, bytesReceived = len(bson.encode(event.reply)))
+
+    def failed(self, event) -> None:
+        self.instrumentation.record(self._operation(event), seconds = event.duration_micros / 1e6, failures = 1)
+
+class Instrumentation():
+    '''
+    Object which records the calls, time and bytes of database operations per screen action
+
+    Screen methods decorated with screenAction() set the current action, which is kept in a
+    context variable, so the IOExecutor threads doing the action's database work see it too.
+    Methods decorated with traced() and the commands seen by a CommandRecorder are recorded
+    under the current action ('other' outside of any action). Bytes are only known for the
+    commands sent to a MongoDB server, not for the SQLite backend.
+
+    Both decorators return the method unchanged while the instrumentation is disabled, so it
+    costs nothing unless it was enabled before the decorated classes were imported.
+
+    Attributes
+    ----------
+    enabled : bool
+        If operations are being recorded
+
+    Methods
+    -------
+    enable() -> None
+        Starts recording and adds a CommandRecorder to the MongoDB client
+    screenAction(function : function) -> function
+        Decorator making the calls of a screen method an action
+    traced(function : function) -> function
+        Decorator recording the calls of a method
+    currentAction() -> str
+        Returns the name of the action being run
+    record(operation : str, calls : int = 0, seconds : float = 0, bytesSent : int = 0, bytesReceived : int = 0, failures : int = 0) -> None
+        Adds to the totals of an operation under the current action
+    summary() -> dict
+        Returns the totals of every operation of every action
+    report(file : file = None) -> None
+        Prints the summary as a table
+    reset() -> None
+        Discards everything recorded so far
+    '''
+
+    fields = ('calls', 'ms', 'bytes sent', 'bytes received', 'failures')
+
+    def __init__(self):
+        '''
+        Constructor to build a disabled Instrumentation object
+        '''
+        self.enabled = False
+        self._action = contextvars.ContextVar('gradebookAction', default = 'other')
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        '''
+        Starts recording and adds a CommandRecorder to the MongoDB client
+
+        Only classes imported after this is called are instrumented. Any open client is closed
+        so the next one is created with the listener.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if self.enabled:
+            return
+        self.enabled = True
+        ConnectionManager.configure(event_listeners = [CommandRecorder(self)])
+        atexit.register(self.report)
+        if hasattr(signal, 'SIGUSR1') and threading.current_thread() is threading.main_thread():
+            # Python runs signal handlers on the main thread between two bytecodes, possibly while
+            # record() holds the lock there, so the report is printed from another thread
+            signal.signal(signal.SIGUSR1, lambda number, frame: threading.Thread(target = self.report, name = 'gradebook-report', daemon = True).start())
+
+    def screenAction(self, function):
+        '''
+        Decorator making the calls of a screen method an action
+
+        Operations recorded during the call, or by work it submits to an IOExecutor, are
+        recorded under the method's name (i.e 'MainScreen.studentClicked')
+
+        Parameters
+        ----------
+        function : function
+            The method
+
+        Returns
+        -------
+        function
+            The decorated method, or the method itself if the instrumentation is disabled
+        '''
+        if not self.enabled:
+            return (function)
+        name = function.__qualname__
+        @functools.wraps(function)
+        def action(*args, **kwargs):
+            token = self._action.set(name)
+            start = time.perf_counter()
+            try:
+                return (function(*args, **kwargs))
+            finally:
+                self.record(name, calls = 1, seconds = time.perf_counter() - start)
+                self._action.reset(token)
+        return (action)
+
+    def traced(self, function):
+        '''
+        Decorator recording the calls of a method
+
+        Each call is recorded under the current action with the method's name (i.e 'Courses.docGet').
+        Coroutines are timed until they finish.
+
+        Parameters
+        ----------
+        function : function
+            The method
+
+        Returns
+        -------
+        function
+            The decorated method, or the method itself if the instrumentation is disabled
+        '''
+        if not self.enabled:
+            return (function)
+        name = function.__qualname__
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def tracedCoroutine(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return (await function(*args, **kwargs))
+                finally:
+                    self.record(name, calls = 1, seconds = time.perf_counter() - start)
+            return (tracedCoroutine)
+        @functools.wraps(function)
+        def tracedFunction(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return (function(*args, **kwargs))
+            finally:
+                self.record(name, calls = 1, seconds = time.perf_counter() - start)
+        return (tracedFunction)
+
+    def currentAction(self) -> str:
+        '''
+        Returns the name of the action being run
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            Name of the screen method, or 'other'
+        '''
+        return (self._action.get())
+
+    def record(self, operation, calls = 0, seconds = 0, bytesSent = 0, bytesReceived = 0, failures = 0) -> None:
+        '''
+        Adds to the totals of an operation under the current action
+
+        Parameters
+        ----------
+        operation : str
+            Name of the operation
+        calls : int, optional
+            Number of calls to add
+        seconds : float, optional
+            Time to add
+        bytesSent : int, optional
+            Number of bytes sent to the database to add
+        bytesReceived : int, optional
+            Number of bytes received from the database to add
+        failures : int, optional
+            Number of failed calls to add
+
+        Returns
+        -------
+        None
+        '''
+        key = (self._action.get(), operation)
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = [0, 0.0, 0, 0, 0]
+            totals[0] += calls
+            totals[1] += seconds * 1000
+            totals[2] += bytesSent
+            totals[3] += bytesReceived
+            totals[4] += failures
+
+    def summary(self) -> dict:
+        '''
+        Returns the totals of every operation of every action
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Action names mapped to operation names mapped to dicts of the 'calls', 'ms',
+            'bytes sent', 'bytes received' and 'failures'
+        '''
+        summary = {}
+        with self._lock:
+            for (action, operation), totals in self._totals.items():
+                summary.setdefault(action, {})[operation] = dict(zip(self.fields, totals))
+        return (summary)
+
+    def report(self, file = None) -> None:
+        '''
+        Prints the summary as a table
+
+        Actions are listed by name and their operations from the slowest to the fastest
+
+        Parameters
+        ----------
+        file : file, optional
+            Open text file to print to, defaults to sys.stderr
+
+        Returns
+        -------
+        None
+        '''
+        if file is None:
+            file = sys.stderr
+        summary = self.summary()
+        print('{:<44}{:>8}{:>12}{:>10}{:>12}{:>12}{:>10}'.format('Action / operation', 'calls', 'total ms', 'mean ms', 'sent B', 'received B', 'failed'), file = file)
+        for action in sorted(summary):
+            print(action, file = file)
+            for operation, totals in sorted(summary[action].items(), key = lambda x: -x[1]['ms']):
+                mean = totals['ms'] / totals['calls'] if totals['calls'] else 0
+                print('    {:<40}{:>8}{:>12.2f}{:>10.2f}{:>12}{:>12}{:>10}'.format(operation, totals['calls'], totals['ms'], mean, totals['bytes sent'],
+                                                                                  totals['bytes received'], totals['failures']), file = file)
+        file.flush()
+
+    def reset(self) -> None:
+        '''
+        Discards everything recorded so far
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        with self._lock:
+            self._totals = {}
+
+instrumentation = Instrumentation()
+if os.environ.get('GRADEBOOK_PROFILE'):
+    instrumentation.enable()
@@ -0,0 +1,173 @@
+#-----------------------------------------------------------------------------
+# Name:        ioExecutor (ioExecutor.py)
+# Purpose:     To run database operations on background threads so the windows
+#              of the Gradebook program do not freeze while waiting on them
+#
+# Author:      Steven Wu
+# Created:     2020/02/10
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+
+import contextvars
+import queue
+import functools
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class IOExecutor():
+    '''
+    Object which runs functions on a thread pool and hands their results back to the Tk thread
+
+    Tkinter widgets may only be used from the thread running the mainloop, so finished
+    results are put in a queue which the Tk thread polls with after() and the callbacks
+    are called from there. Every result is tagged with the page it was requested from;
+    once newPage() is called the results of the previous page are dropped instead of
+    being drawn over the new one. The function and its callback run in copies of the
+    context they were submitted from, so context variables (such as the screen action
+    recorded by the instrumentation) carry over to the background thread.
+
+    Attributes
+    ----------
+    root : Tk
+        Window whose mainloop polls the result queue
+    pollInterval : int
+        Number of milliseconds between checks of the result queue
+    page : int
+        Number of the page currently displayed
+
+    Methods
+    -------
+    submit(function : function, callback : function = None, args : tuple = (), pageBound : bool = True, errback : function = None) -> None
+        Runs function(*args) on a background thread and calls callback(result) on the Tk thread
+    post(callback : function, args : tuple = ()) -> None
+        Calls callback(*args) on the Tk thread, from any thread
+    newPage() -> None
+        Marks the start of a new page, dropping the results still pending for the old one
+    shutdown() -> None
+        Stops polling and waits for the running functions to finish
+    '''
+
+    def __init__(self, root, maxWorkers = 4, pollInterval = 20):
+        '''
+        Constructor to build an IOExecutor object
+
+        Parameters
+        ----------
+        root : Tk
+            Window whose mainloop polls the result queue
+        maxWorkers : int, optional
+            Number of background threads, defaults to 4
+        pollInterval : int, optional
+            Number of milliseconds between checks of the result queue, defaults to 20
+        '''
+        self.root = root
+        self.pollInterval = pollInterval
+        self.page = 0
+        self._pool = ThreadPoolExecutor(max_workers = maxWorkers, thread_name_prefix = 'gradebook-io')
+        self._results = queue.Queue()
+        self._pollId = self.root.after(self.pollInterval, self._poll)
+
+    def submit(self, function, callback = None, args = (), pageBound = True, errback = None) -> None:
+        '''
+        Runs function(*args) on a background thread and calls callback(result) on the Tk thread
+
+        Parameters
+        ----------
+        function : function
+            Function to run, it must not use any widgets
+        callback : function, optional
+            Function called with the result, nothing is called if not given
+        args : tuple, optional
+            Arguments of the function
+        pageBound : bool, optional
+            If the result is dropped when the page changes before it arrives, defaults to True
+        errback : function, optional
+            Function called with the exception if the function raises one, the exception is
+            reported like any other Tk callback error if not given
+
+        Returns
+        -------
+        None
+        '''
+        page = self.page if pageBound else None
+        future = self._pool.submit(contextvars.copy_context().run, function, *args)
+        context = contextvars.copy_context()
+        if callback is not None:
+            callback = functools.partial(context.run, callback)
+        if errback is not None:
+            errback = functools.partial(context.run, errback)
+        future.add_done_callback(lambda finished: self._results.put((page, callback, errback, finished)))
+
+    def post(self, callback, args = ()) -> None:
+        '''
+        Calls callback(*args) on the Tk thread, from any thread
+
+        Used by threads that aren't running a submitted function (i.e the ChangeWatcher's) to
+        hand information to the windows. The call is not dropped when the page changes.
+
+        Parameters
+        ----------
+        callback : function
+            Function to call
+        args : tuple, optional
+            Arguments of the function
+
+        Returns
+        -------
+        None
+        '''
+        finished = Future()
+        finished.set_result(None)
+        self._results.put((None, lambda result: callback(*args), None, finished))
+
+    def newPage(self) -> None:
+        '''
+        Marks the start of a new page, dropping the results still pending for the old one
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self.page += 1
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                page, callback, errback, finished = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if page is not None and page != self.page:
+                continue
+            error = finished.exception()
+            try:
+                if error is not None:
+                    if errback is None:
+                        raise error
+                    errback(error)
+                elif callback is not None:
+                    callback(finished.result())
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+        self._pollId = self.root.after(self.pollInterval, self._poll)
+
+    def shutdown(self) -> None:
+        '''
+        Stops polling and waits for the running functions to finish
+
+        Functions still waiting for a thread (i.e page loads) are dropped, only the ones already
+        running (i.e a save) are waited for
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self.root.after_cancel(self._pollId)
+        self._pool.shutdown(wait = True, cancel_futures = True)
@@ -1,502 +1,1020 @@
-# -----------------------------------------------------------------------------
-# Name:        Gradebook Main File (main.py)
-# Purpose:     To contain the main screen of the Gradebook program
-#
-# Author:      Steven Wu
-# Created:     2019/09/05
-# Updated:     2020/01/08
-# -----------------------------------------------------------------------------
-from tkinter import *
-from courses import Courses
-from startScreen import StartScreen
-from manageScreen import ManageScreen
-from marks import Marks
-from assignments import Assignments
-from math import floor
-#pymongo and dnspython libraries MUST BE INSTALLED
-
-class MainScreen(Tk):
-    '''
-    Object which holds the main window of the program, inherits from the TK() class.
-
-    Attributes
-    ----------
-    currentAccount : str
-        Current account username
-    topFrame : Frame
-        Frame which holds the navigation buttons
-    courseManageBtn : Button
-        Triggers the course management screen
-    scrollCanvas : Canvas
-        Canvas which holds the bottom frame so that it is scrollable
-    bottomFrame : Frame
-        Frame which holds the main widgets of the window
-    yScroll: ScrollBar
-        Vertical scroll bar
-    studentManageBtn : Button
-        Triggers the student management screen
-    assignmentManageBtn : Button
-        Triggers the assignment management screen
-    categoryManageBtn : Button
-        Triggers the category management screen
-    saveStatus : Label
-        Label which displays the result of trying to save an assignment
-
-    Methods
-    -------
-    loadCourses() -> None
-        Displays existing courses as buttons
-    clearBottomFrame() -> None
-    	Reinitializes/creates the bottomFrame
-    courseClicked(courseName : str)-> None
-    	Loads the page of a specific course
-    studentClicked(studentName : str, courseName : str)-> None
-        Loads the page of a specific student
-    assignmentClicked(assignmentName : str, courseName : str, assignmentType : str, studentName : str='',markObj : Marks= None)-> None
-    	Loads the page of a specific assignment
-    saveAssignment(assignmentName : str,courseName : str, assignmentType : str, entries : str, studentName : str ='') -> None
-        Saves an assignment to the database
-    '''
-
-    def __init__(self):
-        '''
-        Constructor for MainScreen objects
-
-        Parameters
-        ----------
-        None
-
-        '''
-
-        super().__init__()
-        self.geometry('640x360')
-        self.currentAccount = ''
-        self.grid_rowconfigure(1, weight=1)
-        self.grid_columnconfigure(0, weight=1)
-        self.grid_columnconfigure(1,weight = 0)
-        self.topFrame = Frame(self, bg='Red')
-        self.topFrame.grid(row=0, columnspan = 2,sticky='EW')
-        self.topFrame.grid_rowconfigure(0, weight=1)
-        self.topFrame.grid_columnconfigure(0, weight=1)
-        self.topFrame.grid_columnconfigure(1, weight=1)
-        self.topFrame.grid_columnconfigure(2, weight=1)
-        
-        self.clearBottomFrame()
-        self.courseManageBtn = Button(self.topFrame, height=1, width=14, text='Manage Courses',command=lambda: ManageScreen(self, 'Course', self.currentAccount))
-        self.courseManageBtn.grid(column=1, row=0)
-        self.withdraw()
-        StartScreen(self)
-    def loadCourses(self) -> None:
-        '''
-    	Displays existing courses as buttons
-
-        Creates a button for every course document found under the current account in the database.
-        Each button has a course name as its text and they are displayed in alphanumeric order.
-
-        Parameters
-        ----------
-        None
-
-        Returns
-        -------
-        None
-
-        Raises
-        -------
-        AttributeError
-            If the MainScreen object (self) does not have a studentManageBtn or assignmentManageBtn attribute
-        KeyError
-            If a document in 'GradebookCourses' does not have an 'assignments' key
-        '''
-        self.clearBottomFrame()
-        self.title('Courses')
-
-        try:
-            self.studentManageBtn.destroy()
-            self.assignmentManageBtn.destroy()
-        except Exception as e:
-            pass
-        courseObj = Courses(self.currentAccount)
-        coursesList = courseObj.docsGet('GradebookCourses',{'course name':{'$exists': True}})
-        row = 0
-        for x in sorted(coursesList, key=lambda y: y['course name'].lower()):
-            Button(self.bottomFrame, text=x['course name'], font=('Helvetica', 40),command=lambda y=x: self.courseClicked(y['course name'])).grid(row = row,column=0, sticky='EW')
-            try:
-                Label(self.bottomFrame, text = str(len(x['assignments']))+'\nAssignment(s)').grid(row = row,column =2, sticky = 'EW')
-            except:
-                Label(self.bottomFrame, text = '0\nAssignment(s)').grid(row = row,column =2, sticky = 'EW')
-            studentCount = 0
-            Label(self.bottomFrame, text = str(len(courseObj.docsGet('GradebookStudents',{'course name':x['course name']})))+'\nStudent(s)').grid(row = row, column = 1, sticky = 'EW')
-
-            row += 1
-        self.courseManageBtn.config(text='Manage Courses',command=lambda:  ManageScreen(self, 'Course', self.currentAccount))
-
-    def clearBottomFrame(self) -> None:
-        '''
-    	Reinitializes/creates the bottomFrame
-
-        Reinitializes/creates the bottomFrame (and the canvas it is inside) to clear the widgets from it
-
-        Parameters
-        ----------
-        None
-
-        Returns
-        -------
-        None
-
-        '''
-
-        self.scrollCanvas = Canvas(self)
-        self.scrollCanvas.grid(row = 1,column=0,sticky='NSEW')
-        self.bottomFrame = Frame(self.scrollCanvas)
-
-        self.scrollCanvasFrame = self.scrollCanvas.create_window((0,0),window = self.bottomFrame, anchor = 'nw', tags = 'self.bottomFrame')
-        self.yScroll = Scrollbar(self, orient='vertical', command = self.scrollCanvas.yview)
-        self.scrollCanvas.configure(yscrollcommand=self.yScroll.set)
-        #self.xScroll = Scrollbar(self, orient='horizontal', command = self.scrollCanvas.xview)
-        #self.scrollCanvas.configure(xscrollcommand=self.xScroll.set)
-
-        self.bottomFrame.bind('<Configure>',  lambda event: self.scrollCanvas.configure(scrollregion=self.scrollCanvas.bbox('all')))
-        self.scrollCanvas.bind('<Configure>',lambda event: self.scrollCanvas.itemconfig(self.scrollCanvasFrame,width = event.width))
-        self.scrollCanvas.bind_all('<MouseWheel>', lambda event: self.scrollCanvas.yview_scroll(int(-1 * (event.delta / 120)), 'units'))
-        #self.bottomFrame.grid(sticky='EW')
-        self.bottomFrame.grid_columnconfigure(0, weight=2)
-        self.bottomFrame.grid_columnconfigure(1, weight=1)
-        self.bottomFrame.grid_columnconfigure(2, weight=1)
-        self.yScroll.grid(row = 1,column = 1,sticky = NS)
-        
-    def courseClicked(self, courseName) -> None:
-        '''
-    	Loads the page of a specific course
-
-        Displays the students, assignments and assignment weightings in the course
-
-        Parameters
-        ----------
-        courseName : str
-            Name of the course
-
-        Returns
-        -------
-        None
-        
-        Raises
-        -------
-        AttributeError
-            If the MainScreen object (self) does not have a categoryManageBtn attribute
-        KeyError
-            If the document in 'GradebookCourses' does not have an 'assignments' key
-        '''
-
-        self.clearBottomFrame()
-        try:
-            self.categoryManageBtn.destroy()
-        except Exception as e:
-            pass
-        self.title(courseName)
-        self.courseManageBtn.config(text='Return to courses', command=self.loadCourses)
-        self.studentManageBtn = Button(self.topFrame, text='Manage Students ', height=1, width=14,command=lambda: ManageScreen(self, 'Student', self.currentAccount, courseName))
-        self.studentManageBtn.grid(column=0, row=0)
-        self.assignmentManageBtn = Button(self.topFrame, text='Manage Assignments', height=1, width=14,command=lambda: ManageScreen(self, 'Assignment', self.currentAccount, courseName))
-        self.assignmentManageBtn.grid(column=2, row=0)
-        studentInfo = Courses(self.currentAccount).docsGet('GradebookStudents',{'course name':courseName})
-        assignmentInfo = Courses(self.currentAccount).docGet({'course name':courseName}, 'GradebookCourses')
-        Label(self.bottomFrame, text = 'Students').grid(row = 0, column = 0, sticky= EW)
-        row = 1
-        for x in sorted(studentInfo, key = lambda y: y['student name'].lower()):
-            #if x['course name'] == courseName:
-            Button(self.bottomFrame, text=x['student name'], font=('Helvetica', 40), command=lambda y = x: self.studentClicked(y['student name'],courseName)).grid(row = row,column=0, sticky='EW')
-            row+=1
-        Label(self.bottomFrame, text = 'Assignments').grid(row = 0, column = 1, sticky= EW)
-        Label(self.bottomFrame, text='Weightings').grid(row=0, column=2, sticky=EW)
-        row = 1
-        try:
-            for x in sorted(assignmentInfo['assignments'], key = lambda y: y['assignment name'].lower()):
-                Button(self.bottomFrame, text=x['assignment name'], font=('Helvetica', 40),command=lambda y = x: self.assignmentClicked(y['assignment name'],courseName, 'Course')).grid(row = row,column=1, sticky='EW')
-                Label(self.bottomFrame,text = x['weighting'], font=('Helvetica', 40)).grid(row = row,column=2, sticky='EW')
-                row+=1
-        except:
-            pass
-
-    def studentClicked(self, studentName, courseName)-> None:
-        '''
-    	Loads the page of a specific student
-
-        Displays the student's assignments, assignment weightings and marks in the specified course
-
-        Parameters
-        ----------
-        studentName : str
-            Name of the student
-        courseName : str
-            Name of the course
-
-        Returns
-        -------
-        ZeroDivisionError
-            If there are no assignments with categories (with >0 weighting) assigned more than 0 marks
-        KeyError
-            If the document in 'GradebookCourses' does not have an 'assignments' key
-        ZeroDivisionError
-            If there is no instance of the assignment in the student's document (mark of 0 is divided by a weighting of 0)
-        IndexError
-            If index used on markObj.assignmentMarks is out of range
-        KeyError
-            If dict in markObj.assignmentList does not have an 'adjusted weighting' key
-        '''
-        self.clearBottomFrame()
-        self.title(studentName)
-        self.studentManageBtn.destroy()
-        self.assignmentManageBtn.destroy()
-        self.courseManageBtn.config(text = 'Return to '+courseName, command = lambda:self.courseClicked(courseName))
-        markObj = Marks(self.currentAccount, courseName, studentName)
-        markObj.defaultSort()
-
-        Label(self.bottomFrame, text = 'Default Mark(%)').grid(row = 0, column = 1, sticky= EW)
-        Label(self.bottomFrame, text = 'Adjusted Mark(%)').grid(row = 0, column = 2, sticky= EW)
-        Label(self.bottomFrame, text='Total Mark', font=('Helvetica', 40)).grid(row = 1,column=0, sticky='EW')
-        try:
-            Label(self.bottomFrame, text=str(round(markObj.totalMark(),2)), font=('Helvetica', 40)).grid(row = 1,column=1, sticky='EW')
-            Label(self.bottomFrame, text=str(round(markObj.totalMarkAdjusted(),2)), font=('Helvetica', 40)).grid(row = 1,column=2, sticky='EW')
-        except Exception as e:
-            #print (e)
-            Label(self.bottomFrame, text='N/A', font=('Helvetica', 40)).grid(row = 1,column=1, sticky='EW')
-            Label(self.bottomFrame, text='N/A', font=('Helvetica', 40)).grid(row = 1,column=2, sticky='EW')
-        Label(self.bottomFrame, text = 'Assignments').grid(row = 2, column = 0, sticky= EW)
-        Label(self.bottomFrame, text = 'Effective Weighting').grid(row = 2, column = 1, sticky= EW)
-        Label(self.bottomFrame, text = 'Mark(%)').grid(row = 2, column = 2, sticky= EW)
-
-        row = 3
-        minIndex = 0
-        try:
-            for x in sorted(Courses(self.currentAccount).docGet({'course name':courseName},'GradebookCourses')["assignments"], key = lambda y:y['assignment name'].lower()):
-                try: 
-                    Button(self.bottomFrame, text=x['assignment name'], font=('Helvetica', 40),command=lambda y = x: self.assignmentClicked(y['assignment name'],courseName, 'Student', studentName, markObj)).grid(row = row,column=0, sticky='EW')
-                    if markObj.assignmentList[minIndex].assignmentMarks['assignment name'] == x['assignment name']:
-                        Label(self.bottomFrame, text=str(round(markObj.assignmentList[minIndex].calculate()[0],2)), font=('Helvetica', 40)).grid(row = row,column=2, sticky='EW')
-                        try:
-                            Label(self.bottomFrame, text=str(round(markObj.assignmentList[minIndex].assignmentMarks['adjusted weighting'],2)), font=('Helvetica', 40)).grid(row = row,column=1, sticky='EW')
-                        except:
-                            Label(self.bottomFrame, text=str(round(x['weighting'],2)), font=('Helvetica', 40)).grid(row = row,column=1, sticky='EW')
-                        minIndex+=1
-                    else:
-                        Label(self.bottomFrame, text='N/A', font=('Helvetica', 40)).grid(row = row,column=2, sticky='EW')
-                        Label(self.bottomFrame, text='0', font=('Helvetica', 40)).grid(row = row,column=1, sticky='EW')
-                except ZeroDivisionError as e:
-                    #print(e)
-                    Label(self.bottomFrame, text='N/A', font=('Helvetica', 40)).grid(row = row,column=2, sticky='EW')
-                    Label(self.bottomFrame, text='0', font=('Helvetica', 40)).grid(row = row,column=1, sticky='EW')
-                    minIndex+=1
-                except IndexError as e:
-                    #print(e)
-                    Label(self.bottomFrame, text='N/A', font=('Helvetica', 40)).grid(row = row,column=2, sticky='EW')
-                    Label(self.bottomFrame, text='0', font=('Helvetica', 40)).grid(row = row,column=1, sticky='EW')
-                row+=1
-        except:
-            pass
-    def assignmentClicked(self, assignmentName, courseName, assignmentType, studentName='', markObj = None)-> None:
-        '''
-    	Loads the page of a specific assignment
-
-        Displays and allows for editing of course wide master assignments (which contain the total marks, weightings, etc.) 
-        as well as student specific assignment results.
-
-        Parameters
-        ----------
-        assignmentName : str
-            Name of the assignment
-        courseName : str
-            Name of the course
-        assignmentType : str
-            Type of assignment clicked
-        studentName : str, optional
-            Name of the student who the assignment belongs to, if applicable
-        markObj : Marks, optional
-            Mark object containing the student's saved assignment info
-
-        Returns
-        -------
-        None
-
-        Raises
-        -------
-        KeyError
-            If document in database does not contain 'assignments' key
-        IndexError
-            If markObj.assignmentList has a size of 0
-        KeyError
-            If existingAssignment does not contain a category name as a key
-        KeyError
-            If existingAssignment does not contain a 'adjusted weighting' as a key
-        KeyError
-            If existingAssignment does not contain a 'weighting' as a key
-        '''
-        self.clearBottomFrame()
-        self.bottomFrame.grid_columnconfigure(0, weight=1)
-        self.title(assignmentName)
-        self.studentManageBtn.destroy()
-        self.assignmentManageBtn.destroy()
-        if assignmentType == 'Course':
-            self.courseManageBtn.config(text = 'Return to '+courseName, command = lambda:self.courseClicked(courseName))
-            self.categoryManageBtn = Button(self.topFrame, text='Manage Categories', height=1, width=14,command=lambda: ManageScreen(self, 'Category', self.currentAccount, courseName, assignmentName))
-            self.categoryManageBtn.grid(column = 0,row =0)
-            query = {'course name':courseName}
-            database= 'GradebookCourses'
-            Label(self.bottomFrame, text='Weighting', font=('Helvetica', 20)).grid(column=1, row=0, sticky=EW)
-        elif assignmentType == 'Student':
-            self.courseManageBtn.config(text = 'Return to '+studentName, command = lambda:self.studentClicked(studentName, courseName))
-            query = {'course name':courseName, 'student name': studentName}
-            database= 'GradebookStudents'
-            Label(self.bottomFrame, text="Student's Marks", font=('Helvetica', 20)).grid(column=1, row=0, sticky=EW)
-
-        row = 0
-        Label(self.bottomFrame, text='Category', font=('Helvetica', 20)).grid(column=0, row=0, sticky=EW)
-        Label(self.bottomFrame, text='Total Marks', font=('Helvetica', 20)).grid(column=2, row=0, sticky=EW)
-        entries = {'assignment name':assignmentName}
-        existingAssignment = {}
-        if markObj == None:
-            try:
-                for x in Courses(self.currentAccount).docGet(query, database)['assignments']:
-                    if x['assignment name'] == assignmentName:
-                        existingAssignment = x
-                        break
-            except:
-                pass
-        else:
-            try:
-                min = 0
-                max = len(markObj.assignmentList)
-                while max>min:
-                    mid= floor((max+min)/2)
-                    if markObj.assignmentList[mid].assignmentMarks['assignment name'].lower() < assignmentName.lower():
-                        min = mid+1
-                    else:
-                        max = mid
-                if min == max and markObj.assignmentList[min].assignmentMarks['assignment name'].lower() == assignmentName.lower():
-                    existingAssignment = markObj.assignmentList[min].assignmentMarks    
-            except:
-                pass
-
-        if assignmentType == 'Course':
-            categories = Courses(self.currentAccount).docsGet('GradebookCourses', {'category':{'$exists': True}})
-            for x in sorted(categories, key = lambda y : y['category'].lower()):
-                #try:
-                row += 1
-                Label(self.bottomFrame, text = x['category'],font=('Helvetica', 10)).grid(column = 0, row = row, sticky= EW)
-                Label(self.bottomFrame, text = str(x['weighting']),font=('Helvetica', 10)).grid(column = 1, row = row, sticky= EW)
-                entries[x['category']]= StringVar()
-                try:
-                    assignmentEntry = Entry(self.bottomFrame, textvariable = entries[x['category']])
-                    assignmentEntry.grid(column = 2, row = row, sticky = EW)
-                    assignmentEntry.insert(0, existingAssignment[x['category']])
-                except:
-                    assignmentEntry.insert(0,'0')
-
-                #except:
-                #    pass
-            row+=1
-
-            Label(self.bottomFrame, text = 'Total assignment weighting',font=('Helvetica', 10)).grid(column = 0, row = row, sticky= EW)
-            entries['weighting'] = StringVar()
-            assignmentEntry = Entry(self.bottomFrame, textvariable = entries['weighting'])
-            assignmentEntry.grid(column = 1, row = row, sticky = EW)
-            assignmentEntry.insert(0, existingAssignment['weighting'])
-
-        elif assignmentType == 'Student':
-            
-
-            masterAssignment = {}
-            try:
-                for x in Courses(self.currentAccount).docGet({'course name':courseName},'GradebookCourses')['assignments']:
-                    if x['assignment name'] == assignmentName:
-                        masterAssignment = x
-                        break
-            except:
-                pass
-            for x in sorted(list(masterAssignment.keys()), key = lambda y: y.lower()):
-                if x!= 'assignment name' and x!= 'weighting' and masterAssignment[x] != '0' and masterAssignment[x] != 0:
-                    row += 1
-                    Label(self.bottomFrame, text = x,font=('Helvetica', 10)).grid(column = 0, row = row, sticky= EW)
-                    entries[x]= StringVar()
-                    try:
-                        assignmentEntry = Entry(self.bottomFrame, textvariable = entries[x])
-                        assignmentEntry.grid(column = 1, row = row, sticky = EW)
-                        assignmentEntry.insert(0, existingAssignment[x])
-                    except:
-                        assignmentEntry.insert(0,'0.0')
-                    Label(self.bottomFrame, text = masterAssignment[x],font=('Helvetica', 10)).grid(column = 2, row = row, sticky= EW)
-            row+=1
-
-            Label(self.bottomFrame, text = 'Effective assignment weighting',font=('Helvetica', 10)).grid(column = 0, row = row, sticky= EW)
-            entries['adjusted weighting'] = StringVar()
-            entries['weighting'] = StringVar()
-            try:
-                assignmentEntry = Entry(self.bottomFrame, textvariable = entries['adjusted weighting'])
-                assignmentEntry.grid(column = 1, row = row, sticky = EW)
-                assignmentEntry.insert(0, existingAssignment['adjusted weighting'])
-            except:
-                try:
-                    assignmentEntry.insert(0,existingAssignment['weighting'])
-                except:
-                    assignmentEntry.insert(0,masterAssignment['weighting'])
-            row+=1
-            Label(self.bottomFrame, text = 'Default assignment weighting',font=('Helvetica', 10)).grid(column = 0, row = row, sticky= EW)
-            assignmentEntry = Entry(self.bottomFrame, textvariable = entries['weighting'])
-            assignmentEntry.grid(column = 1, row = row, sticky = EW)
-            assignmentEntry.insert(0, masterAssignment['weighting'])
-            assignmentEntry.config(state = DISABLED)
-        self.saveStatus = Label(self.bottomFrame, text = '')
-        Button(self.bottomFrame, text = 'Save', command = lambda : self.saveAssignment(assignmentName,courseName,assignmentType,entries,studentName)).grid(column = 1, sticky =EW)
-        self.saveStatus.grid(column = 1, sticky = EW)
-
-    def saveAssignment(self, assignmentName,courseName, assignmentType, entries, studentName ='') -> None:
-        '''
-        Saves an assignment to the database
-
-        Calls on the Assignment class to save assignment marks and weightings
-
-        Parameters
-        ----------
-        assignmentName : str
-            Name of the assignment
-        courseName : str
-            Name of the course
-        assignmentType : str
-            Type of assignment
-        entires : dict
-            Marks and weightings entered into the assignment
-        studentName : str
-            Name of the student who the assignment belongs to, if applicable
-
-        Returns
-        -------
-        None
-
-        Raises
-        -------
-        AttributeError
-            If the MainScreen object (self) does not have a categoryManageBtn attribute
-
-        '''
-        saveMessage = Assignments(self.currentAccount, courseName, entries, studentName).save(assignmentType)
-        try:
-            self.categoryManageBtn.destroy()
-        except:
-            pass
-        self.assignmentClicked(assignmentName, courseName,assignmentType,studentName)
-        self.saveStatus.config(text= saveMessage)
-MainScreen().mainloop()
-'''
-Since computer memory is not unlimited, variables cannot store an infinite number information.
-This can become an issue where extremely long values cannot be stored properly, which leads to errors
-where values cant be stored or values being approximated. For example, long repeating decimals will not have an infinite number 
-of digits stored by the computer, only a certain amount will be and the number will be rounded, leading to inaccuracies
-Float max = 6-9 digits
-Double = 15-17 digits
-Int = max value typically 2^31-1 on 32 bit, but in newer python there is no hard limit, based on available memory
-String,list, etc. = 2^31 - 1 on 32 bit systems
-Long has no limit
-Byte: 8 bits, 2^8
-dict, Object = 2^31-1 bytes (~2GB) on 32 bit systems, 
+# -----------------------------------------------------------------------------
+# Name:        Gradebook Main File (main.py)
+# Purpose:     To contain the main screen of the Gradebook program
+#
+# Author:      Steven Wu
+# Created:     2019/09/05
+# Updated:     2020/02/25
+# -----------------------------------------------------------------------------
+from tkinter import *
+from courses import Courses
+from startScreen import StartScreen
+from manageScreen import ManageScreen
+from studentTotals import StudentTotals
+from assignments import Assignments
+from storageLayout import StorageLayout
+from virtualList import VirtualList
+from pageView import PageView
+from ioExecutor import IOExecutor
+from changeWatcher import ChangeWatcher
+from instrumentation import instrumentation
+#pymongo and dnspython libraries MUST BE INSTALLED
+
+class MainScreen(Tk):
+    '''
+    Object which holds the main window of the program, inherits from the TK() class.
+
+    Attributes
+    ----------
+    currentAccount : str
+        Current account username
+    topFrame : Frame
+        Frame which holds the navigation buttons
+    courseManageBtn : Button
+        Triggers the course management screen
+    courseManageCommand : function
+        Function called when the courseManageBtn is clicked
+    view : PageView
+        Scrollable area holding the bottomFrame, kept for the whole session
+    scrollCanvas : Canvas
+        Canvas which holds the bottom frame so that it is scrollable (the view's canvas)
+    bottomFrame : Frame
+        Frame which holds the main widgets of the window (the view's frame)
+    yScroll: ScrollBar
+        Vertical scroll bar (the view's scroll bar)
+    studentManageBtn : Button
+        Triggers the student management screen
+    assignmentManageBtn : Button
+        Triggers the assignment management screen
+    categoryManageBtn : Button
+        Triggers the category management screen
+    saveStatus : Label
+        Label which displays the result of trying to save an assignment
+    ioExecutor : IOExecutor
+        Runs the database operations of every screen on background threads
+    loadingLabel : Label
+        Label displayed in the bottomFrame while a page's information is being fetched
+    changeWatcher : ChangeWatcher
+        Reports the changes made to the open course by other devices, None until a course is opened
+    livePage : dict
+        Which course, student or assignment page is displayed ('page' is 'course', 'student' or
+        'assignment') and the widgets liveChange() updates, None on other pages
+
+    Methods
+    -------
+    closed() -> None
+        Stops the changeWatcher and the ioExecutor and closes the window
+    loadCourses() -> None
+        Displays existing courses as buttons
+    showCourses(coursesList : list) -> None
+        Displays the fetched courses as buttons
+    clearBottomFrame() -> None
+    	Clears the widgets of the previous page from the bottomFrame
+    setCourseManageBtn(text : str, command : function) -> None
+        Changes the text and the action of the courseManageBtn
+    showLoading() -> None
+        Displays a loading message in the bottomFrame
+    hideLoading() -> None
+        Removes the loading message from the bottomFrame
+    showRows(firstRow : int, columns : list, rows : list) -> VirtualList
+        Displays rows of buttons and labels in the bottomFrame, creating widgets only for visible rows
+    watchCourse(courseName : str) -> None
+        Makes the changeWatcher report the changes to a course
+    liveChange(change : dict) -> None
+        Updates the open page after a change reported by the changeWatcher
+    reloadLivePage() -> None
+        Fetches the open student or assignment page again and updates it in place
+    livePageLoaded(page : dict, update : function, result : tuple) -> None
+        Updates the open page with the information fetched by reloadLivePage()
+    courseClicked(courseName : str)-> None
+    	Loads the page of a specific course
+    courseRows(courseName : str, studentNames : list, assignments : list) -> list
+        Builds the rows of a course page
+    showCourse(courseName : str, studentInfo : list, assignmentInfo : dict) -> None
+        Displays the fetched students and assignments of a course
+    studentClicked(studentName : str, courseName : str)-> None
+        Loads the page of a specific student
+    loadStudent(studentName : str, courseName : str) -> tuple
+        Fetches the marks of a student and builds the rows of the student page
+    showStudent(totals : list, rows : list) -> None
+        Displays the fetched marks of a student
+    updateStudent(totals : list, rows : list) -> None
+        Changes the marks displayed on the open student page
+    assignmentClicked(assignmentName : str, courseName : str, assignmentType : str, studentName : str='', saveMessage : str = '')-> None
+    	Loads the page of a specific assignment
+    loadAssignment(assignmentName : str, courseName : str, assignmentType : str, studentName : str='') -> tuple
+        Fetches the existing marks, master copy and categories of an assignment
+    assignmentFields(assignmentType : str, existingAssignment : dict, masterAssignment : dict, categories : list) -> list
+        Returns the rows of entry boxes of an assignment page
+    showAssignment(assignmentName : str, courseName : str, assignmentType : str, studentName : str, saveMessage : str, existingAssignment : dict, masterAssignment : dict, categories : list) -> None
+        Displays the fetched assignment as entry boxes
+    updateAssignment(existingAssignment : dict, masterAssignment : dict, categories : list) -> None
+        Changes the values displayed on the open assignment page
+    saveAssignment(assignmentName : str,courseName : str, assignmentType : str, entries : str, studentName : str ='') -> None
+        Saves an assignment to the database
+    assignmentSaved(assignmentName : str, courseName : str, assignmentType : str, studentName : str, saveMessage : str) -> None
+        Reloads the page of an assignment after it was saved
+    '''
+
+    def __init__(self):
+        '''
+        Constructor for MainScreen objects
+
+        Parameters
+        ----------
+        None
+
+        '''
+
+        super().__init__()
+        self.geometry('640x360')
+        self.currentAccount = ''
+        self.ioExecutor = IOExecutor(self)
+        self.changeWatcher = None
+        self.livePage = None
+        if instrumentation.enabled:
+            self.bind_all('<F12>', lambda event: instrumentation.report())
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1,weight = 0)
+        self.topFrame = Frame(self, bg='Red')
+        self.topFrame.grid(row=0, columnspan = 2,sticky='EW')
+        self.topFrame.grid_rowconfigure(0, weight=1)
+        self.topFrame.grid_columnconfigure(0, weight=1)
+        self.topFrame.grid_columnconfigure(1, weight=1)
+        self.topFrame.grid_columnconfigure(2, weight=1)
+
+        self.view = PageView(self, 1, 0)
+        self.scrollCanvas = self.view.canvas
+        self.bottomFrame = self.view.frame
+        self.yScroll = self.view.scrollbar
+        self.clearBottomFrame()
+        self.courseManageCommand = lambda: ManageScreen(self, 'Course', self.currentAccount)
+        self.courseManageBtn = Button(self.topFrame, height=1, width=14, text='Manage Courses',command=lambda: self.courseManageCommand())
+        self.courseManageBtn.grid(column=1, row=0)
+        self.protocol('WM_DELETE_WINDOW', self.closed)
+        self.withdraw()
+        StartScreen(self)
+    def closed(self) -> None:
+        '''
+        Stops the changeWatcher and the ioExecutor and closes the window
+
+        Called when the window (or the StartScreen) is closed. Operations already running, like
+        a save, are finished first.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if self.changeWatcher is not None:
+            self.changeWatcher.stop()
+            self.changeWatcher = None
+        self.ioExecutor.shutdown()
+        self.destroy()
+    @instrumentation.screenAction
+    def loadCourses(self) -> None:
+        '''
+    	Displays existing courses as buttons
+
+        Creates a button for every course document found under the current account in the database.
+        Each button has a course name as its text and they are displayed in alphanumeric order.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        AttributeError
+            If the MainScreen object (self) does not have a studentManageBtn or assignmentManageBtn attribute
+        '''
+        self.clearBottomFrame()
+        self.title('Courses')
+
+        try:
+            self.studentManageBtn.destroy()
+            self.assignmentManageBtn.destroy()
+        except Exception as e:
+            pass
+        self.setCourseManageBtn('Manage Courses', lambda: ManageScreen(self, 'Course', self.currentAccount))
+        self.watchCourse(None)
+        self.showLoading()
+        self.ioExecutor.submit(Courses(self.currentAccount).courseSummaries, self.showCourses)
+
+    def showCourses(self, coursesList) -> None:
+        '''
+        Displays the fetched courses as buttons
+
+        Called on the Tk thread once loadCourses() has fetched the course summaries
+
+        Parameters
+        ----------
+        coursesList : list
+            List of dicts with 'course name', 'students' and 'assignments' keys
+
+        Returns
+        -------
+        None
+        '''
+        self.hideLoading()
+        rows = []
+        for x in sorted(coursesList, key=lambda y: y['course name'].lower()):
+            rows.append([{'text': x['course name'], 'command': lambda y=x: self.courseClicked(y['course name'])},
+                         {'text': str(x['students'])+'\nStudent(s)'},
+                         {'text': str(x['assignments'])+'\nAssignment(s)'}])
+        self.showRows(0, [('button', ('Helvetica', 40), 0), ('label', None, 1), ('label', None, 2)], rows)
+
+    def clearBottomFrame(self) -> None:
+        '''
+    	Clears the widgets of the previous page from the bottomFrame
+
+        The canvas, bottomFrame and scroll bar are kept (see PageView), only the widgets inside
+        the bottomFrame are destroyed. Starts a new page for the ioExecutor, so results still
+        pending for the old page are dropped.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        '''
+        self.view.clear()
+        self.loadingLabel = None
+        self.livePage = None
+        self.ioExecutor.newPage()
+
+    def setCourseManageBtn(self, text, command) -> None:
+        '''
+        Changes the text and the action of the courseManageBtn
+
+        The button is kept for the whole session and Tkinter registers a new Tcl command every
+        time a function is given to config(), which is only freed when the button is destroyed.
+        So the button keeps the command it was created with, which calls courseManageCommand.
+
+        Parameters
+        ----------
+        text : str
+            Text of the button
+        command : function
+            Function called when the button is clicked
+
+        Returns
+        -------
+        None
+        '''
+        self.courseManageCommand = command
+        self.courseManageBtn.config(text = text)
+
+    def showLoading(self) -> None:
+        '''
+        Displays a loading message in the bottomFrame
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self.loadingLabel = Label(self.bottomFrame, text = 'Loading...', font=('Helvetica', 20))
+        self.loadingLabel.grid(row = 0, column = 0, columnspan = 3, sticky = EW)
+
+    def hideLoading(self) -> None:
+        '''
+        Removes the loading message from the bottomFrame
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if self.loadingLabel is not None:
+            self.loadingLabel.destroy()
+            self.loadingLabel = None
+
+    def showRows(self, firstRow, columns, rows) -> VirtualList:
+        '''
+        Displays rows of buttons and labels in the bottomFrame, creating widgets only for visible rows
+
+        Parameters
+        ----------
+        firstRow : int
+            Grid row of the bottomFrame the rows start at
+        columns : list
+            List of (widget type, font, grid column) tuples, widget type is 'button' or 'label'
+        rows : list
+            List of rows, each a list with one cell per column. A cell is None or a dict with
+            a 'text' key and, for buttons, a 'command' key
+
+        Returns
+        -------
+        VirtualList
+            The list displaying the rows
+        '''
+        return (self.view.showRows(firstRow, columns, rows))
+
+    def watchCourse(self, courseName) -> None:
+        '''
+        Makes the changeWatcher report the changes to a course
+
+        The changeWatcher is started for the current account the first time a course is watched
+
+        Parameters
+        ----------
+        courseName : str
+            Name of the course, nothing is watched if None
+
+        Returns
+        -------
+        None
+        '''
+        if self.changeWatcher is not None and self.changeWatcher.username != self.currentAccount:
+            self.changeWatcher.stop()
+            self.changeWatcher = None
+        if self.changeWatcher is None:
+            if courseName is None:
+                return
+            # The changes arrive on the watcher's thread, so they are handed to the Tk thread
+            self.changeWatcher = ChangeWatcher(self.currentAccount, lambda change: self.ioExecutor.post(self.liveChange, (change,)))
+            self.changeWatcher.start()
+        self.changeWatcher.setScope(courseName)
+
+    def liveChange(self, change) -> None:
+        '''
+        Updates the open page after a change reported by the changeWatcher
+
+        Only the rows, labels and entry boxes affected by the change are updated. The course list
+        is displayed if the open course was deleted and the course page if the open student was.
+
+        Parameters
+        ----------
+        change : dict
+            The change (see ChangeWatcher)
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        AttributeError
+            If the MainScreen object (self) does not have a categoryManageBtn attribute
+        '''
+        page = self.livePage
+        # Pages still loading will display the change when they are shown
+        if page is None or 'loaded' not in page or change['course name'] not in (None, page['course name']):
+            return
+        fromStudents = change['database'] == 'GradebookStudents'
+        if not fromStudents and change['category'] is None and change['operation'] == 'delete':
+            try:
+                self.categoryManageBtn.destroy()
+            except:
+                pass
+            self.loadCourses()
+        elif page['page'] == 'course':
+            if fromStudents and change['operation'] in ('insert', 'delete'):
+                page['students'] = [x for x in page['students'] if x != change['student name']]
+                if change['operation'] == 'insert':
+                    page['students'].append(change['student name'])
+            elif not fromStudents and change['category'] is None and change['document'] is not None:
+                page['assignments'] = change['document'].get('assignments', [])
+            else:
+                return
+            page['list'].setRows(self.courseRows(page['course name'], page['students'], page['assignments']))
+        elif fromStudents and (change['student name'] != page['student name'] or page.get('assignment type') == 'Course'):
+            return
+        elif fromStudents and change['operation'] == 'delete':
+            self.courseClicked(page['course name'])
+        # Student assignment pages show the total marks from the course document, not the categories
+        elif change['category'] is None or page.get('assignment type') != 'Student':
+            self.reloadLivePage()
+
+    def reloadLivePage(self) -> None:
+        '''
+        Fetches the open student or assignment page again and updates it in place
+
+        Changes reported while the page is being fetched are fetched together afterwards
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        page = self.livePage
+        if page.get('reloading'):
+            page['stale'] = True
+            return
+        page['reloading'] = True
+        page['stale'] = False
+        if page['page'] == 'student':
+            self.ioExecutor.submit(self.loadStudent, lambda result: self.livePageLoaded(page, self.updateStudent, result), (page['student name'], page['course name']))
+        else:
+            self.ioExecutor.submit(self.loadAssignment, lambda result: self.livePageLoaded(page, self.updateAssignment, result),
+                                   (page['assignment name'], page['course name'], page['assignment type'], page['student name']))
+
+    def livePageLoaded(self, page, update, result) -> None:
+        '''
+        Updates the open page with the information fetched by reloadLivePage()
+
+        Parameters
+        ----------
+        page : dict
+            The livePage that was fetched
+        update : function
+            updateStudent() or updateAssignment()
+        result : tuple
+            The result of loadStudent() or loadAssignment()
+
+        Returns
+        -------
+        None
+        '''
+        page['reloading'] = False
+        update(*result)
+        # update() reopens assignment pages whose entry boxes changed, which starts a new livePage
+        if page['stale'] and page is self.livePage:
+            self.reloadLivePage()
+
+    @instrumentation.screenAction
+    def courseClicked(self, courseName) -> None:
+        '''
+    	Loads the page of a specific course
+
+        Displays the students, assignments and assignment weightings in the course
+
+        Parameters
+        ----------
+        courseName : str
+            Name of the course
+
+        Returns
+        -------
+        None
+        
+        Raises
+        -------
+        AttributeError
+            If the MainScreen object (self) does not have a categoryManageBtn attribute
+        '''
+
+        self.clearBottomFrame()
+        try:
+            self.categoryManageBtn.destroy()
+        except Exception as e:
+            pass
+        self.title(courseName)
+        self.setCourseManageBtn('Return to courses', self.loadCourses)
+        self.studentManageBtn = Button(self.topFrame, text='Manage Students ', height=1, width=14,command=lambda: ManageScreen(self, 'Student', self.currentAccount, courseName))
+        self.studentManageBtn.grid(column=0, row=0)
+        self.assignmentManageBtn = Button(self.topFrame, text='Manage Assignments', height=1, width=14,command=lambda: ManageScreen(self, 'Assignment', self.currentAccount, courseName))
+        self.assignmentManageBtn.grid(column=2, row=0)
+        self.livePage = {'page': 'course', 'course name': courseName}
+        self.watchCourse(courseName)
+        self.showLoading()
+        courseObj = Courses(self.currentAccount)
+        self.ioExecutor.submit(lambda: (courseObj.docsGet('GradebookStudents',{'course name':courseName}, {'student name': 1}),
+                                        courseObj.docGet({'course name':courseName}, 'GradebookCourses', {'assignments.assignment name': 1, 'assignments.weighting': 1})),
+                               lambda result: self.showCourse(courseName, *result))
+
+    def courseRows(self, courseName, studentNames, assignments) -> list:
+        '''
+        Builds the rows of a course page
+
+        Parameters
+        ----------
+        courseName : str
+            Name of the course
+        studentNames : list
+            Names of the course's students
+        assignments : list
+            The course's assignments (each with its 'assignment name' and 'weighting')
+
+        Returns
+        -------
+        list
+            Rows of the course page's virtual list
+        '''
+        studentCells = []
+        for x in sorted(studentNames, key = lambda y: y.lower()):
+            studentCells.append({'text': x, 'command': lambda y = x: self.studentClicked(y,courseName)})
+        assignmentCells = []
+        try:
+            for x in sorted(assignments, key = lambda y: y['assignment name'].lower()):
+                assignmentCells.append([{'text': x['assignment name'], 'command': lambda y = x: self.assignmentClicked(y['assignment name'],courseName, 'Course')},
+                                        {'text': x['weighting']}])
+        except:
+            pass
+        # Students and assignments are independent columns, so the shorter column is padded with empty cells
+        rows = []
+        for x in range(max(len(studentCells), len(assignmentCells))):
+            studentCell = studentCells[x] if x < len(studentCells) else None
+            assignmentCell = assignmentCells[x] if x < len(assignmentCells) else [None, None]
+            rows.append([studentCell] + assignmentCell)
+        return (rows)
+
+    def showCourse(self, courseName, studentInfo, assignmentInfo) -> None:
+        '''
+        Displays the fetched students and assignments of a course
+
+        Called on the Tk thread once courseClicked() has fetched the course's documents
+
+        Parameters
+        ----------
+        courseName : str
+            Name of the course
+        studentInfo : list
+            The course's student documents (student names only)
+        assignmentInfo : dict
+            The course's document (assignment names and weightings only)
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        KeyError
+            If the document in 'GradebookCourses' does not have an 'assignments' key
+        '''
+        self.hideLoading()
+        Label(self.bottomFrame, text = 'Students').grid(row = 0, column = 0, sticky= EW)
+        Label(self.bottomFrame, text = 'Assignments').grid(row = 0, column = 1, sticky= EW)
+        Label(self.bottomFrame, text='Weightings').grid(row=0, column=2, sticky=EW)
+        studentNames = [x['student name'] for x in studentInfo]
+        assignments = (assignmentInfo or {}).get('assignments', [])
+        virtualList = self.showRows(1, [('button', ('Helvetica', 40), 0), ('button', ('Helvetica', 40), 1), ('label', ('Helvetica', 40), 2)],
+                                    self.courseRows(courseName, studentNames, assignments))
+        self.livePage.update({'loaded': True, 'students': studentNames, 'assignments': assignments, 'list': virtualList})
+
+    @instrumentation.screenAction
+    def studentClicked(self, studentName, courseName)-> None:
+        '''
+    	Loads the page of a specific student
+
+        Displays the student's assignments, assignment weightings and marks in the specified course
+
+        Parameters
+        ----------
+        studentName : str
+            Name of the student
+        courseName : str
+            Name of the course
+
+        Returns
+        -------
+        None
+        '''
+        self.clearBottomFrame()
+        self.title(studentName)
+        self.studentManageBtn.destroy()
+        self.assignmentManageBtn.destroy()
+        self.setCourseManageBtn('Return to '+courseName, lambda:self.courseClicked(courseName))
+        self.livePage = {'page': 'student', 'course name': courseName, 'student name': studentName}
+        self.watchCourse(courseName)
+        self.showLoading()
+        self.ioExecutor.submit(self.loadStudent, lambda result: self.showStudent(*result), (studentName, courseName))
+
+    def loadStudent(self, studentName, courseName) -> tuple:
+        '''
+        Fetches the marks of a student and builds the rows of the student page
+
+        The totals and assignment marks saved in the student's document (see StudentTotals) are read
+        with a single query. Runs on an ioExecutor thread, so it does not create any widgets
+
+        Parameters
+        ----------
+        studentName : str
+            Name of the student
+        courseName : str
+            Name of the course
+
+        Returns
+        -------
+        tuple
+            The [default mark, adjusted mark] texts and the rows of the assignment list
+        '''
+        summary = StudentTotals(self.currentAccount, courseName).read(studentName)
+        if summary is None:
+            return (['N/A', 'N/A'], [])
+        totals = []
+        for x in StudentTotals.totalMarks(summary):
+            totals.append('N/A' if x is None else str(round(x,2)))
+
+        rows = []
+        for x in sorted(summary['results'], key = lambda y:y['assignment name'].lower()):
+            assignmentCell = {'text': x['assignment name'], 'command': lambda y = x: self.assignmentClicked(y['assignment name'],courseName, 'Student', studentName)}
+            if x['mark'] is None:
+                markText = 'N/A'
+                weightingText = '0'
+            else:
+                markText = str(round(x['mark'],2))
+                weightingText = str(round(x['adjusted weighting'],2))
+            rows.append([assignmentCell, {'text': weightingText}, {'text': markText}])
+        return (totals, rows)
+
+    def showStudent(self, totals, rows) -> None:
+        '''
+        Displays the fetched marks of a student
+
+        Called on the Tk thread once loadStudent() has finished
+
+        Parameters
+        ----------
+        totals : list
+            The default and adjusted mark texts
+        rows : list
+            Rows of the assignment list
+
+        Returns
+        -------
+        None
+        '''
+        self.hideLoading()
+        Label(self.bottomFrame, text = 'Default Mark(%)').grid(row = 0, column = 1, sticky= EW)
+        Label(self.bottomFrame, text = 'Adjusted Mark(%)').grid(row = 0, column = 2, sticky= EW)
+        Label(self.bottomFrame, text='Total Mark', font=('Helvetica', 40)).grid(row = 1,column=0, sticky='EW')
+        totalLabels = [Label(self.bottomFrame, text=totals[0], font=('Helvetica', 40)), Label(self.bottomFrame, text=totals[1], font=('Helvetica', 40))]
+        totalLabels[0].grid(row = 1,column=1, sticky='EW')
+        totalLabels[1].grid(row = 1,column=2, sticky='EW')
+        Label(self.bottomFrame, text = 'Assignments').grid(row = 2, column = 0, sticky= EW)
+        Label(self.bottomFrame, text = 'Effective Weighting').grid(row = 2, column = 1, sticky= EW)
+        Label(self.bottomFrame, text = 'Mark(%)').grid(row = 2, column = 2, sticky= EW)
+        virtualList = self.showRows(3, [('button', ('Helvetica', 40), 0), ('label', ('Helvetica', 40), 1), ('label', ('Helvetica', 40), 2)], rows)
+        self.livePage.update({'loaded': True, 'totals': totalLabels, 'list': virtualList})
+
+    def updateStudent(self, totals, rows) -> None:
+        '''
+        Changes the marks displayed on the open student page
+
+        Called on the Tk thread once reloadLivePage() has fetched the student again
+
+        Parameters
+        ----------
+        totals : list
+            The default and adjusted mark texts
+        rows : list
+            Rows of the assignment list
+
+        Returns
+        -------
+        None
+        '''
+        for label, text in zip(self.livePage['totals'], totals):
+            label.config(text = text)
+        self.livePage['list'].setRows(rows)
+    @instrumentation.screenAction
+    def assignmentClicked(self, assignmentName, courseName, assignmentType, studentName='', saveMessage = '')-> None:
+        '''
+    	Loads the page of a specific assignment
+
+        Displays and allows for editing of course wide master assignments (which contain the total marks, weightings, etc.) 
+        as well as student specific assignment results.
+
+        Parameters
+        ----------
+        assignmentName : str
+            Name of the assignment
+        courseName : str
+            Name of the course
+        assignmentType : str
+            Type of assignment clicked
+        studentName : str, optional
+            Name of the student who the assignment belongs to, if applicable
+        saveMessage : str, optional
+            Result of the save that reloaded the page, if applicable
+
+        Returns
+        -------
+        None
+        '''
+        self.clearBottomFrame()
+        self.bottomFrame.grid_columnconfigure(0, weight=1)
+        self.title(assignmentName)
+        self.studentManageBtn.destroy()
+        self.assignmentManageBtn.destroy()
+        if assignmentType == 'Course':
+            self.setCourseManageBtn('Return to '+courseName, lambda:self.courseClicked(courseName))
+            self.categoryManageBtn = Button(self.topFrame, text='Manage Categories', height=1, width=14,command=lambda: ManageScreen(self, 'Category', self.currentAccount, courseName, assignmentName))
+            self.categoryManageBtn.grid(column = 0,row =0)
+        elif assignmentType == 'Student':
+            self.setCourseManageBtn('Return to '+studentName, lambda:self.studentClicked(studentName, courseName))
+        self.livePage = {'page': 'assignment', 'course name': courseName, 'assignment type': assignmentType, 'student name': studentName, 'assignment name': assignmentName}
+        self.watchCourse(courseName)
+        self.showLoading()
+        self.ioExecutor.submit(self.loadAssignment, lambda result: self.showAssignment(assignmentName, courseName, assignmentType, studentName, saveMessage, *result),
+                               (assignmentName, courseName, assignmentType, studentName))
+
+    def loadAssignment(self, assignmentName, courseName, assignmentType, studentName='') -> tuple:
+        '''
+        Fetches the existing marks, master copy and categories of an assignment
+
+        Runs on an ioExecutor thread, so it does not create any widgets
+
+        Parameters
+        ----------
+        assignmentName : str
+            Name of the assignment
+        courseName : str
+            Name of the course
+        assignmentType : str
+            Type of assignment clicked
+        studentName : str, optional
+            Name of the student who the assignment belongs to, if applicable
+
+        Returns
+        -------
+        tuple
+            The saved assignment, the course's master copy of the assignment (student assignments only)
+            and the category documents (course assignments only)
+
+        Raises
+        -------
+        KeyError
+            If document in database does not contain 'assignments' key
+        '''
+        if assignmentType == 'Course':
+            query = {'course name':courseName}
+            database= 'GradebookCourses'
+        else:
+            query = {'course name':courseName, 'student name': studentName}
+            database= 'GradebookStudents'
+        existingAssignment = {}
+        try:
+            for x in Courses(self.currentAccount).docGet(query, database, {'assignments': {'$elemMatch': {'assignment name': assignmentName}}})['assignments']:
+                if x['assignment name'] == assignmentName:
+                    existingAssignment = x
+                    break
+        except:
+            pass
+
+        masterAssignment = {}
+        categories = []
+        if assignmentType == 'Course':
+            categories = Courses(self.currentAccount).docsGet('GradebookCourses', {'category':{'$exists': True}}, {'category': 1, 'weighting': 1})
+        elif assignmentType == 'Student':
+            try:
+                for x in Courses(self.currentAccount).docGet({'course name':courseName},'GradebookCourses', {'assignments': {'$elemMatch': {'assignment name': assignmentName}}})['assignments']:
+                    if x['assignment name'] == assignmentName:
+                        masterAssignment = x
+                        break
+            except:
+                pass
+            if not StorageLayout.isCurrent(existingAssignment, masterAssignment):
+                existingAssignment = {x: existingAssignment[x] for x in existingAssignment if x != 'adjusted weighting'}
+        return (existingAssignment, masterAssignment, categories)
+
+    def assignmentFields(self, assignmentType, existingAssignment, masterAssignment, categories) -> list:
+        '''
+        Returns the rows of entry boxes of an assignment page
+
+        Course assignments have a row for every category and the assignment weighting. Student
+        assignments have a row for every category the assignment is marked in, the effective
+        weighting and the default weighting.
+
+        Parameters
+        ----------
+        assignmentType : str
+            Type of assignment
+        existingAssignment : dict
+            The saved assignment
+        masterAssignment : dict
+            The course's master copy of the assignment (student assignments only)
+        categories : list
+            The category documents (course assignments only)
+
+        Returns
+        -------
+        list
+            (key in the assignment, label text, entry box text, text of the label beside the
+            entry box or None) tuples, in the order they are displayed
+
+        Raises
+        -------
+        KeyError
+            If existingAssignment does not contain a 'weighting' as a key (course assignments)
+        KeyError
+            If masterAssignment does not contain a 'weighting' as a key (student assignments)
+        '''
+        fields = []
+        if assignmentType == 'Course':
+            for x in sorted(categories, key = lambda y : y['category'].lower()):
+                fields.append((x['category'], x['category'], existingAssignment.get(x['category'], '0'), str(x['weighting'])))
+            fields.append(('weighting', 'Total assignment weighting', existingAssignment['weighting'], None))
+        elif assignmentType == 'Student':
+            for x in sorted(list(masterAssignment.keys()), key = lambda y: y.lower()):
+                if x!= 'assignment name' and x!= 'weighting' and x!= 'revision' and masterAssignment[x] != '0' and masterAssignment[x] != 0:
+                    fields.append((x, x, existingAssignment.get(x, '0.0'), str(masterAssignment[x])))
+            effectiveWeighting = existingAssignment.get('adjusted weighting', existingAssignment.get('weighting', masterAssignment['weighting']))
+            fields.append(('adjusted weighting', 'Effective assignment weighting', effectiveWeighting, None))
+            fields.append(('weighting', 'Default assignment weighting', masterAssignment['weighting'], None))
+        return (fields)
+
+    def showAssignment(self, assignmentName, courseName, assignmentType, studentName, saveMessage, existingAssignment, masterAssignment, categories) -> None:
+        '''
+        Displays the fetched assignment as entry boxes
+
+        Called on the Tk thread once loadAssignment() has finished
+
+        Parameters
+        ----------
+        assignmentName : str
+            Name of the assignment
+        courseName : str
+            Name of the course
+        assignmentType : str
+            Type of assignment clicked
+        studentName : str
+            Name of the student who the assignment belongs to, if applicable
+        saveMessage : str
+            Result of the save that reloaded the page, if applicable
+        existingAssignment : dict
+            The saved assignment
+        masterAssignment : dict
+            The course's master copy of the assignment (student assignments only)
+        categories : list
+            The category documents (course assignments only)
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        KeyError
+            If existingAssignment does not contain a 'weighting' as a key (course assignments)
+        KeyError
+            If masterAssignment does not contain a 'weighting' as a key (student assignments)
+        '''
+        self.hideLoading()
+        if assignmentType == 'Course':
+            Label(self.bottomFrame, text='Weighting', font=('Helvetica', 20)).grid(column=1, row=0, sticky=EW)
+        elif assignmentType == 'Student':
+            Label(self.bottomFrame, text="Student's Marks", font=('Helvetica', 20)).grid(column=1, row=0, sticky=EW)
+
+        Label(self.bottomFrame, text='Category', font=('Helvetica', 20)).grid(column=0, row=0, sticky=EW)
+        Label(self.bottomFrame, text='Total Marks', font=('Helvetica', 20)).grid(column=2, row=0, sticky=EW)
+        entries = {'assignment name':assignmentName}
+        shown = {}
+        besides = {}
+        # Course assignments show the category weighting before the entry box, student assignments show the total marks after it
+        entryColumn = 2 if assignmentType == 'Course' else 1
+        fields = self.assignmentFields(assignmentType, existingAssignment, masterAssignment, categories)
+        for row, (key, labelText, entryText, besideText) in enumerate(fields, 1):
+            Label(self.bottomFrame, text = labelText,font=('Helvetica', 10)).grid(column = 0, row = row, sticky= EW)
+            entries[key] = StringVar()
+            assignmentEntry = Entry(self.bottomFrame, textvariable = entries[key])
+            assignmentEntry.grid(column = 1 if besideText is None else entryColumn, row = row, sticky = EW)
+            assignmentEntry.insert(0, entryText)
+            if besideText is not None:
+                besides[key] = Label(self.bottomFrame, text = besideText,font=('Helvetica', 10))
+                besides[key].grid(column = 3 - entryColumn, row = row, sticky= EW)
+            if assignmentType == 'Student' and key == 'weighting':
+                assignmentEntry.config(state = DISABLED)
+            shown[key] = entries[key].get()
+        self.saveStatus = Label(self.bottomFrame, text = saveMessage)
+        Button(self.bottomFrame, text = 'Save', command = lambda : self.saveAssignment(assignmentName,courseName,assignmentType,entries,studentName)).grid(column = 1, sticky =EW)
+        self.saveStatus.grid(column = 1, sticky = EW)
+        self.livePage.update({'loaded': True, 'keys': [x[0] for x in fields], 'entries': entries, 'shown': shown, 'besides': besides})
+
+    def updateAssignment(self, existingAssignment, masterAssignment, categories) -> None:
+        '''
+        Changes the values displayed on the open assignment page
+
+        Called on the Tk thread once reloadLivePage() has fetched the assignment again. Entry boxes
+        the user has typed in are left alone. If rows were added or removed (i.e a category was
+        added) the page is reopened, unless the user has typed in it.
+
+        Parameters
+        ----------
+        existingAssignment : dict
+            The saved assignment
+        masterAssignment : dict
+            The course's master copy of the assignment (student assignments only)
+        categories : list
+            The category documents (course assignments only)
+
+        Returns
+        -------
+        None
+        '''
+        page = self.livePage
+        edited = [x for x in page['keys'] if page['entries'][x].get() != page['shown'][x]]
+        try:
+            fields = self.assignmentFields(page['assignment type'], existingAssignment, masterAssignment, categories)
+        except KeyError:
+            fields = None
+        if fields is None or [x[0] for x in fields] != page['keys']:
+            if edited:
+                self.saveStatus.config(text = 'Changed on another device, reopen it to see the changes')
+            else:
+                self.assignmentSaved(page['assignment name'], page['course name'], page['assignment type'], page['student name'], 'Changed on another device')
+            return
+        changed = False
+        for key, labelText, entryText, besideText in fields:
+            if key in page['besides'] and page['besides'][key].cget('text') != besideText:
+                page['besides'][key].config(text = besideText)
+                changed = True
+            if str(entryText) != page['shown'][key] and key not in edited:
+                page['entries'][key].set(str(entryText))
+                page['shown'][key] = str(entryText)
+                changed = True
+        if changed:
+            self.saveStatus.config(text = 'Updated from another device')
+
+    @instrumentation.screenAction
+    def saveAssignment(self, assignmentName,courseName, assignmentType, entries, studentName ='') -> None:
+        '''
+        Saves an assignment to the database
+
+        Calls on the Assignment class to save assignment marks and weightings on an ioExecutor
+        thread, then reloads the page with assignmentSaved()
+
+        Parameters
+        ----------
+        assignmentName : str
+            Name of the assignment
+        courseName : str
+            Name of the course
+        assignmentType : str
+            Type of assignment
+        entires : dict
+            Marks and weightings entered into the assignment
+        studentName : str
+            Name of the student who the assignment belongs to, if applicable
+
+        Returns
+        -------
+        None
+
+        '''
+        # The entries are read here because StringVars can only be used on the Tk thread
+        values = {}
+        for x in entries.keys():
+            values[x] = entries[x] if x == 'assignment name' else entries[x].get()
+        self.saveStatus.config(text = 'Saving...')
+        self.ioExecutor.submit(Assignments(self.currentAccount, courseName, values, studentName).save, lambda saveMessage: self.assignmentSaved(assignmentName, courseName, assignmentType, studentName, saveMessage), (assignmentType,))
+
+    def assignmentSaved(self, assignmentName, courseName, assignmentType, studentName, saveMessage) -> None:
+        '''
+        Reloads the page of an assignment after it was saved
+
+        Parameters
+        ----------
+        assignmentName : str
+            Name of the assignment
+        courseName : str
+            Name of the course
+        assignmentType : str
+            Type of assignment
+        studentName : str
+            Name of the student who the assignment belongs to, if applicable
+        saveMessage : str
+            Result of the save
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        AttributeError
+            If the MainScreen object (self) does not have a categoryManageBtn attribute
+        '''
+        try:
+            self.categoryManageBtn.destroy()
+        except:
+            pass
+        self.assignmentClicked(assignmentName, courseName,assignmentType,studentName, saveMessage = saveMessage)
+if __name__ == '__main__':
+    MainScreen().mainloop()
+'''
+Since computer memory is not unlimited, variables cannot store an infinite number information.
+This can become an issue where extremely long values cannot be stored properly, which leads to errors
+where values cant be stored or values being approximated. For example, long repeating decimals will not have an infinite number 
+of digits stored by the computer, only a certain amount will be and the number will be rounded, leading to inaccuracies
+Float max = 6-9 digits
+Double = 15-17 digits
+Int = max value typically 2^31-1 on 32 bit, but in newer python there is no hard limit, based on available memory
+String,list, etc. = 2^31 - 1 on 32 bit systems
+Long has no limit
+Byte: 8 bits, 2^8
+dict, Object = 2^31-1 bytes (~2GB) on 32 bit systems, 
 '''
\ No newline at end of file
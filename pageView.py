@@ -0,0 +1,144 @@
+#-----------------------------------------------------------------------------
+# Name:        pageView (pageView.py)
+# Purpose:     To hold the scrollable area of the main screen which every page
+#              is displayed in
+#
+# Author:      Steven Wu
+# Created:     2020/02/23
+# Updated:     2020/02/23
+#-----------------------------------------------------------------------------
+
+from tkinter import *
+from virtualList import VirtualList
+
+class PageView():
+    '''
+    Object which holds the scrollable canvas, frame and scroll bar the MainScreen's pages are displayed in
+
+    The canvas, frame and scroll bar are created once and kept for the whole session. Changing
+    pages destroys the widgets of the old page inside the frame (which frees the Tcl commands of
+    their buttons and bindings) and sets the frame's grid back to its default columns, instead of
+    building a new canvas and leaving the old one behind.
+
+    Attributes
+    ----------
+    master : Tk
+        Window the view is displayed in (the MainScreen)
+    canvas : Canvas
+        Canvas which holds the frame so that it is scrollable
+    frame : Frame
+        Frame which holds the widgets of the page (the MainScreen's bottomFrame)
+    scrollbar : Scrollbar
+        Vertical scroll bar
+    virtualLists : list
+        VirtualList objects displayed in the frame, refreshed when the canvas scrolls
+
+    Methods
+    -------
+    clear() -> None
+        Removes the widgets of the current page
+    scrolled(first : str, last : str) -> None
+        Updates the scroll bar and the visible rows of the virtual lists
+    showRows(firstRow : int, columns : list, rows : list) -> VirtualList
+        Displays rows of buttons and labels in the frame, creating widgets only for visible rows
+    '''
+
+    columnWeights = (2, 1, 1)
+
+    def __init__(self, master, row, column):
+        '''
+        Constructor to build a PageView object
+
+        Parameters
+        ----------
+        master : Tk
+            Window the view is displayed in
+        row : int
+            Grid row of the master the canvas is displayed in
+        column : int
+            Grid column of the master the canvas is displayed in, the scroll bar is in the next one
+        '''
+        self.master = master
+        self.virtualLists = []
+        self.canvas = Canvas(master)
+        self.canvas.grid(row = row, column = column, sticky = 'NSEW')
+        self.frame = Frame(self.canvas)
+        self._window = self.canvas.create_window((0,0), window = self.frame, anchor = 'nw')
+        self.scrollbar = Scrollbar(master, orient = 'vertical', command = self.canvas.yview)
+        self.scrollbar.grid(row = row, column = column + 1, sticky = NS)
+        self.canvas.configure(yscrollcommand = self.scrolled)
+
+        self.frame.bind('<Configure>', lambda event: self.canvas.configure(scrollregion = self.canvas.bbox('all')))
+        self.canvas.bind('<Configure>', lambda event: self.canvas.itemconfig(self._window, width = event.width))
+        self.canvas.bind_all('<MouseWheel>', lambda event: self.canvas.yview_scroll(int(-1 * (event.delta / 120)), 'units'))
+        self._resetGrid()
+
+    def _resetGrid(self) -> None:
+        # Pages change the weights of the frame's columns (i.e the assignment page), so every used column is set back
+        columns, rows = self.frame.grid_size()
+        for x in range(max(columns, len(self.columnWeights))):
+            self.frame.grid_columnconfigure(x, weight = self.columnWeights[x] if x < len(self.columnWeights) else 0, minsize = 0)
+        for x in range(rows):
+            self.frame.grid_rowconfigure(x, weight = 0, minsize = 0)
+
+    def clear(self) -> None:
+        '''
+        Removes the widgets of the current page
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self.virtualLists = []
+        for widget in self.frame.winfo_children():
+            widget.destroy()
+        self._resetGrid()
+        self.canvas.yview_moveto(0)
+
+    def scrolled(self, first, last) -> None:
+        '''
+        Updates the scroll bar and the visible rows of the virtual lists
+
+        Called by the canvas whenever its view changes
+
+        Parameters
+        ----------
+        first : str
+            Fraction of the canvas above the view
+        last : str
+            Fraction of the canvas above the bottom of the view
+
+        Returns
+        -------
+        None
+        '''
+        self.scrollbar.set(first, last)
+        for x in self.virtualLists:
+            x.refresh()
+
+    def showRows(self, firstRow, columns, rows) -> VirtualList:
+        '''
+        Displays rows of buttons and labels in the frame, creating widgets only for visible rows
+
+        Parameters
+        ----------
+        firstRow : int
+            Grid row of the frame the rows start at
+        columns : list
+            List of (widget type, font, grid column) tuples, widget type is 'button' or 'label'
+        rows : list
+            List of rows, each a list with one cell per column. A cell is None or a dict with
+            a 'text' key and, for buttons, a 'command' key
+
+        Returns
+        -------
+        VirtualList
+            The list displaying the rows
+        '''
+        virtualList = VirtualList(self.frame, self.canvas, firstRow, columns, rows)
+        self.virtualLists.append(virtualList)
+        return (virtualList)
@@ -0,0 +1,186 @@
+#-----------------------------------------------------------------------------
+# Name:        reportCards (reportCards.py)
+# Purpose:     To calculate the marks of every student of an account at once and
+#              write them to a CSV or JSON file
+#
+# Author:      Steven Wu
+# Created:     2020/02/12
+# Updated:     2020/02/12
+#-----------------------------------------------------------------------------
+# Usage: python reportCards.py username [--format csv|json] [--output file] [--workers n]
+# Fetches the account's documents with one query per collection, grades the
+# students on a pool of processes and writes one report for the whole account.
+
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from connectionManager import ConnectionManager
+from gradingContext import GradingContext
+from marks import Marks
+
+def gradeStudents(username, courseDoc, weightings, studentDocs) -> list:
+    '''
+    Calculates the report cards of students of one course
+
+    Runs in a worker process, so it only uses the documents it is given
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    courseDoc : dict
+        The course's 'GradebookCourses' document
+    weightings : dict
+        Category names mapped to their weightings
+    studentDocs : list
+        The students' 'GradebookStudents' documents
+
+    Returns
+    -------
+    list
+        List of dicts with the 'course name', 'student name', 'default mark', 'adjusted mark'
+        and 'assignments' (assignment names mapped to marks) of each student. A mark is None
+        where Marks or Assignments would raise an error.
+    '''
+    context = GradingContext(username, courseDoc['course name'], courseDoc, weightings)
+    reportCards = []
+    for studentDoc in studentDocs:
+        markObj = Marks(username, courseDoc['course name'], studentDoc['student name'], studentDoc, context)
+        markObj.defaultSort()
+        reportCard = {'course name': courseDoc['course name'], 'student name': studentDoc['student name'], 'assignments': {}}
+        for key, total in (('default mark', markObj.totalMark), ('adjusted mark', markObj.totalMarkAdjusted)):
+            try:
+                reportCard[key] = total()
+            except ZeroDivisionError:
+                reportCard[key] = None
+        for x in markObj.assignmentList:
+            try:
+                reportCard['assignments'][x.assignmentMarks['assignment name']] = x.calculate()[0]
+            except (ZeroDivisionError, KeyError):
+                reportCard['assignments'][x.assignmentMarks['assignment name']] = None
+        reportCards.append(reportCard)
+    return (reportCards)
+
+def fetchAccount(username) -> list:
+    '''
+    Fetches every course, category and student document of an account
+
+    Parameters
+    ----------
+    username : str
+        Account username
+
+    Returns
+    -------
+    list
+        [course documents, category names mapped to weightings, course names mapped to lists of student documents]
+    '''
+    client = ConnectionManager.getClient()
+    courseDocs = []
+    weightings = {}
+    for x in client['GradebookCourses'][username].find({}, {'_id': 0}):
+        if 'course name' in x:
+            courseDocs.append(x)
+        elif 'category' in x:
+            weightings[x['category']] = x['weighting']
+    studentDocs = {}
+    for x in client['GradebookStudents'][username].find({}, {'_id': 0}):
+        studentDocs.setdefault(x.get('course name'), []).append(x)
+    return ([courseDocs, weightings, studentDocs])
+
+def generate(username, workers = None, chunkSize = 200) -> list:
+    '''
+    Calculates the report cards of every student of an account
+
+    The account is fetched once, then each course (split into chunks of students) is graded
+    in a separate process
+
+    Parameters
+    ----------
+    username : str
+        Account username
+    workers : int, optional
+        Number of processes, defaults to the number of processors
+    chunkSize : int, optional
+        Largest number of students graded by one task, defaults to 200
+
+    Returns
+    -------
+    list
+        The report cards returned by gradeStudents(), sorted by course and student name
+    '''
+    courseDocs, weightings, studentDocs = fetchAccount(username)
+    tasks = []
+    for courseDoc in courseDocs:
+        students = studentDocs.get(courseDoc['course name'], [])
+        for x in range(0, len(students), chunkSize):
+            tasks.append((username, courseDoc, weightings, students[x:x+chunkSize]))
+    reportCards = []
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        for x in executor.map(gradeStudents, *zip(*tasks)) if tasks else []:
+            reportCards.extend(x)
+    reportCards.sort(key = lambda y: (y['course name'].lower(), y['student name'].lower()))
+    return (reportCards)
+
+def writeCSV(reportCards, file) -> None:
+    '''
+    Writes report cards as CSV, one row per total or assignment mark
+
+    Parameters
+    ----------
+    reportCards : list
+        Report cards returned by generate()
+    file : file
+        Open text file to write to
+
+    Returns
+    -------
+    None
+    '''
+    writer = csv.writer(file)
+    writer.writerow(['course name', 'student name', 'type', 'assignment name', 'mark'])
+    for x in reportCards:
+        writer.writerow([x['course name'], x['student name'], 'default total', '', x['default mark']])
+        writer.writerow([x['course name'], x['student name'], 'adjusted total', '', x['adjusted mark']])
+        for assignmentName, mark in x['assignments'].items():
+            writer.writerow([x['course name'], x['student name'], 'assignment', assignmentName, mark])
+
+def writeJSON(reportCards, file) -> None:
+    '''
+    Writes report cards as JSON, nested by course and student name
+
+    Parameters
+    ----------
+    reportCards : list
+        Report cards returned by generate()
+    file : file
+        Open text file to write to
+
+    Returns
+    -------
+    None
+    '''
+    courses = {}
+    for x in reportCards:
+        courses.setdefault(x['course name'], {})[x['student name']] = {'default mark': x['default mark'], 'adjusted mark': x['adjusted mark'], 'assignments': x['assignments']}
+    json.dump(courses, file, indent = 2)
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = 'Writes the marks of every student of an account')
+    parser.add_argument('username')
+    parser.add_argument('--format', choices = ['csv', 'json'], default = 'csv')
+    parser.add_argument('--output', help = 'file to write to, defaults to standard output')
+    parser.add_argument('--workers', type = int, help = 'number of processes, defaults to the number of processors')
+    options = parser.parse_args(arguments)
+    reportCards = generate(options.username, options.workers)
+    write = writeCSV if options.format == 'csv' else writeJSON
+    if options.output:
+        with open(options.output, 'w', newline = '') as file:
+            write(reportCards, file)
+    else:
+        write(reportCards, sys.stdout)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
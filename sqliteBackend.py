@@ -0,0 +1,1083 @@
+#-----------------------------------------------------------------------------
+# Name:        sqliteBackend (sqliteBackend.py)
+# Purpose:     To store the Gradebook's documents in a local SQLite file so the
+#              program can run without a MongoDB server
+#
+# Author:      Steven Wu
+# Created:     2020/02/16
+# Updated:     2020/02/16
+#-----------------------------------------------------------------------------
+# Every part of the program reaches the database through
+# ConnectionManager.getClient() and the pymongo collection methods listed in
+# SQLiteCollection, so selecting this backend with
+# ConnectionManager.configureBackend('sqlite', path) switches the whole
+# program (including the asyncio layer) to a local file.
+
+import copy
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure, WriteError
+
+_missing = object()
+
+def _isNumber(value) -> bool:
+    return (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+def _isScalar(value) -> bool:
+    return (isinstance(value, str) or _isNumber(value))
+
+def _resolve(value, parts, index = None):
+    # Yields (value, index of the array element it was found in) for every value a dotted path reaches
+    if not parts:
+        yield ((value, index))
+        return
+    if isinstance(value, dict):
+        if parts[0] in value:
+            yield from _resolve(value[parts[0]], parts[1:], index)
+    elif isinstance(value, list):
+        if parts[0].isdigit() and int(parts[0]) < len(value):
+            yield from _resolve(value[int(parts[0])], parts[1:], index)
+        for position, x in enumerate(value):
+            if isinstance(x, dict):
+                yield from _resolve(x, parts, position if index is None else index)
+
+def _equals(candidates, expected) -> list:
+    # Returns [matched, array index] for an equality condition
+    for value, index in candidates:
+        if value == expected and type(value) is not bool and type(expected) is not bool or value is expected:
+            return ([True, index])
+        if isinstance(value, list) and not isinstance(expected, list):
+            for position, x in enumerate(value):
+                if x == expected:
+                    return ([True, position if index is None else index])
+    return ([expected is None and not candidates, None])
+
+def _compare(candidates, expected, test) -> list:
+    for value, index in candidates:
+        for position, x in enumerate(value if isinstance(value, list) else [value]):
+            if (_isNumber(x) and _isNumber(expected)) or (isinstance(x, str) and isinstance(expected, str)):
+                if test(x, expected):
+                    return ([True, index if index is not None or not isinstance(value, list) else position])
+    return ([False, None])
+
+_comparisons = {'$gt': lambda x, y: x > y, '$gte': lambda x, y: x >= y,
+                '$lt': lambda x, y: x < y, '$lte': lambda x, y: x <= y}
+
+def _isOperatorDict(condition) -> bool:
+    return (isinstance(condition, dict) and len(condition) > 0 and all(x.startswith('$') for x in condition))
+
+def _matchCondition(candidates, condition) -> list:
+    if not _isOperatorDict(condition):
+        return (_equals(candidates, condition))
+    index = None
+    for operator, argument in condition.items():
+        if operator == '$eq':
+            matched, position = _equals(candidates, argument)
+        elif operator == '$ne':
+            matched, position = [not _equals(candidates, argument)[0], None]
+        elif operator == '$exists':
+            matched, position = [bool(candidates) == bool(argument), None]
+        elif operator == '$in':
+            matched, position = [False, None]
+            for x in argument:
+                matched, position = _equals(candidates, x)
+                if matched:
+                    break
+        elif operator == '$nin':
+            matched, position = [not any(_equals(candidates, x)[0] for x in argument), None]
+        elif operator in _comparisons:
+            matched, position = _compare(candidates, argument, _comparisons[operator])
+        elif operator == '$regex':
+            flags = re.IGNORECASE if 'i' in condition.get('$options', '') else 0
+            matched, position = _compare(candidates, '', lambda x, y: re.search(argument, x, flags) is not None)
+        elif operator == '$options':
+            continue
+        elif operator == '$size':
+            matched, position = [any(isinstance(x, list) and len(x) == argument for x, y in candidates), None]
+        elif operator == '$not':
+            matched, position = [not _matchCondition(candidates, argument)[0], None]
+        elif operator == '$elemMatch':
+            matched, position = [False, None]
+            for value, index2 in candidates:
+                if isinstance(value, list):
+                    for elementPosition, x in enumerate(value):
+                        if isinstance(x, dict) and not _isOperatorDict(argument):
+                            elementMatched = _match(x, argument)[0]
+                        else:
+                            elementMatched = _matchCondition([(x, None)], argument)[0]
+                        if elementMatched:
+                            matched, position = [True, elementPosition if index2 is None else index2]
+                            break
+                if matched:
+                    break
+        else:
+            raise OperationFailure('unknown operator: ' + operator)
+        if not matched:
+            return ([False, None])
+        if index is None:
+            index = position
+    return ([True, index])
+
+def _match(doc, query) -> list:
+    '''
+    Returns [if the document matches a query, index of the array element matched (for the positional operator)]
+    '''
+    index = None
+    for key, condition in (query or {}).items():
+        if key == '$and':
+            results = [_match(doc, x) for x in condition]
+            matched = all(x[0] for x in results)
+            position = next((x[1] for x in results if x[1] is not None), None)
+        elif key == '$or':
+            results = [_match(doc, x) for x in condition]
+            matched = any(x[0] for x in results)
+            position = next((x[1] for x in results if x[0]), None)
+        elif key == '$nor':
+            matched, position = [not any(_match(doc, x)[0] for x in condition), None]
+        else:
+            matched, position = _matchCondition(list(_resolve(doc, key.split('.'))), condition)
+        if not matched:
+            return ([False, None])
+        if index is None:
+            index = position
+    return ([True, index])
+
+def _parts(path, index) -> list:
+    parts = path.split('.')
+    if '$' in parts:
+        if index is None:
+            raise WriteError('The positional operator did not find the match needed from the query.')
+        parts = [str(index) if x == '$' else x for x in parts]
+    return (parts)
+
+def _expand(doc, parts) -> list:
+    # Replaces each '$[]' (every element of an array) with the indexes of the array's elements
+    paths = [[]]
+    for x in parts:
+        if x == '$[]':
+            paths = [y + [str(z)] for y in paths for z in range(len(_fieldAt(doc, y)))]
+        else:
+            paths = [y + [x] for y in paths]
+    return (paths)
+
+def _fieldAt(doc, parts) -> list:
+    value = doc
+    for x in parts:
+        if isinstance(value, list):
+            value = value[int(x)] if x.isdigit() and int(x) < len(value) else None
+        elif isinstance(value, dict):
+            value = value.get(x)
+        else:
+            return ([])
+    return (value if isinstance(value, list) else [])
+
+def _container(doc, parts, create):
+    for x in parts[:-1]:
+        if isinstance(doc, list):
+            doc = doc[int(x)] if x.isdigit() and int(x) < len(doc) else None
+        elif isinstance(doc, dict):
+            if x not in doc and create:
+                doc[x] = {}
+            doc = doc.get(x)
+        else:
+            return (None)
+    return (doc)
+
+def _setPath(doc, parts, value) -> None:
+    container = _container(doc, parts, True)
+    if isinstance(container, list):
+        container[int(parts[-1])] = value
+    elif isinstance(container, dict):
+        container[parts[-1]] = value
+    else:
+        raise WriteError('Cannot create field ' + parts[-1])
+
+def _getPath(doc, parts, default = None):
+    container = _container(doc, parts, False)
+    if isinstance(container, list) and parts[-1].isdigit() and int(parts[-1]) < len(container):
+        return (container[int(parts[-1])])
+    elif isinstance(container, dict):
+        return (container.get(parts[-1], default))
+    return (default)
+
+def _applyUpdate(doc, update, index) -> dict:
+    '''
+    Returns a copy of a document with an update ($set, $unset, $inc, $push, $pull, $addToSet or a replacement) applied
+    '''
+    if not any(x.startswith('$') for x in update):
+        return (dict({'_id': doc['_id']} if '_id' in doc else {}, **copy.deepcopy(update)))
+    doc = copy.deepcopy(doc)
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            for parts in _expand(doc, _parts(path, index)):
+                _applyOperator(doc, operator, path, parts, value)
+    return (doc)
+
+def _applyOperator(doc, operator, path, parts, value) -> None:
+    if operator == '$set':
+        _setPath(doc, parts, copy.deepcopy(value))
+    elif operator == '$unset':
+        container = _container(doc, parts, False)
+        if isinstance(container, dict):
+            container.pop(parts[-1], None)
+        elif isinstance(container, list) and parts[-1].isdigit() and int(parts[-1]) < len(container):
+            container[int(parts[-1])] = None
+    elif operator == '$inc':
+        _setPath(doc, parts, _getPath(doc, parts, 0) + value)
+    elif operator in ('$push', '$addToSet'):
+        current = _getPath(doc, parts, _missing)
+        if current is _missing:
+            current = []
+            _setPath(doc, parts, current)
+        if not isinstance(current, list):
+            raise WriteError('The field ' + path + ' must be an array')
+        for x in value['$each'] if isinstance(value, dict) and '$each' in value else [value]:
+            if operator == '$push' or x not in current:
+                current.append(copy.deepcopy(x))
+    elif operator == '$pull':
+        current = _getPath(doc, parts)
+        if isinstance(current, list):
+            if isinstance(value, dict) and not _isOperatorDict(value):
+                current[:] = [x for x in current if not (isinstance(x, dict) and _match(x, value)[0])]
+            else:
+                current[:] = [x for x in current if not _matchCondition([(x, None)], value)[0]]
+    else:
+        raise WriteError('Unknown modifier: ' + operator)
+
+def _fieldValue(value, parts):
+    # Value of a '$field' reference, a list of values if the path goes through an array
+    for position, x in enumerate(parts):
+        if isinstance(value, list):
+            values = [_fieldValue(y, parts[position:]) for y in value if isinstance(y, dict)]
+            return ([y for y in values if y is not None])
+        if not isinstance(value, dict):
+            return (None)
+        value = value.get(x)
+    return (value)
+
+def _evaluate(expression, doc):
+    '''
+    Evaluates an aggregation expression ('$field' references and the common operators) against a document
+    '''
+    if isinstance(expression, str) and expression.startswith('$') and not expression.startswith('$$'):
+        return (_fieldValue(doc, expression[1:].split('.')))
+    if isinstance(expression, list):
+        return ([_evaluate(x, doc) for x in expression])
+    if not isinstance(expression, dict):
+        return (expression)
+    if not _isOperatorDict(expression):
+        return ({k: _evaluate(v, doc) for k, v in expression.items()})
+    operator, argument = next(iter(expression.items()))
+    if operator == '$literal':
+        return (argument)
+    arguments = _evaluate(argument, doc)
+    if operator == '$size':
+        if not isinstance(arguments, list):
+            raise OperationFailure('The argument to $size must be an array')
+        return (len(arguments))
+    elif operator == '$ifNull':
+        return (next((x for x in arguments[:-1] if x is not None), arguments[-1]))
+    elif operator in ('$sum', '$add', '$max', '$min'):
+        if not isinstance(argument, list) and isinstance(arguments, list):
+            values = arguments
+        else:
+            values = arguments if isinstance(arguments, list) else [arguments]
+        numbers = [x for x in values if _isNumber(x)]
+        if operator == '$max':
+            return (max(numbers) if numbers else None)
+        if operator == '$min':
+            return (min(numbers) if numbers else None)
+        if operator == '$add' and any(x is None for x in values):
+            return (None)
+        return (sum(numbers))
+    elif operator in ('$subtract', '$multiply', '$divide'):
+        if any(x is None for x in arguments):
+            return (None)
+        if operator == '$subtract':
+            return (arguments[0] - arguments[1])
+        if operator == '$divide':
+            if arguments[1] == 0:
+                raise OperationFailure("can't $divide by zero")
+            return (arguments[0] / arguments[1])
+        result = 1
+        for x in arguments:
+            result *= x
+        return (result)
+    elif operator == '$cond':
+        if isinstance(argument, dict):
+            arguments = [_evaluate(argument['if'], doc), _evaluate(argument['then'], doc), _evaluate(argument['else'], doc)]
+        return (arguments[1] if arguments[0] not in (None, False, 0) else arguments[2])
+    elif operator in ('$eq', '$ne'):
+        return ((arguments[0] == arguments[1]) == (operator == '$eq'))
+    elif operator in _comparisons:
+        return (_comparisons[operator](arguments[0], arguments[1]))
+    elif operator == '$and':
+        return (all(x not in (None, False, 0) for x in arguments))
+    elif operator == '$or':
+        return (any(x not in (None, False, 0) for x in arguments))
+    raise OperationFailure('Unsupported expression operator: ' + operator)
+
+def _project(doc, projection):
+    if projection is None:
+        return (doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {x: 1 for x in projection}
+    inclusion = any(isinstance(v, dict) or v for k, v in projection.items() if k != '_id') or list(projection) == ['_id'] and projection['_id']
+    if not inclusion:
+        return ({k: v for k, v in doc.items() if projection.get(k, 1)})
+    result = {}
+    if projection.get('_id', 1) and '_id' in doc:
+        result['_id'] = doc['_id']
+    for key, value in doc.items():
+        spec = projection.get(key)
+        if key == '_id' or spec is None or isinstance(spec, dict) and not '$elemMatch' in spec:
+            continue
+        if isinstance(spec, dict):
+            for x in value if isinstance(value, list) else []:
+                if (_match(x, spec['$elemMatch'])[0] if isinstance(x, dict) else _matchCondition([(x, None)], spec['$elemMatch'])[0]):
+                    result[key] = [x]
+                    break
+        elif spec:
+            result[key] = value
+    for key, spec in projection.items():
+        if '.' in key and not isinstance(spec, dict) and spec:
+            parts = key.split('.')
+            value = _getPath(doc, parts, _missing)
+            if value is not _missing:
+                _setPath(result, parts, value)
+        elif isinstance(spec, dict) and '$elemMatch' not in spec:
+            result[key] = _evaluate(spec, doc)
+    return (result)
+
+def _sortKey(value):
+    # Orders values of different types the way MongoDB does
+    if value is None or value is _missing:
+        return ((0, 0))
+    if _isNumber(value):
+        return ((1, value))
+    if isinstance(value, str):
+        return ((2, value))
+    if isinstance(value, dict):
+        return ((3, json.dumps(value, sort_keys = True, default = str)))
+    if isinstance(value, list):
+        return ((4, [_sortKey(x) for x in value]))
+    return ((5, str(value)))
+
+def _sortDocs(docs, sort) -> list:
+    for key, direction in reversed(sort):
+        docs.sort(key = lambda x: _sortKey(_getPath(x, key.split('.'))), reverse = direction < 0)
+    return (docs)
+
+def _requiresKey(condition) -> bool:
+    # If only documents that have the field can match the condition
+    if not _isOperatorDict(condition):
+        return (condition is not None)
+    for operator, argument in condition.items():
+        if operator == '$exists' and argument:
+            return (True)
+        if operator in ('$eq', '$regex', '$elemMatch', '$size') or operator in _comparisons:
+            if argument is not None:
+                return (True)
+        if operator == '$in' and None not in argument:
+            return (True)
+    return (False)
+
+class _Result():
+    '''
+    Result of a write, with the attributes of the pymongo result classes
+    '''
+    def __init__(self, **counts):
+        self.acknowledged = True
+        self.inserted_id = None
+        self.inserted_ids = []
+        self.upserted_id = None
+        self.upserted_ids = {}
+        self.inserted_count = 0
+        self.matched_count = 0
+        self.modified_count = 0
+        self.deleted_count = 0
+        self.upserted_count = 0
+        self.__dict__.update(counts)
+
+class SQLiteClient():
+    '''
+    Client which stores the Gradebook's databases in a SQLite file
+
+    Documents are split into normalized tables: courses, categories, students and logins hold
+    one row per document with the fields the program searches by in indexed columns, the
+    'assignments' of courses and students are rows of the assignments table (one per entry)
+    and the category marks of each entry are rows of the marks table. Fields without a column
+    of their own are kept as JSON in each row's 'extra' column, and documents of any other
+    shape are kept whole in the others table.
+
+    Attributes
+    ----------
+    path : str
+        Path of the SQLite file, ':memory:' for a database which is not saved
+
+    Methods
+    -------
+    close() -> None
+        Closes the SQLite connection
+    asyncClient() -> AsyncSQLiteClient
+        Returns a client with coroutine methods for the asyncio layer
+    '''
+
+    # Database names mapped to the tables their documents are split into: (table, field which
+    # decides if a document belongs to the table, document fields mapped to their columns).
+    # A document goes to the first table whose field it has, or to the others table.
+    tables = {'GradebookCourses': [('courses', 'course name', {'course name': 'name'}),
+                                   ('categories', 'category', {'category': 'name', 'weighting': 'weighting'})],
+              'GradebookStudents': [('students', 'student name', {'course name': 'course', 'student name': 'name'})],
+              'GradebookLogin': [('logins', 'username', {'username': 'username', 'password': 'password'})]}
+    # Columns are declared without types so values keep the type they were saved with
+    schema = '''
+        CREATE TABLE IF NOT EXISTS courses (id INTEGER PRIMARY KEY, account NOT NULL, name, assignmentCount, extra);
+        CREATE INDEX IF NOT EXISTS coursesName ON courses (account, name);
+        CREATE TABLE IF NOT EXISTS categories (id INTEGER PRIMARY KEY, account NOT NULL, name, weighting, extra);
+        CREATE INDEX IF NOT EXISTS categoriesName ON categories (account, name);
+        CREATE TABLE IF NOT EXISTS students (id INTEGER PRIMARY KEY, account NOT NULL, course, name, assignmentCount, extra);
+        CREATE INDEX IF NOT EXISTS studentsName ON students (account, course, name);
+        CREATE TABLE IF NOT EXISTS logins (id INTEGER PRIMARY KEY, account NOT NULL, username, password, extra);
+        CREATE UNIQUE INDEX IF NOT EXISTS loginsUsername ON logins (account, username);
+        CREATE TABLE IF NOT EXISTS others (id INTEGER PRIMARY KEY, db NOT NULL, account NOT NULL, extra);
+        CREATE INDEX IF NOT EXISTS othersAccount ON others (db, account);
+        CREATE TABLE IF NOT EXISTS assignments (owner NOT NULL, ownerId NOT NULL, position NOT NULL, name, weighting, adjustedWeighting, extra,
+                                                PRIMARY KEY (owner, ownerId, position)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS marks (owner NOT NULL, ownerId NOT NULL, position NOT NULL, ord NOT NULL, category NOT NULL, mark,
+                                          PRIMARY KEY (owner, ownerId, position, ord)) WITHOUT ROWID;
+    '''
+
+    def __init__(self, path = 'gradebook.sqlite3'):
+        '''
+        Constructor to build a SQLiteClient object, creating the tables if needed
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of the SQLite file, defaults to 'gradebook.sqlite3'
+        '''
+        self.path = path
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread = False, isolation_level = None)
+        self.connection.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode = WAL')
+            self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(self.schema)
+
+    def __getitem__(self, databaseName):
+        return (SQLiteDatabase(self, databaseName))
+
+    @contextmanager
+    def transaction(self):
+        '''
+        Holds the connection's lock and commits the writes made inside, or rolls them back on an error
+        '''
+        with self.lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield (self.connection)
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def close(self) -> None:
+        '''
+        Closes the SQLite connection
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        with self.lock:
+            self.connection.close()
+
+    def asyncClient(self):
+        '''
+        Returns a client with coroutine methods for the asyncio layer
+
+        The queries of a local file take microseconds, so the coroutines run them directly
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        AsyncSQLiteClient
+            Client sharing this client's connection
+        '''
+        return (AsyncSQLiteClient(self))
+
+class SQLiteDatabase():
+    '''
+    Database of a SQLiteClient, whose collections are named after their account
+    '''
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def __getitem__(self, collectionName):
+        return (SQLiteCollection(self, collectionName))
+
+    def list_collection_names(self) -> list:
+        names = set()
+        with self.client.lock:
+            for table, key, columns in self.client.tables.get(self.name, []):
+                names.update(x[0] for x in self.client.connection.execute('SELECT DISTINCT account FROM ' + table))
+            names.update(x[0] for x in self.client.connection.execute('SELECT DISTINCT account FROM others WHERE db = ?', (self.name,)))
+        return (sorted(names))
+
+    def command(self, name, *args, **kwargs) -> dict:
+        if name == 'ping':
+            return ({'ok': 1.0})
+        raise OperationFailure('Unsupported command: ' + str(name))
+
+class SQLiteCursor():
+    '''
+    Result of SQLiteCollection.find(), documents are read from the database as it is iterated
+    '''
+
+    def __init__(self, collection, query, projection, batchSize, sort):
+        self.collection = collection
+        self.query = query or {}
+        self.projection = projection
+        self.batchSize = batchSize or 500
+        self.sortKeys = sort
+        self.limitCount = 0
+        self._iterator = None
+
+    def sort(self, keyOrList, direction = 1):
+        self.sortKeys = [(keyOrList, direction)] if isinstance(keyOrList, str) else list(keyOrList)
+        return (self)
+
+    def limit(self, count):
+        self.limitCount = count
+        return (self)
+
+    def batch_size(self, batchSize):
+        self.batchSize = batchSize or 500
+        return (self)
+
+    def __iter__(self):
+        documents = self.collection._iterate(self.query, self.projection, self.batchSize, self.sortKeys)
+        for count, x in enumerate(documents, 1):
+            yield (x)
+            if count == self.limitCount:
+                return
+
+    def __next__(self):
+        if self._iterator is None:
+            self._iterator = iter(self)
+        return (next(self._iterator))
+
+    def close(self) -> None:
+        self._iterator = None
+
+    def explain(self) -> dict:
+        '''
+        Returns the SQLite query plan in the shape of a MongoDB explain() result
+        '''
+        plan = {}
+        examined = 0
+        for table, sql, parameters in reversed(self.collection._selects(self.query, self.sortKeys)):
+            with self.collection.client.lock:
+                details = [x['detail'] for x in self.collection.client.connection.execute('EXPLAIN QUERY PLAN ' + sql, parameters)]
+                examined += len(self.collection.client.connection.execute(sql, parameters).fetchall())
+            for x in reversed(details):
+                plan = dict({'stage': x}, **({'inputStage': plan} if plan else {}))
+        return ({'queryPlanner': {'winningPlan': plan},
+                 'executionStats': {'totalDocsExamined': examined, 'nReturned': sum(1 for x in self.collection._iterate(self.query, None, self.batchSize, None))}})
+
+class SQLiteCollection():
+    '''
+    Collection of a SQLiteDatabase with the pymongo methods used by the Gradebook program
+
+    Queries support field equality, dotted paths into arrays, $exists, $eq, $ne, $in, $nin,
+    $gt, $gte, $lt, $lte, $regex, $size, $not, $elemMatch, $and, $or and $nor. Updates support
+    $set, $unset, $inc, $push, $addToSet and $pull, including the positional '$' operator.
+    Conditions on the indexed columns are answered by SQLite; the rest of a query is checked
+    on the documents it returns.
+
+    Methods
+    -------
+    find(filter : dict = None, projection : dict = None, batch_size : int = 0, sort : list = None) -> SQLiteCursor
+    find_one(filter : dict = None, projection : dict = None) -> dict
+    count_documents(filter : dict) -> int
+    insert_one(document : dict) -> result
+    insert_many(documents : list, ordered : bool = True) -> result
+    update_one(filter : dict, update : dict, upsert : bool = False) -> result
+    update_many(filter : dict, update : dict, upsert : bool = False) -> result
+    replace_one(filter : dict, replacement : dict, upsert : bool = False) -> result
+    delete_one(filter : dict) -> result
+    delete_many(filter : dict) -> result
+    bulk_write(requests : list, ordered : bool = True) -> result
+    aggregate(pipeline : list) -> iterator
+    create_index(keys : list, **options) -> str
+    drop() -> None
+    '''
+
+    def __init__(self, database, name):
+        self.database = database
+        self.client = database.client
+        self.name = name
+        self.full_name = database.name + '.' + name
+
+    def _tables(self) -> list:
+        return (self.client.tables.get(self.database.name, []) + [('others', None, {})])
+
+    def _route(self, doc) -> tuple:
+        for x in self._tables():
+            if x[1] is None or x[1] in doc:
+                return (x)
+
+    def _selects(self, query, sort = None) -> list:
+        # Builds the SELECT of the ids of each table whose documents could match the query
+        selects = []
+        earlierKeys = []
+        tables = self._tables()
+        for table, key, columns in tables:
+            skip = any(x in query and _requiresKey(query[x]) for x in earlierKeys)
+            skip = skip or (key is not None and isinstance(query.get(key), dict) and query[key].get('$exists') is False)
+            if key is not None:
+                earlierKeys.append(key)
+            if skip:
+                continue
+            where = ['account = ?']
+            parameters = [self.name]
+            if table == 'others':
+                where.append('db = ?')
+                parameters.append(self.database.name)
+            idQuery = query.get('_id')
+            if isinstance(idQuery, str):
+                if not idQuery.startswith(table + ':'):
+                    continue
+                where.append('id = ?')
+                parameters.append(int(idQuery.split(':')[1]))
+            # Fields the program searches by are columns of the table they decide, other tables can only have them in 'extra'
+            laterKeys = [x[1] for x in tables if x[1] is not None and x[1] not in columns]
+            if any(x in query and _requiresKey(query[x]) for x in laterKeys):
+                where.append('extra IS NOT NULL')
+            for field, column in columns.items():
+                condition = query.get(field, _missing)
+                if _isScalar(condition):
+                    where.append(column + ' = ?')
+                    parameters.append(condition)
+                elif isinstance(condition, dict) and _isOperatorDict(condition):
+                    if _isScalar(condition.get('$eq')):
+                        where.append(column + ' = ?')
+                        parameters.append(condition['$eq'])
+                    values = condition.get('$in')
+                    if isinstance(values, list) and values and all(_isScalar(x) for x in values):
+                        where.append(column + ' IN (' + ', '.join('?' * len(values)) + ')')
+                        parameters.extend(values)
+            order = 'id'
+            if sort and all(x in columns for x, y in sort):
+                order = ', '.join(columns[x] + (' DESC' if y < 0 else '') for x, y in sort) + ', id'
+            selects.append((table, 'SELECT id FROM ' + table + ' WHERE ' + ' AND '.join(where) + ' ORDER BY ' + order, parameters))
+        return (selects)
+
+    @staticmethod
+    def _needsAssignments(query, projection) -> bool:
+        if 'assignments' in json.dumps(query or {}, default = str):
+            return (True)
+        if projection is None:
+            return (True)
+        if isinstance(projection, (list, tuple)):
+            projection = {x: 1 for x in projection}
+        if not any(isinstance(v, dict) or v for k, v in projection.items() if k != '_id') and not (list(projection) == ['_id'] and projection['_id']):
+            return (projection.get('assignments', 1) != 0)
+        return ('assignments' in json.dumps(projection, default = str))
+
+    def _load(self, table, ids, withAssignments = True) -> list:
+        # Reads the documents with the given ids from a table, in the order of the ids
+        connection = self.client.connection
+        marks = ', '.join('?' * len(ids))
+        rows = {x['id']: x for x in connection.execute('SELECT * FROM ' + table + ' WHERE id IN (' + marks + ')', ids)}
+        entries = {}
+        if table in ('courses', 'students') and withAssignments:
+            for x in connection.execute('SELECT * FROM assignments WHERE owner = ? AND ownerId IN (' + marks + ') ORDER BY ownerId, position', [table] + list(ids)):
+                entry = {} if x['name'] is None else {'assignment name': x['name']}
+                entries.setdefault(x['ownerId'], {})[x['position']] = [entry, x]
+            for x in connection.execute('SELECT * FROM marks WHERE owner = ? AND ownerId IN (' + marks + ') ORDER BY ownerId, position, ord', [table] + list(ids)):
+                entries[x['ownerId']][x['position']][0][x['category']] = x['mark']
+        columns = next((x[2] for x in self._tables() if x[0] == table))
+        docs = []
+        for x in ids:
+            row = rows.get(x)
+            if row is None:
+                continue
+            doc = {'_id': table + ':' + str(x)}
+            for field, column in columns.items():
+                if row[column] is not None:
+                    doc[field] = row[column]
+            if row['extra']:
+                doc.update(json.loads(row['extra']))
+            if table in ('courses', 'students') and withAssignments and row['assignmentCount'] is not None:
+                doc['assignments'] = []
+                for entry, entryRow in entries.get(x, {}).values():
+                    for field, column in (('weighting', 'weighting'), ('adjusted weighting', 'adjustedWeighting')):
+                        if entryRow[column] is not None:
+                            entry[field] = entryRow[column]
+                    if entryRow['extra']:
+                        entry.update(json.loads(entryRow['extra']))
+                    doc['assignments'].append(entry)
+            docs.append(doc)
+        return (docs)
+
+    def _iterate(self, query, projection, batchSize, sort):
+        # Yields the matching documents, reading batchSize documents at a time
+        query = query or {}
+        selects = self._selects(query, sort)
+        sortInPython = False
+        if sort and selects:
+            columns = next((x[2] for x in self._tables() if x[0] == selects[0][0]))
+            sortInPython = len(selects) > 1 or any(x not in columns for x, y in sort)
+        withAssignments = self._needsAssignments(query, projection) or sortInPython and any(x.startswith('assignments') for x, y in sort)
+        matched = []
+        for table, sql, parameters in selects:
+            with self.client.lock:
+                ids = [x[0] for x in self.client.connection.execute(sql, parameters)]
+            for start in range(0, len(ids), batchSize):
+                with self.client.lock:
+                    docs = self._load(table, ids[start:start+batchSize], withAssignments)
+                for doc in docs:
+                    if _match(doc, query)[0]:
+                        if sortInPython:
+                            matched.append(doc)
+                        else:
+                            yield (_project(doc, projection))
+        if sortInPython:
+            for doc in _sortDocs(matched, sort):
+                yield (_project(doc, projection))
+
+    def find(self, filter = None, projection = None, batch_size = 0, sort = None, **kwargs) -> SQLiteCursor:
+        return (SQLiteCursor(self, filter, projection, batch_size, sort))
+
+    def find_one(self, filter = None, projection = None, **kwargs) -> dict:
+        return (next(iter(self.find(filter, projection, **kwargs).limit(1)), None))
+
+    def count_documents(self, filter, **kwargs) -> int:
+        return (sum(1 for x in self._iterate(filter, {'assignments': 0}, 500, None)))
+
+    def _insert(self, doc) -> str:
+        table, key, columns = self._route(doc)
+        values, extra, entries = self._split(table, columns, doc)
+        names = list(values)
+        try:
+            if table == 'others':
+                cursor = self.client.connection.execute('INSERT INTO others (db, account, extra) VALUES (?, ?, ?)', (self.database.name, self.name, extra))
+            else:
+                cursor = self.client.connection.execute('INSERT INTO ' + table + ' (' + ', '.join(['account', 'extra'] + names) + ') VALUES (' + ', '.join('?' * (len(names) + 2)) + ')',
+                                                        [self.name, extra] + [values[x] for x in names])
+        except sqlite3.IntegrityError as error:
+            raise DuplicateKeyError(str(error))
+        if entries is not None:
+            self._writeEntries(table, cursor.lastrowid, entries, range(len(entries)))
+        return (table + ':' + str(cursor.lastrowid))
+
+    @staticmethod
+    def _split(table, columns, doc) -> list:
+        # Splits a document into [column values, JSON of the other fields, assignment entries or None]
+        rest = {k: v for k, v in doc.items() if k != '_id'}
+        values = {x: None for x in columns.values()}
+        for field, column in columns.items():
+            if _isScalar(rest.get(field)):
+                values[column] = rest.pop(field)
+        entries = None
+        if table in ('courses', 'students'):
+            values['assignmentCount'] = None
+            if isinstance(rest.get('assignments'), list) and all(isinstance(x, dict) for x in rest['assignments']):
+                entries = rest.pop('assignments')
+                values['assignmentCount'] = len(entries)
+        if table == 'others':
+            values = {}
+        return ([values, json.dumps(rest) if rest else None, entries])
+
+    def _writeEntries(self, table, ownerId, entries, positions) -> None:
+        connection = self.client.connection
+        assignmentRows = []
+        markRows = []
+        for position in positions:
+            rest = dict(entries[position])
+            name = rest.pop('assignment name') if isinstance(rest.get('assignment name'), str) else None
+            weighting = rest.pop('weighting') if _isNumber(rest.get('weighting')) else None
+            adjustedWeighting = rest.pop('adjusted weighting') if _isNumber(rest.get('adjusted weighting')) else None
+            for ord, category in enumerate([x for x in rest if _isNumber(rest[x])]):
+                markRows.append((table, ownerId, position, ord, category, rest.pop(category)))
+            assignmentRows.append((table, ownerId, position, name, weighting, adjustedWeighting, json.dumps(rest) if rest else None))
+        connection.executemany('INSERT INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?)', assignmentRows)
+        connection.executemany('INSERT INTO marks VALUES (?, ?, ?, ?, ?, ?)', markRows)
+
+    def _deleteEntries(self, table, ownerId, start, positions = None) -> None:
+        for x in ('assignments', 'marks'):
+            if positions is None:
+                self.client.connection.execute('DELETE FROM ' + x + ' WHERE owner = ? AND ownerId = ? AND position >= ?', (table, ownerId, start))
+            else:
+                self.client.connection.executemany('DELETE FROM ' + x + ' WHERE owner = ? AND ownerId = ? AND position = ?', [(table, ownerId, y) for y in positions])
+
+    def _save(self, table, rowId, old, new) -> None:
+        # Writes the changes between two versions of a document, only rewriting the assignment entries that changed
+        if self._route(new)[0] != table:
+            self._delete(table, rowId)
+            self._insert(new)
+            return
+        columns = next((x[2] for x in self._tables() if x[0] == table))
+        values, extra, entries = self._split(table, columns, new)
+        names = list(values) + ['extra']
+        try:
+            self.client.connection.execute('UPDATE ' + table + ' SET ' + ', '.join(x + ' = ?' for x in names) + ' WHERE id = ?',
+                                           [values[x] for x in names[:-1]] + [extra, rowId])
+        except sqlite3.IntegrityError as error:
+            raise DuplicateKeyError(str(error))
+        if table not in ('courses', 'students'):
+            return
+        oldEntries = self._split(table, columns, old)[2] or []
+        entries = entries or []
+        if len(entries) >= len(oldEntries) and all(isinstance(x, dict) for x in entries):
+            changed = [x for x in range(len(oldEntries)) if oldEntries[x] != entries[x]]
+            self._deleteEntries(table, rowId, 0, changed)
+            self._writeEntries(table, rowId, entries, changed + list(range(len(oldEntries), len(entries))))
+        else:
+            # Entries were removed, so the positions after the first difference shift
+            first = next((x for x in range(len(entries)) if oldEntries[x] != entries[x]), len(entries))
+            self._deleteEntries(table, rowId, first)
+            self._writeEntries(table, rowId, entries, range(first, len(entries)))
+
+    def _delete(self, table, rowId) -> None:
+        self.client.connection.execute('DELETE FROM ' + table + ' WHERE id = ?', (rowId,))
+        if table in ('courses', 'students'):
+            self._deleteEntries(table, rowId, 0)
+
+    def _matching(self, query):
+        # Yields (table, row id, document, positional index) of the documents matching a query
+        for table, sql, parameters in self._selects(query or {}):
+            ids = [x[0] for x in self.client.connection.execute(sql, parameters)]
+            for start in range(0, len(ids), 500):
+                for doc in self._load(table, ids[start:start+500]):
+                    matched, index = _match(doc, query or {})
+                    if matched:
+                        yield ((table, int(doc['_id'].split(':')[1]), doc, index))
+
+    def _update(self, query, update, many, upsert) -> _Result:
+        result = _Result()
+        for table, rowId, doc, index in list(self._matching(query)):
+            result.matched_count += 1
+            new = _applyUpdate(doc, update, index)
+            if new != doc:
+                self._save(table, rowId, doc, new)
+                result.modified_count += 1
+            if not many:
+                break
+        if result.matched_count == 0 and upsert:
+            seed = {k: v for k, v in (query or {}).items() if not k.startswith('$') and not _isOperatorDict(v) and '.' not in k}
+            result.upserted_id = self._insert(_applyUpdate(seed, update, None))
+            result.upserted_count = 1
+        return (result)
+
+    def insert_one(self, document, **kwargs) -> _Result:
+        with self.client.transaction():
+            document['_id'] = self._insert(document)
+        return (_Result(inserted_id = document['_id'], inserted_count = 1))
+
+    def insert_many(self, documents, ordered = True, **kwargs) -> _Result:
+        ids = []
+        with self.client.transaction():
+            for x in documents:
+                x['_id'] = self._insert(x)
+                ids.append(x['_id'])
+        return (_Result(inserted_ids = ids, inserted_count = len(ids)))
+
+    def update_one(self, filter, update, upsert = False, **kwargs) -> _Result:
+        with self.client.transaction():
+            return (self._update(filter, update, False, upsert))
+
+    def update_many(self, filter, update, upsert = False, **kwargs) -> _Result:
+        with self.client.transaction():
+            return (self._update(filter, update, True, upsert))
+
+    def replace_one(self, filter, replacement, upsert = False, **kwargs) -> _Result:
+        with self.client.transaction():
+            return (self._update(filter, replacement, False, upsert))
+
+    def _deleteMatching(self, query, many) -> int:
+        count = 0
+        for table, rowId, doc, index in list(self._matching(query)):
+            self._delete(table, rowId)
+            count += 1
+            if not many:
+                break
+        return (count)
+
+    def delete_one(self, filter, **kwargs) -> _Result:
+        with self.client.transaction():
+            return (_Result(deleted_count = self._deleteMatching(filter, False)))
+
+    def delete_many(self, filter, **kwargs) -> _Result:
+        with self.client.transaction():
+            return (_Result(deleted_count = self._deleteMatching(filter, True)))
+
+    def bulk_write(self, requests, ordered = True, **kwargs) -> _Result:
+        '''
+        Runs the requests in order as one transaction, nothing is written if one of them fails
+        '''
+        result = _Result()
+        with self.client.transaction():
+            for x in requests:
+                if isinstance(x, InsertOne):
+                    x._doc['_id'] = self._insert(x._doc)
+                    result.inserted_count += 1
+                elif isinstance(x, (UpdateOne, UpdateMany, ReplaceOne)):
+                    counts = self._update(x._filter, x._doc, isinstance(x, UpdateMany), x._upsert)
+                    result.matched_count += counts.matched_count
+                    result.modified_count += counts.modified_count
+                    result.upserted_count += counts.upserted_count
+                elif isinstance(x, (DeleteOne, DeleteMany)):
+                    result.deleted_count += self._deleteMatching(x._filter, isinstance(x, DeleteMany))
+                else:
+                    raise TypeError(str(x) + ' is not a valid request')
+        return (result)
+
+    def aggregate(self, pipeline, **kwargs):
+        '''
+        Runs an aggregation pipeline ($match, $project, $addFields, $set, $unwind, $group, $sort, $skip, $limit)
+        '''
+        query = pipeline[0]['$match'] if pipeline and '$match' in pipeline[0] else {}
+        docs = self._iterate(query, None if 'assignments' in json.dumps(pipeline, default = str) else {'assignments': 0}, 500, None)
+        for stage in pipeline[1 if query else 0:]:
+            operator, argument = next(iter(stage.items()))
+            if operator == '$match':
+                docs = [x for x in docs if _match(x, argument)[0]]
+            elif operator == '$project':
+                docs = [_project(x, argument) for x in docs]
+            elif operator in ('$addFields', '$set'):
+                docs = [dict(x, **{k: _evaluate(v, x) for k, v in argument.items()}) for x in docs]
+            elif operator == '$unwind':
+                path = (argument if isinstance(argument, str) else argument['path'])[1:]
+                docs = [dict(x, **{path: y}) for x in docs for y in (x.get(path) if isinstance(x.get(path), list) else [])]
+            elif operator == '$group':
+                groups = {}
+                for x in docs:
+                    groupId = _evaluate(argument['_id'], x)
+                    group = groups.setdefault(json.dumps(groupId, sort_keys = True, default = str), [groupId, []])
+                    group[1].append(x)
+                docs = []
+                for groupId, members in groups.values():
+                    doc = {'_id': groupId}
+                    for field, accumulator in argument.items():
+                        if field == '_id':
+                            continue
+                        name, expression = next(iter(accumulator.items()))
+                        values = [_evaluate(expression, x) for x in members]
+                        numbers = [x for x in values if _isNumber(x)]
+                        if name == '$sum':
+                            doc[field] = sum(numbers)
+                        elif name == '$avg':
+                            doc[field] = sum(numbers) / len(numbers) if numbers else None
+                        elif name in ('$max', '$min'):
+                            doc[field] = (max if name == '$max' else min)(numbers) if numbers else None
+                        elif name == '$first':
+                            doc[field] = values[0] if values else None
+                        elif name == '$push':
+                            doc[field] = values
+                        else:
+                            raise OperationFailure('Unsupported accumulator: ' + name)
+                    docs.append(doc)
+            elif operator == '$sort':
+                docs = _sortDocs(list(docs), list(argument.items()))
+            elif operator == '$skip':
+                docs = list(docs)[argument:]
+            elif operator == '$limit':
+                docs = list(docs)[:argument]
+            else:
+                raise OperationFailure('Unsupported pipeline stage: ' + operator)
+        return (iter(list(docs)))
+
+    def create_index(self, keys, **options) -> str:
+        '''
+        The tables already have their indexes, so this only returns the index name
+        '''
+        return (options.get('name') or '_'.join(str(x) for y in keys for x in y))
+
+    def drop(self) -> None:
+        with self.client.transaction():
+            for table, key, columns in self._tables():
+                if table in ('courses', 'students'):
+                    for x in ('assignments', 'marks'):
+                        self.client.connection.execute('DELETE FROM ' + x + ' WHERE owner = ? AND ownerId IN (SELECT id FROM ' + table + ' WHERE account = ?)', (table, self.name))
+                if table == 'others':
+                    self.client.connection.execute('DELETE FROM others WHERE db = ? AND account = ?', (self.database.name, self.name))
+                else:
+                    self.client.connection.execute('DELETE FROM ' + table + ' WHERE account = ?', (self.name,))
+
+class AsyncSQLiteClient():
+    '''
+    Client with the coroutine methods of pymongo's AsyncMongoClient, sharing a SQLiteClient's connection
+    '''
+
+    def __init__(self, client):
+        self.client = client
+
+    def __getitem__(self, databaseName):
+        return (_AsyncDatabase(self.client[databaseName]))
+
+    def close(self) -> None:
+        # The connection belongs to the SQLiteClient, which closes it
+        pass
+
+class _AsyncDatabase():
+    def __init__(self, database):
+        self.database = database
+
+    def __getitem__(self, collectionName):
+        return (_AsyncCollection(self.database[collectionName]))
+
+class _AsyncCursor():
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def sort(self, *args):
+        self.cursor.sort(*args)
+        return (self)
+
+    def __aiter__(self):
+        self._iterator = iter(self.cursor)
+        return (self)
+
+    async def __anext__(self):
+        try:
+            return (next(self._iterator))
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length = None) -> list:
+        docs = []
+        for x in self.cursor:
+            docs.append(x)
+            if length and len(docs) >= length:
+                break
+        return (docs)
+
+class _AsyncCollection():
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        return (_AsyncCursor(self.collection.find(*args, **kwargs)))
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+        async def call(*args, **kwargs):
+            return (method(*args, **kwargs))
+        return (call)
@@ -0,0 +1,301 @@
+#-----------------------------------------------------------------------------
+# Name:        storageLayout (storageLayout.py)
+# Purpose:     To choose how an account stores assignments in student documents
+#              and to migrate accounts between the layouts
+#
+# Author:      Steven Wu
+# Created:     2020/02/17
+# Updated:     2020/02/17
+#-----------------------------------------------------------------------------
+# Usage: python storageLayout.py username [embedded|normalized] [--batch-size n]
+# Prints the account's layout, or migrates the account to the given layout.
+
+import argparse
+import sys
+import uuid
+from pymongo import UpdateOne
+from connectionManager import ConnectionManager
+from docCache import sharedCache
+
+class StorageLayout():
+    '''
+    Object which reads, sets and migrates the storage layout of an account
+
+    In the 'embedded' layout (the default) every student document has a copy of each of its
+    course's assignments, including the assignment's weighting, so adding an assignment or
+    changing its weighting writes every student of the course. In the 'normalized' layout the
+    course document holds the only copy of the assignment information and a student document
+    holds only the assignments the student has marks or an adjusted weighting for. Adding or
+    editing a course assignment is then a single write to the course document.
+
+    Instead of removing the students' adjusted weightings of an edited assignment, the edit
+    gives the course's copy of the assignment a new 'revision' and adjusted weightings made for
+    an older revision are ignored. The course document gets a new 'revision' as well, and saved
+    totals made for an older one are recalculated when next viewed (see StudentTotals).
+
+    The layout is kept in a {'storage layout': layout} document in the account's
+    'GradebookCourses' collection.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    layouts : tuple
+        Names of the layouts
+
+    Methods
+    -------
+    get() -> str
+        Returns the account's layout
+    getAsync() -> str
+        Returns the account's layout, read with the asyncio client
+    isNormalized() -> bool
+        Returns if the account uses the normalized layout
+    set(layout : str) -> None
+        Changes the account's layout without migrating its documents
+    migrate(layout : str, batchSize : int = 500) -> dict
+        Converts the account's documents to a layout and switches the account to it
+    newRevision() -> str
+        Returns a new revision stamp
+    isCurrent(assignment : dict, master : dict) -> bool
+        Returns if a student's adjusted weighting was made for the current course assignment
+    '''
+
+    layouts = ('embedded', 'normalized')
+    query = {'storage layout': {'$exists': True}}
+    projection = {'storage layout': 1}
+
+    def __init__(self, username):
+        '''
+        Constructor to build a StorageLayout object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        '''
+        self.username = username
+
+    def get(self) -> str:
+        '''
+        Returns the account's layout
+
+        The setting is served from the shared DocCache when possible
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            'embedded' or 'normalized'
+        '''
+        collection = ConnectionManager.getClient()['GradebookCourses'][self.username]
+        key = sharedCache.makeKey('docGet', 'GradebookCourses', self.username, self.query, self.projection)
+        return (self._layout(sharedCache.fetch(key, lambda: collection.find_one(self.query, self.projection))))
+
+    async def getAsync(self) -> str:
+        '''
+        Returns the account's layout, read with the asyncio client
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            'embedded' or 'normalized'
+        '''
+        collection = ConnectionManager.getAsyncClient()['GradebookCourses'][self.username]
+        key = sharedCache.makeKey('docGet', 'GradebookCourses', self.username, self.query, self.projection)
+        return (self._layout(await sharedCache.fetchAsync(key, lambda: collection.find_one(self.query, self.projection))))
+
+    @classmethod
+    def _layout(cls, setting) -> str:
+        if setting is None or setting.get('storage layout') not in cls.layouts:
+            return ('embedded')
+        return (setting['storage layout'])
+
+    def isNormalized(self) -> bool:
+        '''
+        Returns if the account uses the normalized layout
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+            True if the account uses the normalized layout
+        '''
+        return (self.get() == 'normalized')
+
+    def set(self, layout) -> None:
+        '''
+        Changes the account's layout without migrating its documents
+
+        Parameters
+        ----------
+        layout : str
+            'embedded' or 'normalized'
+
+        Returns
+        -------
+        None
+
+        Raises
+        -------
+        ValueError
+            If the layout does not exist
+        '''
+        if layout not in self.layouts:
+            raise ValueError('Unknown storage layout: ' + str(layout))
+        collection = ConnectionManager.getClient()['GradebookCourses'][self.username]
+        collection.update_one(self.query, {'$set': {'storage layout': layout}}, upsert = True)
+        sharedCache.invalidate('GradebookCourses', self.username)
+
+    @staticmethod
+    def newRevision() -> str:
+        '''
+        Returns a new revision stamp
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            A string that is different every time
+        '''
+        return (uuid.uuid4().hex)
+
+    @staticmethod
+    def isCurrent(assignment, master) -> bool:
+        '''
+        Returns if a student's adjusted weighting was made for the current course assignment
+
+        Accounts that never used the normalized layout have no revisions, so every adjusted
+        weighting is current
+
+        Parameters
+        ----------
+        assignment : dict
+            The student's assignment
+        master : dict
+            The course's copy of the assignment
+
+        Returns
+        -------
+        bool
+            True if both have the same revision
+        '''
+        return (assignment.get('revision') == master.get('revision'))
+
+    def migrate(self, layout, batchSize = 500) -> dict:
+        '''
+        Converts the account's documents to a layout and switches the account to it
+
+        Migrating to the normalized layout removes the weighting copied into each student
+        assignment and the assignments without marks or an adjusted weighting. Migrating to the
+        embedded layout copies every course assignment into its students again, drops adjusted
+        weightings made for an older revision of an assignment and removes the revisions.
+        Saved totals that are out of date are removed when migrating to the embedded layout, so
+        they are recalculated when next viewed. The account should not be used while it is migrated.
+
+        Parameters
+        ----------
+        layout : str
+            'embedded' or 'normalized'
+        batchSize : int, optional
+            Number of student documents written per bulk_write, defaults to 500
+
+        Returns
+        -------
+        dict
+            Number of 'courses' and 'students' changed
+
+        Raises
+        -------
+        ValueError
+            If the layout does not exist
+        '''
+        if layout not in self.layouts:
+            raise ValueError('Unknown storage layout: ' + str(layout))
+        client = ConnectionManager.getClient()
+        courseCol = client['GradebookCourses'][self.username]
+        studentCol = client['GradebookStudents'][self.username]
+        counts = {'courses': 0, 'students': 0}
+        masters = {}
+        revisions = {}
+        for courseDoc in courseCol.find({'course name': {'$exists': True}}, {'course name': 1, 'assignments': 1, 'revision': 1}):
+            assignments = courseDoc.get('assignments', [])
+            masters[courseDoc['course name']] = assignments
+            revisions[courseDoc['course name']] = courseDoc.get('revision')
+            if layout == 'embedded' and ('revision' in courseDoc or any('revision' in x for x in assignments)):
+                courseCol.update_one({'_id': courseDoc['_id']}, {'$set': {'assignments': [{y: x[y] for y in x if y != 'revision'} for x in assignments]},
+                                                                 '$unset': {'revision': ''}})
+                counts['courses'] += 1
+
+        batch = []
+        for studentDoc in studentCol.find({}, {'course name': 1, 'assignments': 1, 'revision': 1}, batch_size = batchSize):
+            courseMasters = {x['assignment name']: x for x in masters.get(studentDoc.get('course name'), [])}
+            assignments = studentDoc.get('assignments', [])
+            if layout == 'normalized':
+                converted = []
+                for x in assignments:
+                    entry = {y: x[y] for y in x if y != 'weighting'}
+                    if len(entry) > 1:
+                        converted.append(entry)
+                update = {'$set': {'assignments': converted}}
+                changed = converted != assignments
+            else:
+                converted = []
+                names = set()
+                for x in assignments:
+                    entry = {y: x[y] for y in x if y != 'revision'}
+                    master = courseMasters.get(x.get('assignment name'))
+                    if master is not None:
+                        entry['weighting'] = master['weighting']
+                        if not self.isCurrent(x, master):
+                            entry.pop('adjusted weighting', None)
+                    names.add(x.get('assignment name'))
+                    converted.append(entry)
+                for x in masters.get(studentDoc.get('course name'), []):
+                    if x['assignment name'] not in names:
+                        converted.append({'assignment name': x['assignment name'], 'weighting': x['weighting']})
+                update = {'$set': {'assignments': converted}, '$unset': {'revision': ''}}
+                # Totals made for an older revision of the course can't be told apart once the revisions are removed
+                if studentDoc.get('revision') != revisions.get(studentDoc.get('course name')):
+                    update['$unset'].update({'totals': '', 'results': ''})
+                changed = converted != assignments or 'revision' in studentDoc
+            if changed:
+                batch.append(UpdateOne({'_id': studentDoc['_id']}, update))
+            if len(batch) >= batchSize:
+                counts['students'] += len(batch)
+                studentCol.bulk_write(batch, ordered = False)
+                batch = []
+        if batch:
+            counts['students'] += len(batch)
+            studentCol.bulk_write(batch, ordered = False)
+        sharedCache.invalidate('GradebookStudents', self.username)
+        self.set(layout)
+        return (counts)
+
+def main(arguments) -> None:
+    parser = argparse.ArgumentParser(description = 'Shows or changes the storage layout of an account')
+    parser.add_argument('username')
+    parser.add_argument('layout', nargs = '?', choices = StorageLayout.layouts)
+    parser.add_argument('--batch-size', type = int, default = 500)
+    options = parser.parse_args(arguments)
+    storageLayout = StorageLayout(options.username)
+    if options.layout is None:
+        print(storageLayout.get())
+    else:
+        print(storageLayout.migrate(options.layout, options.batch_size))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
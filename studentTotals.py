@@ -0,0 +1,249 @@
+#-----------------------------------------------------------------------------
+# Name:        studentTotals (studentTotals.py)
+# Purpose:     To keep each student's total marks saved in their document so the
+#              student page does not have to recalculate them
+#
+# Author:      Steven Wu
+# Created:     2020/02/13
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+
+from pymongo import UpdateOne
+from connectionManager import ConnectionManager
+from courses import Courses
+from docCache import sharedCache
+from gradingContext import GradingContext
+from instrumentation import instrumentation
+from storageLayout import StorageLayout
+
+class StudentTotals():
+    '''
+    Object which maintains the saved totals of the students of a course
+
+    Each student document gets a 'totals' dict holding the weighted sums the default and
+    adjusted marks are divided from, and a 'results' list holding the mark and weightings of
+    every course assignment. Saving a student's assignment changes the sums by the difference
+    between the assignment's old and new contribution, only if the saved result is still the old
+    one (so two devices saving the same assignment can't both subtract it). Adding or removing a course's
+    assignments recalculates the whole course with GradeEngine, while changing an assignment's
+    weighting (see Assignments.weightingUpdate()) and changes to categories (which every
+    course uses) remove the saved totals so they are recalculated when next viewed. In the
+    normalized storage layout (see StorageLayout) changes to a course's assignments give the
+    course document a new 'revision' instead, and totals saved with a different revision are
+    recalculated when next viewed. The course's revision is only read in the normalized layout.
+
+    Attributes
+    ----------
+    username : str
+        Account username
+    courseName : str
+        Name of the course
+    unsetFields : dict
+        Fields to $unset to remove the saved totals of a student
+
+    Methods
+    -------
+    read(studentName : str) -> dict
+        Returns the saved totals and results of a student, calculating them if needed
+    recompute(studentNames : list = None) -> dict
+        Recalculates and saves the totals and results of students of the course
+    saveRequest(assignmentObj : Assignments) -> UpdateOne
+        Builds the request which updates a student's totals for a saved assignment
+    markStale(username : str, query : dict = {}) -> None
+        Removes the saved totals of students so they are recalculated when next viewed
+    totalMarks(summary : dict) -> list
+        Returns the default and adjusted mark of a saved summary
+    '''
+
+    # Sums left over from adding and removing the same weighting are treated as zero
+    tolerance = 1e-9
+    unsetFields = {'totals': '', 'results': '', 'revision': ''}
+
+    def __init__(self, username, courseName):
+        '''
+        Constructor to build a StudentTotals object
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        courseName : str
+            Name of the course
+        '''
+        self.username = username
+        self.courseName = courseName
+
+    @instrumentation.traced
+    def read(self, studentName) -> dict:
+        '''
+        Returns the saved totals and results of a student, calculating them if needed
+
+        Parameters
+        ----------
+        studentName : str
+            Name of the student
+
+        Returns
+        -------
+        dict
+            The student's 'totals' and 'results' (see GradeEngine.summaries()), or None if the student does not exist
+        '''
+        summary = self._summary(studentName)
+        if summary is None:
+            return (None)
+        if 'totals' not in summary or 'results' not in summary or (StorageLayout(self.username).isNormalized() and summary.get('revision') != self._revision()):
+            summary = self.recompute([studentName]).get(studentName)
+        return (summary)
+
+    def _summary(self, studentName) -> dict:
+        # saveRequest() uses the same query, so viewing a student caches the results it needs
+        return (Courses(self.username).docGet({'course name': self.courseName, 'student name': studentName}, 'GradebookStudents', {'totals': 1, 'results': 1, 'revision': 1}))
+
+    @instrumentation.traced
+    def recompute(self, studentNames = None) -> dict:
+        '''
+        Recalculates and saves the totals and results of students of the course
+
+        Parameters
+        ----------
+        studentNames : list, optional
+            Names of the students to recalculate, every student of the course if not given
+
+        Returns
+        -------
+        dict
+            Student names mapped to their new 'totals' and 'results'
+        '''
+        query = {'course name': self.courseName}
+        if studentNames is not None:
+            query['student name'] = {'$in': studentNames}
+        # gradeEngine imports numpy, which is slow to import, so it is imported when first needed
+        from gradeEngine import GradeEngine
+        context = GradingContext(self.username, self.courseName)
+        engine = GradeEngine(self.username, self.courseName, defaultSort = True)
+        engine.load(context.courseDoc(), context.weightings(), Courses(self.username).docsGet('GradebookStudents', query))
+        summaries = engine.summaries()
+        if summaries:
+            revision = {'revision': context.courseDoc()['revision']} if 'revision' in context.courseDoc() else {}
+            studentCol = ConnectionManager.getClient()['GradebookStudents'][self.username]
+            studentCol.bulk_write([UpdateOne({'course name': self.courseName, 'student name': x}, {'$set': dict(summaries[x], **revision)}) for x in summaries], ordered = False)
+            sharedCache.invalidate('GradebookStudents', self.username, {'course name': self.courseName})
+        return (summaries)
+
+    def _revision(self) -> str:
+        courseDoc = Courses(self.username).docGet({'course name': self.courseName}, 'GradebookCourses', {'revision': 1})
+        return ((courseDoc or {}).get('revision'))
+
+    @staticmethod
+    def _isNumber(value) -> bool:
+        return (isinstance(value, (int, float)))
+
+    def _result(self, assignmentObj) -> dict:
+        assignmentName = assignmentObj.assignmentMarks['assignment name']
+        try:
+            weighting = assignmentObj.context.masterAssignment(assignmentName).get('weighting')
+        except KeyError:
+            weighting = None
+        try:
+            mark = assignmentObj.calculate()[0]
+        except Exception:
+            mark = None
+        if not self._isNumber(weighting):
+            weighting = None
+        # Like Marks.totalMarkAdjusted(), the course weighting is used where the adjusted weighting isn't a number
+        adjustedWeighting = assignmentObj.assignmentMarks.get('adjusted weighting', weighting)
+        if not self._isNumber(adjustedWeighting):
+            adjustedWeighting = weighting
+        if adjustedWeighting is None:
+            mark = None
+        return ({'assignment name': assignmentName, 'mark': mark, 'weighting': weighting, 'adjusted weighting': adjustedWeighting})
+
+    @staticmethod
+    def _contribution(result) -> list:
+        if result.get('mark') is None:
+            return ([0.0, 0.0, 0.0, 0.0])
+        contribution = [0.0, 0.0]
+        if result.get('weighting') is not None:
+            contribution = [result['mark'] * result['weighting'], result['weighting']]
+        return (contribution + [result['mark'] * result['adjusted weighting'], result['adjusted weighting']])
+
+    def saveRequest(self, assignmentObj) -> UpdateOne:
+        '''
+        Builds the request which updates a student's totals for a saved assignment
+
+        The old contribution of the assignment is taken from the student's saved results (read
+        through the shared DocCache, so usually no query is made), and the sums are changed by
+        the difference with the new contribution. The request only matches the student while the
+        saved result is still that old one. If it matches nothing (another device saved the
+        assignment in between, or the cached results were out of date) the sums are left alone
+        and recompute() must be called after saving.
+
+        Parameters
+        ----------
+        assignmentObj : Assignments
+            The assignment being saved, with its marks already converted to numbers
+
+        Returns
+        -------
+        UpdateOne
+            Request to send with the assignment's own write, or None if the student has
+            no saved totals to update (recompute() must be called after saving instead)
+        '''
+        assignmentName = assignmentObj.assignmentMarks['assignment name']
+        query = {'course name': self.courseName, 'student name': assignmentObj.studentName}
+        saved = self._summary(assignmentObj.studentName)
+        if saved is None or 'totals' not in saved or saved.get('revision') != assignmentObj.context.courseDoc().get('revision'):
+            return (None)
+        oldResults = [x for x in saved.get('results', []) if x.get('assignment name') == assignmentName]
+        if not oldResults:
+            return (None)
+        result = self._result(assignmentObj)
+        old = self._contribution(oldResults[0])
+        new = self._contribution(result)
+        fields = ['totals.default sum', 'totals.default weighting', 'totals.adjusted sum', 'totals.adjusted weighting']
+        return (UpdateOne(dict(query, results = {'$elemMatch': oldResults[0]}),
+                          {'$inc': {fields[x]: new[x] - old[x] for x in range(4)}, '$set': {'results.$': result}}))
+
+    @staticmethod
+    def markStale(username, query = {}) -> None:
+        '''
+        Removes the saved totals of students so they are recalculated when next viewed
+
+        Parameters
+        ----------
+        username : str
+            Account username
+        query : dict, optional
+            Query matching the students, defaults to every student of the account
+
+        Returns
+        -------
+        None
+        '''
+        ConnectionManager.getClient()['GradebookStudents'][username].update_many(query, {'$unset': StudentTotals.unsetFields})
+        sharedCache.invalidate('GradebookStudents', username)
+
+    @classmethod
+    def totalMarks(cls, summary) -> list:
+        '''
+        Returns the default and adjusted mark of a saved summary
+
+        Parameters
+        ----------
+        summary : dict
+            Summary returned by read() or recompute()
+
+        Returns
+        -------
+        list
+            [default mark, adjusted mark], a mark is None where Marks.totalMark() or
+            Marks.totalMarkAdjusted() would raise ZeroDivisionError
+        '''
+        totals = summary['totals']
+        marks = []
+        for x in ('default', 'adjusted'):
+            if abs(totals[x + ' weighting']) <= cls.tolerance:
+                marks.append(None)
+            else:
+                marks.append(totals[x + ' sum'] / totals[x + ' weighting'])
+        return (marks)
@@ -1,135 +1,163 @@
-#-----------------------------------------------------------------------------
-# Name:        userAccount (userAccount.py)
-# Purpose:     To provide login and registration functionality to the Gradebook program
-#
-# Author:      Steven Wu
-# Created:     2019/09/25
-# Updated:     2020/01/02
-#-----------------------------------------------------------------------------
-import pymongo
-from connectionString import connectionStr
-class UserAccount():
-    '''
-    Account registration and login object which holds the entered username and password
-
-    Attributes
-    ----------
-    username : str
-    	Entered username
-    password : str
-    	Entered password
-
-    Methods
-    -------
-    login() -> str
-    	Verifies login details against the account record
-    register(passwordConfirm : str) -> str
-    	Attempts to create new accounts
-    
-    '''
-
-    def __init__(self,username,password):
-        '''
-        Constructor to build a UserAccount object
-
-        Parameters
-        ----------
-        username : str
-        	Entered username
-        password : str
-        	Entered password
-
-        '''
-        
-        self.username = username
-        self.password = password
-
-    def login(self) -> str:
-        '''
-        Verifies login details against the account record
-
-        Checks if the username matches a username in a loginDB document,
-        and if the password matches the password in that document.
-
-        Parameters
-        ----------
-        None
-
-        Returns
-        -------
-        str
-        	'Success' if the method was successful
-        	'Incorrect Password' if password did not match the password found in the document
-        	'Username Not Found' if the method couldn't find a datbase document containing the username
-            'No username entered' if no username was entered
-            'No password entered' if no password was entered
-        '''
-        client = pymongo.MongoClient(connectionStr)
-        loginDB = client['GradebookLogin']
-        loginCol = loginDB['login']
-        if self.username == '':
-            client.close()
-            return('No username entered')
-        elif self.password =='':
-            client.close()
-            return('No password entered')
-        else:
-            for x in loginCol.find({'username' : self.username}):
-                if self.username == x['username']:
-                    if self.password == x['password']:
-                        client.close()
-                        return('Success')
-                    else:
-                        client.close()
-                        return('Incorrect Password')
-            client.close()
-            return ('Username Not Found')
-
-    def register(self, passwordConfirm) -> str:
-        '''
-        Attempts to create new accounts
-
-        Checks if the username already exists in the loginDB and if the password confirmation matches the password,
-        then creates a loginDB document containing the username password. Also creates a
-        file directory with their username to store their course information
-
-        Parameters
-        ----------
-        passwordConfirm : str
-            Entered password confirmation that the password attribute is compared to
-
-        Returns
-        -------
-        str
-        	'Registration Successful' if the method was successful
-        	'Username Taken' if the method found a document containing the same username
-            'Passwords do not match' if password did not match passwordConfirm
-            'No username entered' if no username was entered
-            'No password entered' if no password was entered
-        '''
-
-        client = pymongo.MongoClient(connectionStr)
-        loginDB = client['GradebookLogin']
-        loginCol = loginDB['login']
-        if self.username == '':
-            client.close()
-            return('No username entered')
-        elif self.password =='':
-            client.close()
-            return('No password entered')
-
-        existingUsernames = []
-
-        for x in loginCol.find():
-            existingUsernames.append(x['username'])
-
-        if self.username in existingUsernames:
-            client.close()
-            return('Username Taken')
-        elif passwordConfirm == self.password:
-            mydict = {'username':self.username, 'password' : self.password}
-            x = loginCol.insert_one(mydict)
-            client.close()
-            return('Registration Successful')
-        else:
-            return('Passwords do not match')
\ No newline at end of file
+#-----------------------------------------------------------------------------
+# Name:        userAccount (userAccount.py)
+# Purpose:     To provide login and registration functionality to the Gradebook program
+#
+# Author:      Steven Wu
+# Created:     2019/09/25
+# Updated:     2020/02/25
+#-----------------------------------------------------------------------------
+from pymongo.errors import DuplicateKeyError
+from connectionManager import ConnectionManager
+from credentials import sharedCredentials
+from databaseSetup import DatabaseSetup
+from instrumentation import instrumentation
+class UserAccount():
+    '''
+    Account registration and login object which holds the entered username and password
+
+    Attributes
+    ----------
+    username : str
+    	Entered username
+    password : str
+    	Entered password
+
+    Methods
+    -------
+    login() -> str
+    	Verifies login details against the account record
+    confirm() -> str
+        Verifies login details again, using the account's session if it has one
+    register(passwordConfirm : str) -> str
+    	Attempts to create new accounts
+    
+    '''
+
+    def __init__(self,username,password):
+        '''
+        Constructor to build a UserAccount object
+
+        Parameters
+        ----------
+        username : str
+        	Entered username
+        password : str
+        	Entered password
+
+        '''
+        
+        self.username = username
+        self.password = password
+
+    @instrumentation.traced
+    def login(self) -> str:
+        '''
+        Verifies login details against the account record
+
+        Checks if the username matches a username in a loginDB document,
+        and if the password matches the password hash in that document (see Credentials).
+        After a successful login, documents with a plaintext password or a hash made with an
+        older cost are hashed again, the account's indexes are made sure to exist and a
+        session is started so confirm() doesn't need to hash the password again.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+        	'Success' if the method was successful
+        	'Incorrect Password' if password did not match the password found in the document
+        	'Username Not Found' if the method couldn't find a datbase document containing the username
+            'No username entered' if no username was entered
+            'No password entered' if no password was entered
+        '''
+        client = ConnectionManager.getClient()
+        loginDB = client['GradebookLogin']
+        loginCol = loginDB['login']
+        if self.username == '':
+            return('No username entered')
+        elif self.password =='':
+            return('No password entered')
+        else:
+            for x in loginCol.find({'username' : self.username}):
+                if self.username == x['username']:
+                    if sharedCredentials.verify(self.password, x):
+                        if sharedCredentials.needsUpdate(x):
+                            loginCol.update_one({'_id': x['_id']}, {'$set': {'password hash': sharedCredentials.hashPassword(self.password)}, '$unset': {'password': ''}})
+                        DatabaseSetup(self.username).ensureIndexes()
+                        sharedCredentials.startSession(self.username, self.password)
+                        return('Success')
+                    else:
+                        return('Incorrect Password')
+            return ('Username Not Found')
+
+    @instrumentation.traced
+    def confirm(self) -> str:
+        '''
+        Verifies login details again, using the account's session if it has one
+
+        Used to confirm major decisions (see ConfirmationScreen). If the account logged in
+        recently with the same password the session is enough, so the password isn't hashed
+        and the database isn't read. Otherwise the details are verified with login().
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            'Success' or the result of login()
+        '''
+        if self.username != '' and self.password != '' and sharedCredentials.checkSession(self.username, self.password):
+            return('Success')
+        return (self.login())
+
+    @instrumentation.traced
+    def register(self, passwordConfirm) -> str:
+        '''
+        Attempts to create new accounts
+
+        Checks if the password confirmation matches the password, then creates a loginDB document
+        containing the username and the password's hash (see Credentials). The unique index on 'username' rejects the insert if the
+        username already exists, so no other accounts are read and two registrations of the same
+        name cannot both succeed. If the index couldn't be created because of duplicate logins left
+        by older versions, the username is looked for before inserting instead.
+
+        Parameters
+        ----------
+        passwordConfirm : str
+            Entered password confirmation that the password attribute is compared to
+
+        Returns
+        -------
+        str
+        	'Registration Successful' if the method was successful
+        	'Username Taken' if the method found a document containing the same username
+            'Passwords do not match' if password did not match passwordConfirm
+            'No username entered' if no username was entered
+            'No password entered' if no password was entered
+        '''
+
+        client = ConnectionManager.getClient()
+        loginDB = client['GradebookLogin']
+        loginCol = loginDB['login']
+        if self.username == '':
+            return('No username entered')
+        elif self.password =='':
+            return('No password entered')
+
+        unique = DatabaseSetup.ensureLoginIndexes()
+        # Without the unique index (see DatabaseSetup.mergeDuplicateLogins()) an existing username is looked for
+        if (passwordConfirm != self.password or not unique) and loginCol.find_one({'username': self.username}, {'_id': 1}) is not None:
+            return('Username Taken')
+        if passwordConfirm != self.password:
+            return('Passwords do not match')
+        try:
+            mydict = {'username':self.username, 'password hash' : sharedCredentials.hashPassword(self.password)}
+            x = loginCol.insert_one(mydict)
+        except DuplicateKeyError:
+            return('Username Taken')
+        return('Registration Successful')
\ No newline at end of file
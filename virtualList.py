@@ -0,0 +1,203 @@
+#-----------------------------------------------------------------------------
+# Name:        virtualList (virtualList.py)
+# Purpose:     To display long lists of rows in the main screen without creating
+#              widgets for the rows that are scrolled out of view
+#
+# Author:      Steven Wu
+# Created:     2020/02/09
+# Updated:     2020/02/23
+#-----------------------------------------------------------------------------
+
+from tkinter import *
+from math import floor, ceil
+
+class VirtualList():
+    '''
+    Object which displays rows of buttons and labels inside the MainScreen's scrollable bottomFrame,
+    only creating widgets for the rows that are visible
+
+    An empty frame the height of all the rows holds the list's place in the bottomFrame's grid.
+    Widgets are placed on top of it for the visible rows only, and the widgets of rows that
+    are scrolled out of view are reused for the rows that are scrolled into view. Replacing
+    the rows only changes the text of the visible widgets whose text is different, so pages
+    that are updated in place (see MainScreen.liveChange()) don't redraw every row.
+
+    A button's command is set once when the button is created and looks up the command of the
+    row the button is displaying when clicked. Tkinter registers a new Tcl command every time a
+    function is given to config(), and those are only freed when the widget is destroyed, so
+    setting the command of reused buttons would keep adding commands while the list is scrolled.
+
+    Attributes
+    ----------
+    master : Frame
+        Frame the list is displayed in (the bottomFrame)
+    canvas : Canvas
+        Scrollable canvas which holds the master frame
+    columns : list
+        List of (widget type, font, grid column) tuples, widget type is 'button' or 'label'
+    rows : list
+        List of rows, each row is a list with one cell per column. A cell is None (nothing displayed)
+        or a dict with a 'text' key and, for buttons, a 'command' key
+    rowHeight : int
+        Height of a row in pixels
+    spacer : Frame
+        Empty frame which reserves the space of every row in the master's grid
+
+    Methods
+    -------
+    setRows(rows : list) -> None
+        Replaces the rows of the list, only changing the visible widgets whose text changed
+    setRow(index : int, row : list) -> None
+        Replaces one row of the list
+    refresh() -> None
+        Places widgets for the rows that are currently visible
+    '''
+
+    buffer = 2
+
+    def __init__(self, master, canvas, firstRow, columns, rows):
+        '''
+        Constructor to build a VirtualList object
+
+        Parameters
+        ----------
+        master : Frame
+            Frame the list is displayed in (the bottomFrame)
+        canvas : Canvas
+            Scrollable canvas which holds the master frame
+        firstRow : int
+            Grid row of the master frame the list starts at
+        columns : list
+            List of (widget type, font, grid column) tuples, widget type is 'button' or 'label'
+        rows : list
+            List of rows, each a list with one cell (None or dict) per column
+        '''
+        self.master = master
+        self.canvas = canvas
+        self.columns = columns
+        self.rows = []
+        self._visible = {}
+        self._freeSlots = []
+        probes = [self._makeWidget(x) for x in columns]
+        self.rowHeight = max([x.winfo_reqheight() for x in probes])
+        for x in probes:
+            x.destroy()
+        firstColumn = min([x[2] for x in columns])
+        lastColumn = max([x[2] for x in columns])
+        self.spacer = Frame(self.master, height = 0)
+        self.spacer.grid(row = firstRow, column = firstColumn, columnspan = lastColumn - firstColumn + 1, sticky = EW)
+        self.setRows(rows)
+
+    def _makeWidget(self, column) -> Widget:
+        options = {} if column[1] is None else {'font': column[1]}
+        if column[0] == 'button':
+            widget = Button(self.master, **options)
+            widget.config(command = lambda: self._clicked(widget))
+            return (widget)
+        return (Label(self.master, **options))
+
+    def _clicked(self, widget) -> None:
+        for index, slot in self._visible.items():
+            if widget in slot:
+                cell = self.rows[index][slot.index(widget)]
+                if cell is not None and cell.get('command') is not None:
+                    cell['command']()
+                return
+
+    def _show(self, slot, row) -> None:
+        for widget, cell in zip(slot, row):
+            if cell is None:
+                widget.place_forget()
+            elif str(widget.cget('text')) != str(cell['text']):
+                widget.config(text = cell['text'])
+
+    def setRows(self, rows) -> None:
+        '''
+        Replaces the rows of the list, only changing the visible widgets whose text changed
+
+        Parameters
+        ----------
+        rows : list
+            List of rows, each a list with one cell (None or dict) per column
+
+        Returns
+        -------
+        None
+        '''
+        self.rows = rows
+        for index in list(self._visible.keys()):
+            if index < len(rows):
+                self._show(self._visible[index], rows[index])
+            else:
+                self._release(index)
+        self.spacer.config(height = max(len(rows) * self.rowHeight, 1))
+        self.master.after_idle(self.refresh)
+
+    def setRow(self, index, row) -> None:
+        '''
+        Replaces one row of the list
+
+        Only the widgets of that row are changed, the other rows are left as they are
+
+        Parameters
+        ----------
+        index : int
+            Index of the row
+        row : list
+            The new row, a list with one cell (None or dict) per column
+
+        Returns
+        -------
+        None
+        '''
+        self.rows[index] = row
+        if index in self._visible:
+            self._show(self._visible[index], row)
+            self.master.after_idle(self.refresh)
+
+    def _release(self, index) -> None:
+        slot = self._visible.pop(index)
+        for widget in slot:
+            widget.place_forget()
+        self._freeSlots.append(slot)
+
+    def refresh(self) -> None:
+        '''
+        Places widgets for the rows that are currently visible
+
+        Called whenever the canvas is scrolled or resized
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        if not self.spacer.winfo_exists():
+            return
+        top = self.canvas.canvasy(0) - self.spacer.winfo_y()
+        first = max(floor(top / self.rowHeight) - self.buffer, 0)
+        last = min(ceil((top + self.canvas.winfo_height()) / self.rowHeight) + self.buffer, len(self.rows))
+        for index in list(self._visible.keys()):
+            if index < first or index >= last:
+                self._release(index)
+
+        for index in range(first, last):
+            if index in self._visible:
+                continue
+            if self._freeSlots:
+                slot = self._freeSlots.pop()
+            else:
+                slot = [self._makeWidget(x) for x in self.columns]
+            self._visible[index] = slot
+            self._show(slot, self.rows[index])
+
+        # Column positions change when the window is resized, so every visible row is placed again
+        spacerX = self.spacer.winfo_x()
+        bounds = [self.master.grid_bbox(column = x[2], row = 0) for x in self.columns]
+        for index, slot in self._visible.items():
+            for widget, cell, bound in zip(slot, self.rows[index], bounds):
+                if cell is not None:
+                    widget.place(in_ = self.spacer, x = bound[0] - spacerX, y = index * self.rowHeight, width = bound[2], height = self.rowHeight)